@@ -21,14 +21,18 @@ from __future__ import absolute_import
 import warnings
 
 from .read import *
+from .read_raw import *
 from .read_id import *
 from .read_data import *
 from .read_bsl import *
 from .read_meta import *
 from .read_tides import *
 from .read_airpressure import *
+from .store import *
 
 from .proc_bsl import *
+from .metrics import *
+from .benchmark import *
 
 from .extract_df import *
 from .search_df import *
@@ -41,13 +45,16 @@ from .replace import *
 
 from .vert_bsl import *
 from .hori_bsl import *
+from .update_bsl import *
 
 from .change2dateindex import *
 from .change_dtype import *
 
 from .compare_df import *
+from .grid_df import *
 
 from .calc import *
+from .est_cont_bsl import *
 
 global GMT_DATEFORMAT # Output date format
 global IN_DATEFORMAT # Input date format
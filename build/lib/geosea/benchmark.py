@@ -0,0 +1,227 @@
+#-------------------------------------------------------------------------------
+#       Benchmark with Synthetic Seafloor Geodetic Network
+#-------------------------------------------------------------------------------
+
+import os
+import shutil
+import tempfile
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+from .metrics import *
+from .proc_bsl import *
+from .read_raw import RAW_DATEFORMAT
+
+def create_raw(pathname,nbeacons=4,days=30,starttime='2020-01-01 00:00:00',bsl_period=60,sensor_period=10,status_period=1440,files_per_station=1,spacing=1500.,depth=2500.,seed=0):
+    """Writes synthetic raw files (Data_BENCH_<ID>_<n>.csv) of a network.
+
+    The beacons are placed on a regular grid with given spacing at the
+    same depth. Each beacon measures sound speed (SSP), temperature (HRT)
+    and pressure with tides (PRS) every sensor_period, ranges to all other
+    beacons (BSL) every bsl_period and pages, battery and inclination (PAG,
+    BAT, INC) every status_period. The records are read by read().
+
+    It needs:
+    pathname ... location of output files (e.g. '../RAW/')
+    nbeacons (optional) ... number of beacons (default 4)
+    days (optional) ... length of deployment in days (default 30)
+    starttime (optional) ... start of deployment (format 'YYYY-MM-DD
+        hh:mm:ss', default '2020-01-01 00:00:00')
+    bsl_period (optional) ... time between two ranges of one beacon pair in
+        minutes (default 60)
+    sensor_period (optional) ... time between two sensor measurements in
+        minutes (default 10)
+    status_period (optional) ... time between two status records in minutes
+        (default 1440)
+    files_per_station (optional) ... number of raw files (downloads) of
+        each beacon, the deployment is split in equal parts (default 1)
+    spacing (optional) ... distance between neighbouring beacons in metres
+        (default 1500)
+    depth (optional) ... depth of beacons in metres (default 2500)
+    seed (optional) ... seed of random numbers (default 0)
+
+    It returns:
+    ID ... an 1-dim list with station IDs
+    nrecords ... number of written records
+    """
+
+    rng = np.random.default_rng(seed)
+    ID = [str(2201+i) for i in range(nbeacons)]
+
+    # positions on a regular grid
+    ncols = int(np.ceil(np.sqrt(nbeacons)))
+    pos = np.array([[(i % ncols)*spacing,(i // ncols)*spacing] for i in range(nbeacons)])
+
+    start = pd.Timestamp(starttime)
+    end = start + pd.Timedelta(days=days)
+    t_sensor = pd.date_range(start,end,freq=str(sensor_period)+'min',inclusive='left')
+    t_bsl = pd.date_range(start,end,freq=str(bsl_period)+'min',inclusive='left')
+    t_status = pd.date_range(start,end,freq=str(status_period)+'min',inclusive='left')
+
+    # tides (M2) in metres and temperature common to all beacons
+    def tide(t):
+        hours = (t - start) / pd.Timedelta(hours=1)
+        return(0.8*np.sin(2*np.pi*np.asarray(hours)/12.42))
+    # end def tide(t):
+    def temperature(t):
+        days = (t - start) / pd.Timedelta(days=1)
+        return(2.5 + 0.02*np.sin(2*np.pi*np.asarray(days)/3.))
+    # end def temperature(t):
+
+    nrecords = 0
+    for k,station in enumerate(ID):
+        records = []
+
+        hrt = temperature(t_sensor) + rng.normal(0,1e-3,len(t_sensor))
+        ssp = 1480. + 4.6*(hrt-2.5) + rng.normal(0,0.02,len(t_sensor))
+        prs = 100 + 10.05*(depth + tide(t_sensor)) + rng.normal(0,0.05,len(t_sensor))
+        records.append(_raw_lines('SSP',t_sensor,[ssp],['{:.3f}']))
+        records.append(_raw_lines('HRT',t_sensor,[hrt],['{:.4f}']))
+        records.append(_raw_lines('PRS',t_sensor,[prs,hrt+0.05],['{:.3f}','{:.3f}']))
+
+        for j,other in enumerate(ID):
+            if j == k:
+                continue
+            # end if j == k:
+            dist = np.hypot(*(pos[k]-pos[j]))
+            c = 1480. + 4.6*(temperature(t_bsl)-2.5)
+            tat = 120.
+            rng_ms = 2*dist/c*1000 + tat + rng.normal(0,0.005,len(t_bsl))
+            # ranges to different beacons are send one after another
+            t_range = t_bsl + pd.Timedelta(seconds=10*j)
+            records.append(_raw_lines('BSL',t_range,[np.zeros(len(t_bsl)),np.full(len(t_bsl),int(other)),rng_ms,np.full(len(t_bsl),tat)],['{:.0f}','{:.0f}','{:.3f}','{:.1f}']))
+        # end for j,other in enumerate(ID):
+
+        n = len(t_status)
+        records.append(_raw_lines('PAG',t_status,[np.arange(n)*100],['{:.0f}']))
+        records.append(_raw_lines('BAT',t_status,[np.linspace(100,100-days/10.,n),np.full(n,12.2)],['{:.0f}','{:.2f}']))
+        records.append(_raw_lines('INC',t_status,[rng.normal(0.01,1e-4,n),rng.normal(-0.02,1e-4,n)],['{:.5f}','{:.5f}']))
+
+        df = pd.concat(records).sort_index(kind='mergesort')
+        nrecords += len(df)
+
+        # split deployment in downloads
+        bounds = pd.date_range(start,end,periods=files_per_station+1)
+        for part in range(files_per_station):
+            sel = (df.index >= bounds[part]) & ((df.index < bounds[part+1]) | (part == files_per_station-1))
+            header = ['# GeoSEA synthetic raw data','# Station: '+station,'# Part: '+str(part+1)] + ['#']*10
+            with open(pathname+'Data_BENCH_'+station+'_'+'{:03d}'.format(part+1)+'.csv','w') as fh:
+                fh.write('\n'.join(header)+'\n')
+                fh.write('\n'.join(df['line'].values[sel])+'\n')
+            # end with open(...) as fh:
+        # end for part in range(files_per_station):
+    # end for k,station in enumerate(ID):
+
+    return(ID,nrecords)
+# end def create_raw( ... ):
+
+def run_benchmark(nbeacons=4,days=30,bsl_period=60,sensor_period=10,status_period=1440,files_per_station=1,processes=None,memory=True,SAL=35.,phi=40.,minmax=3600,fmt=None,workdir=None,quiet=True):
+    """Times each stage of proc_bsl() for a synthetic network.
+
+    Raw files are created with create_raw() in <workdir>/RAW/ and
+    proc_bsl() is run in <workdir>/PROC/ (results in <workdir>/DATA/). The
+    stages are reading of raw files ('read'), extraction of the sensor data
+    of each station ('extract'), sound speed ('sv_leroy'), matching of sound
+    speed to ranges ('search_df'), baseline calculation ('baseline'), file
+    output ('write'), single pairs ('pair'), all pairs ('hori_bsl') and
+    pressure differences ('vert_bsl').
+
+    It needs:
+    nbeacons, days, bsl_period, sensor_period, status_period,
+        files_per_station (optional) ... size of network (see create_raw())
+    processes (optional) ... number of worker processes (see proc_bsl())
+    memory (optional) ... if True peak memory of each stage is measured with
+        tracemalloc, which slows down the processing (default True)
+    SAL, phi, minmax, fmt (optional) ... parameters of proc_bsl() (default
+        35, 40, 3600, None)
+    workdir (optional) ... working directory, will be kept (default is a
+        temporary directory which is removed afterwards)
+    quiet (optional) ... if True proc_bsl() is run with verbose=False
+        (default True)
+
+    It returns:
+    df_summary ... pandas.DataFrame as returned by metrics_summary() with
+        additional row 'total' (records are raw records)
+    """
+
+    cwd = os.getcwd()
+    remove = workdir is None
+    if workdir is None:
+        workdir = tempfile.mkdtemp(prefix='geosea-benchmark-')
+    # end if workdir is None:
+    for folder in ['RAW','DATA','PROC']:
+        os.makedirs(os.path.join(workdir,folder),exist_ok=True)
+    # end for folder in ['RAW','DATA','PROC']:
+
+    try:
+        ID,nrecords = create_raw(os.path.join(workdir,'RAW',''),nbeacons=nbeacons,days=days,bsl_period=bsl_period,sensor_period=sensor_period,status_period=status_period,files_per_station=files_per_station)
+        # proc_bsl() uses ../RAW/ and ../DATA/
+        os.chdir(os.path.join(workdir,'PROC'))
+
+        enable_metrics()
+        if memory:
+            tracemalloc.start()
+        # end if memory:
+        with metric_stage('total',records=nrecords):
+            proc_bsl(SAL,phi,minmax,writefile=True,processes=processes,fmt=fmt,verbose=not quiet)
+        # end with metric_stage('total',records=nrecords):
+    finally:
+        if memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        # end if memory and tracemalloc.is_tracing():
+        records = disable_metrics()
+        os.chdir(cwd)
+        if remove:
+            shutil.rmtree(workdir,ignore_errors=True)
+        # end if remove:
+    # end try:
+
+    df_summary = metrics_summary(records)
+
+    return(df_summary)
+# end def run_benchmark( ... ):
+
+def run_scaling(nbeacons_list,days_list=None,**kwargs):
+    """Runs run_benchmark() for networks of different size.
+
+    It needs:
+    nbeacons_list ... 1-dim list with number of beacons
+    days_list (optional) ... 1-dim list with length of deployment in days
+        (default is [days] if days is given in kwargs, otherwise days of
+        run_benchmark())
+    kwargs (optional) ... further parameters of run_benchmark(), days is
+        ignored if days_list is given
+
+    It returns:
+    df_scaling ... pandas.DataFrame with summaries of all runs with number
+        of beacons ('nbeacons'), days ('days') and stage as index
+    """
+
+    days = kwargs.pop('days',30)
+    if days_list is None:
+        days_list = [days]
+    # end if days_list is None:
+
+    summaries = {}
+    for nbeacons in nbeacons_list:
+        for days in days_list:
+            summaries[(nbeacons,days)] = run_benchmark(nbeacons=nbeacons,days=days,**kwargs)
+        # end for days in days_list:
+    # end for nbeacons in nbeacons_list:
+    df_scaling = pd.concat(summaries,names=['nbeacons','days','stage'])
+
+    return(df_scaling)
+# end def run_scaling(nbeacons_list,days_list=None,**kwargs):
+
+def _raw_lines(index,date,values,fmt):
+    """Formats records of one type as lines of raw file ('<index>,<date>,0,0,
+    <values>') with date as index."""
+
+    line = pd.Series(index + ',' + date.strftime(RAW_DATEFORMAT) + ',0,0',index=date)
+    for val,f in zip(values,fmt):
+        line = line + ',' + pd.Series(val,index=date).map(f.format)
+    # end for val,f in zip(values,fmt):
+
+    return(line.to_frame('line'))
+# end def _raw_lines(index,date,values,fmt):
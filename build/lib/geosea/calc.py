@@ -2,6 +2,11 @@
 #       Utils for Baseline calculation
 #-------------------------------------------------------------------------------
 
+import numpy as np
+import pandas as pd
+
+from .grid_df import *
+
 
 def baseline_calc_amean ( SSP1, SSP2, BSL_range, TAT):
     """ Calculates measured baseline lengths (arithmetic mean sound speed).
@@ -172,41 +177,16 @@ def calc_mov_average_std(df,timespan,log_period,column_list=None,method=None):
         std_<old column name>)
     """
 
-    # copy data frame to new data frame
-    df_new = df.copy()
-
-    # if no column list is given, use all columns in df_new
+    # if no column list is given, use all columns in df
     if column_list is None:
-        column_list = df_new.columns
+        column_list = df.columns
     # end if column_list is None:
 
-    # calculate theoretical number of samples in one time window
-    tw = pd.to_timedelta(pd.tseries.frequencies.to_offset(timespan))
-    period = pd.to_timedelta(str(log_period)+'min')
-    samples = int(tw/period)
-    # half of samples to shift moving average and standard deviation to
-    # the middle of the given time window
-    sample_shift = int(samples/2)
-    # reindex df_new to include samples every log_period
-    date_index = pd.date_range(df_new.index[0],df_new.index[-1],freq=str(log_period)+'min')
-    # if regular sampling the existing index will be
-    df_new = df_new.reindex(date_index,method=method)
-
-    # iterate over all column_list items
-    ncols = []
-    for item in column_list:
-         if item in df_new.columns:
-             ncol_mean = 'mean_' + item
-             ncol_std = 'std_' + item
-             df_new[ncol_mean] = df_new[item].rolling(window=timespan).mean()
-             df_new[ncol_std] = df_new[item].rolling(window=timespan).std()
-             ncols.append(ncol_mean)
-             ncols.append(ncol_std)
-         # end if item in df_new.columns:
-    # for item in column_list:
-
-    df_new.loc[:,ncols] = df_new.loc[:,ncols].shift(-sample_shift)
-    df_new.set_value(df_new.index[:sample_shift],ncols,np.nan)
+    # samples every log_period on a regular time grid, moving average and
+    # standard deviation are shifted to the middle of the time window
+    grid = create_grid([df],log_period,method=method)
+    stats = grid_mov_average_std(grid,timespan,column_list)
+    df_new = grid2df(grid,0,stats)
 
     return(df_new)
 # end def calc_mov_average_std(df,timespan,log_period,column_list=None)
@@ -247,31 +227,14 @@ def calc_diff_rel_col(df_list,timespan,log_period,column_list,fac=None,method=No
          <column> with first moving average of <column> * fac for <column>)
     """
 
-    # copy df_list to keep old df_list untouched
+    # all DataFrames are aligned once on a common time grid
+    grid = create_grid(df_list,log_period,method=method)
+    stats = grid_diff_rel(grid,timespan,column_list,fac)
+
     df_list_new = []
     for i in range(len(df_list)):
-        df_list_new.append(df_list[i].copy())
+        df_list_new.append(grid2df(grid,i,stats))
     # end for i in range(len(df_list)):
-    # First of all check whether fac is present and has same length as column
-    # list
-    if fac is None:
-        fac = np.ones(len(column_list))
-    elif len(fac) != len(column_list):
-        print('Length of fac and colum_list do not match!')
-        print('Will use factor 1 for all columns in column list!')
-        fac = np.ones(len(column_list))
-    # end if fac is None:
-
-    for i in range(len(df_list_new)):
-        df_list_new[i] = calc_mov_average_std(df_list_new[i],timespan,log_period,column_list,method)
-        for j,col in enumerate(column_list):
-            mean_col = 'mean_'+col
-            diff_col = 'diff_'+col
-            rel_col = 'rel_'+col
-            df_list_new[i][diff_col] = (df_list_new[i][mean_col]-df_list_new[i][col].mean())*fac[j]
-            df_list_new[i][rel_col] = (df_list_new[i][mean_col]-df_list_new[i][mean_col].bfill()[0])*fac[j]
-        # end for j,col in enumerate(column_list):
-    # end for i in range(len(bsl_list)):
 
     return(df_list_new)
 # end def calc_diff_rel_col(df_list,timespan,log_period,column_list,fac=None):
@@ -1,4 +1,5 @@
 
+import numpy as np
 import pandas as pd
 
 def compare_df(df_list,column,name_ext):
@@ -62,12 +63,12 @@ def compare_df(df_list,column,name_ext):
         for i in range(len(df_list)):
             if type(column) == str:
                 if column in df_list[i].columns:
-                    df_compare.loc[df_list[i].apply(pd.Series.last_valid_index)[column]+pd.tseries.offsets.DateOffset(seconds=1):,column+name_ext[i]] = np.nan
+                    df_compare.loc[df_list[i][column].last_valid_index()+pd.tseries.offsets.DateOffset(seconds=1):,column+name_ext[i]] = np.nan
                 # end if column in df_list[i].columns:
             elif type(column) == list:
                 for col in column:
                     if col in df_list[i].columns:
-                        df_compare.loc[df_list[i].apply(pd.Series.last_valid_index)[col]+pd.tseries.offsets.DateOffset(seconds=1):,col+name_ext[i]] = np.nan
+                        df_compare.loc[df_list[i][col].last_valid_index()+pd.tseries.offsets.DateOffset(seconds=1):,col+name_ext[i]] = np.nan
                     # end if col in df_list[i].columns:
                 # for col in column:
             # if type(column) == str:
@@ -1,7 +1,8 @@
 
+import numpy as np
 import pandas as pd
 
-from calc import *
+from .calc import *
 
 def est_const_bsl(bsl,starttime=None,endtime=None,intercept=False,val_tw=None):
     """Performs a linear regression (assuming the intercept at the origin).
@@ -97,3 +98,163 @@ def est_const_bsl(bsl,starttime=None,endtime=None,intercept=False,val_tw=None):
 
     return(bsl)
 # end def est_const_bsl(bsl,starttime=None,endtime=None):
+
+def est_const_bsl_series(bsl,window,step,starttime=None,endtime=None,intercept=False):
+    """Estimates constant baseline length in sliding time windows.
+
+    For each time window the same linear regression as in est_const_bsl()
+    (tt-S*1/v-c = 0) is solved. All time windows are calculated at once with
+    cumulative sums of the normal equations, measurements with NaN in 'tt'
+    or '1/v' are not used. The regression is done relative to the constant
+    baseline length of all measurements to avoid loss of precision.
+
+    It needs:
+    bsl ... pandas.Dataframe with one way traveltime in seconds ('tt') and
+        sound speeds at beacon 1 and 2 ('ssp1','ssp2') or reciprocal of
+        harmonic mean of sound speeds ('1/v') with corresponding times of
+        measurement for beacon pair (see est_const_bsl())
+    window ... length of time window (e.g. '30D')
+    step ... time between start of consecutive time windows (e.g. '1D')
+    starttime (optional) ... start of first time window (format:
+        'YYYY-mm-dd HH:MM:SS', default: midnight of first entry in bsl)
+    endtime (optional) ... no time window starts after endtime (format:
+        'YYYY-mm-dd HH:MM:SS', default: last entry in bsl)
+    intercept (optional) ... specify whether intercept should be set to
+        0 [False] or should be calculated [True] (default is False)
+
+    It returns:
+    df_const ... pandas.Dataframe with constant baseline length in metres
+        ('bsl_const'), standard deviation of the measurements compared to the
+        fitted line in seconds ('std_dev_tt', as in est_const_bsl()), (and
+        intercept ('intercept')) and number of measurements ('n') with start
+        of time window as index, the time window includes its start and end
+        (same as est_const_bsl(bsl,start,start+window)), values are NaN if
+        less measurements than parameters (plus one) are in the time window,
+        if there are no measurements at all the pandas.Dataframe is empty
+        unless starttime and endtime are given
+    """
+
+    if '1/v' not in bsl.columns:
+        bsl = calc_hmssp_recp_v(bsl.copy())
+    # end if '1/v' not in bsl.columns:
+
+    columns = ['bsl_const','std_dev_tt','n']
+    if intercept:
+        columns = ['bsl_const','intercept','std_dev_tt','n']
+    # end if intercept:
+
+    bsl = bsl.loc[bsl['tt'].notnull() & bsl['1/v'].notnull(),['tt','1/v']].sort_index(kind='mergesort')
+    if bsl.empty and (starttime is None or endtime is None):
+        return(pd.DataFrame(columns=columns,index=pd.DatetimeIndex([],name='date'),dtype=float))
+    # end if bsl.empty and (starttime is None or endtime is None):
+
+    window = pd.to_timedelta(window)
+    step = pd.to_timedelta(step)
+    if starttime is None:
+        starttime = bsl.index[0].normalize()
+    # end if starttime is None:
+    if endtime is None:
+        endtime = bsl.index[-1]
+    # end if endtime is None:
+    start = pd.date_range(pd.Timestamp(starttime),pd.Timestamp(endtime),freq=step,name='date')
+    if bsl.empty:
+        # given time windows without measurements
+        df_const = pd.DataFrame(np.nan,index=start,columns=columns[:-1])
+        df_const['n'] = 0
+        return(df_const)
+    # end if bsl.empty:
+
+    x = bsl['1/v'].values
+    y = bsl['tt'].values
+    # regression of w = tt-S0*1/v with S0 as constant baseline length of all
+    # measurements, the residuals are the same as for tt
+    S0 = np.dot(x,y)/np.dot(x,x)
+    w = y - S0*x
+    if intercept:
+        # centre 1/v for a well conditioned system
+        x0 = x.mean()
+        x = x - x0
+    # end if intercept:
+
+    # cumulative sums with leading zero, sum in window is cs[last]-cs[first]
+    sums = {}
+    for key,val in [('n',np.ones(len(x))),('x',x),('w',w),('xx',x*x),('xw',x*w),('ww',w*w)]:
+        sums[key] = np.concatenate(([0.],np.cumsum(val)))
+    # end for key,val in [...]:
+    date = bsl.index.values
+    first = np.searchsorted(date,start.values,side='left')
+    last = np.searchsorted(date,(start + window).values,side='right')
+    s = {}
+    for key in sums:
+        s[key] = sums[key][last] - sums[key][first]
+    # end for key in sums:
+    n = s['n']
+
+    with np.errstate(invalid='ignore',divide='ignore'):
+        if not intercept:
+            dS = s['xw']/s['xx']
+            ssr = s['ww'] - dS*s['xw']
+            valid = n > 1
+        else:
+            det = n*s['xx'] - s['x']**2
+            dS = (n*s['xw'] - s['x']*s['w'])/det
+            b = (s['w'] - dS*s['x'])/n
+            ssr = s['ww'] - dS*s['xw'] - b*s['w']
+            valid = n > 2
+        # end if not intercept:
+        sigma = np.sqrt(np.maximum(ssr,0.)/(n-1))
+    # end with np.errstate(...):
+
+    df_const = pd.DataFrame(index=start)
+    df_const['bsl_const'] = np.where(valid,S0 + dS,np.nan)
+    if intercept:
+        # tt = S*(1/v-x0) + b + S0*x0 = S*1/v + b - dS*x0
+        df_const['intercept'] = np.where(valid,b - dS*x0,np.nan)
+    # end if intercept:
+    df_const['std_dev_tt'] = np.where(valid,sigma,np.nan)
+    df_const['n'] = n.astype(int)
+
+    return(df_const)
+# end def est_const_bsl_series(bsl,window,step,starttime=None,endtime=None,intercept=False):
+
+def est_const_bsl_pairs(bsl_list,window,step,starttime=None,endtime=None,intercept=False):
+    """Estimates constant baseline length in sliding time windows for all
+    beacon pairs.
+
+    All pairs share the same time windows. Thus the estimates of different
+    pairs can be compared directly.
+
+    It needs:
+    bsl_list ... 1-dim list with pandas.Dataframe with baselines of each
+        beacon pair (e.g. final_bsls of hori_bsl(), see
+        est_const_bsl_series())
+    window ... length of time window (e.g. '30D')
+    step ... time between start of consecutive time windows (e.g. '1D')
+    starttime (optional) ... start of first time window (format:
+        'YYYY-mm-dd HH:MM:SS', default: midnight of first entry of all pairs)
+    endtime (optional) ... no time window starts after endtime (format:
+        'YYYY-mm-dd HH:MM:SS', default: last entry of all pairs)
+    intercept (optional) ... specify whether intercept should be set to
+        0 [False] or should be calculated [True] (default is False)
+
+    It returns:
+    const_list ... 1-dim list with pandas.Dataframe as returned by
+        est_const_bsl_series() for each beacon pair (same order as items in
+        bsl_list)
+    """
+
+    dates = [bsl.index for bsl in bsl_list if not bsl.empty]
+    if starttime is None and dates:
+        starttime = min(date.min() for date in dates).normalize()
+    # end if starttime is None and dates:
+    if endtime is None and dates:
+        endtime = max(date.max() for date in dates)
+    # end if endtime is None and dates:
+
+    const_list = []
+    for bsl in bsl_list:
+        const_list.append(est_const_bsl_series(bsl,window,step,starttime,endtime,intercept))
+    # end for bsl in bsl_list:
+
+    return(const_list)
+# end def est_const_bsl_pairs(bsl_list,window,step,starttime=None,endtime=None,intercept=False):
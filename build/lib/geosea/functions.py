@@ -132,13 +132,17 @@ def corr_vert_bsl(ID, vertical_offset):
 
     H_new = []
     n = 0
+    # mean pressure in dbar of each station, read only once per station
+    prs_mean = {}
+    for id in ID:
+        prs_mean[id] = ((read_data(id,'prs')-100)/10).mean()
+    # end for id in ID:
+
     for id1 in ID:
         for id2 in ID:
             if id1 != id2:
                 print(id1, '->', id2)
-                prs1=(read_data(id1,'prs')-100)/10
-                prs2=(read_data(id2,'prs')-100)/10
-                G = prs2.mean()-prs1.mean()
+                G = prs_mean[id2]-prs_mean[id1]
 
                 #print prs1.mean(), ' ', prs2.mean()
 
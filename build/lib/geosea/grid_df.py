@@ -0,0 +1,403 @@
+#-------------------------------------------------------------------------------
+#       Aligned Time Grid of Multiple DataFrames
+#-------------------------------------------------------------------------------
+
+import numpy as np
+import pandas as pd
+
+def create_grid(df_list,log_period,column_list=None,name_ext=None,method=None):
+    """Aligns multiple DataFrames on one regular time grid.
+
+    The data is stored in one numpy.ndarray (DataFrame x time x column).
+    The time grid starts at the first entry of all DataFrames and has a
+    spacing of log_period. Each measurement is assigned to the nearest time
+    of the grid.
+
+    It needs:
+    df_list ... 1D list with pandas.DataFrames (e.g. baselines of all beacon
+        pairs or data of all stations)
+    log_period ... logging period in minutes (i.e. time span between two
+        samples in minutes)
+    column_list (optional) ... list of columns to be stored (default is None
+        -> all numeric columns of all DataFrames)
+    name_ext (optional) ... list with extensions for each entry in df_list
+        (see compare_df(), default is None -> '_1', '_2', ...)
+    method (optional) ... method to use for filling times of the grid
+        without entry between first and last entry of each DataFrame (as
+        pandas.DataFrame.reindex()):
+        default/ None: do not fill gaps
+        pad / ffill: propagate last valid observation forward to next valid
+        backfill / bfill: use next valid observation to fill gap
+        nearest: use nearest valid observations to fill gap
+
+    It returns:
+    grid ... dict with time grid ('date', pandas.DatetimeIndex), data
+        ('data', numpy.ndarray DataFrame x time x column), validity mask
+        ('mask', True for measured values which are not NaN), entries of
+        each DataFrame ('present', numpy.ndarray DataFrame x time, True at
+        times with entry in DataFrame), stored columns ('columns'),
+        extensions ('name_ext') and logging period in minutes ('log_period')
+    """
+
+    if column_list is None:
+        column_list = []
+        for df in df_list:
+            for col in df.select_dtypes(include='number').columns:
+                if col not in column_list:
+                    column_list.append(col)
+                # end if col not in column_list:
+            # end for col in ... :
+        # end for df in df_list:
+    # end if column_list is None:
+    column_list = list(column_list)
+    if name_ext is None:
+        name_ext = ['_'+str(i+1) for i in range(len(df_list))]
+    # end if name_ext is None:
+
+    period = pd.to_timedelta(str(log_period)+'min')
+    dates = [df.index for df in df_list if not df.empty]
+    if dates:
+        date = pd.date_range(min(d.min() for d in dates),max(d.max() for d in dates)+period/2,freq=period,name='date')
+    else:
+        date = pd.DatetimeIndex([],name='date')
+    # end if dates:
+
+    data = np.full((len(df_list),len(date),len(column_list)),np.nan)
+    present = np.zeros((len(df_list),len(date)),dtype=bool)
+    if len(date) != 0:
+        for i,df in enumerate(df_list):
+            if df.empty:
+                continue
+            # end if df.empty:
+            # position of nearest time of grid, the last measurement is kept
+            # if more than one measurement falls on the same time
+            pos = np.asarray(np.rint((df.index - date[0]) / period),dtype=int)
+            present[i,pos] = True
+            for j,col in enumerate(column_list):
+                if col in df.columns:
+                    data[i,pos,j] = np.asarray(df[col],dtype=float)
+                # end if col in df.columns:
+            # end for j,col in enumerate(column_list):
+        # end for i,df in enumerate(df_list):
+    # end if len(date) != 0:
+
+    mask = ~np.isnan(data)
+    rows = np.broadcast_to(present[:,:,None],data.shape)
+    if method in ['pad','ffill']:
+        data = data[_take_index(rows,'prev')]
+    elif method in ['backfill','bfill']:
+        data = data[_take_index(rows,'next')]
+    elif method == 'nearest':
+        data = data[_take_index(rows,'nearest')]
+    # end if method in ['pad','ffill']:
+
+    grid = {'date' : date, 'data' : data, 'mask' : mask, 'present' : present, 'columns' : column_list, 'name_ext' : list(name_ext), 'log_period' : log_period}
+
+    return(grid)
+# end def create_grid(df_list,log_period,column_list=None,name_ext=None,method=None):
+
+def grid_mov_average_std(grid,timespan,column_list=None):
+    """Moving average and standard deviation of all DataFrames in grid.
+
+    Same as calc_mov_average_std() for all DataFrames at once: the time
+    window of length timespan ends at each time of the grid and the result
+    is shifted to the middle of the time window. Sums over the time windows
+    are computed with cumulative sums, thus the time needed does not depend
+    on timespan.
+
+    It needs:
+    grid ... dict as returned by create_grid()
+    timespan ... Time period of each window (e.g. '1d')
+    column_list (optional) ... List of columns for which the moving average
+        and the standard deviation should be computed (default is None ->
+        all columns of grid)
+
+    It returns:
+    stats ... dict with moving average ('mean') and standard deviation
+        ('std') as numpy.ndarray (DataFrame x time x column) and the
+        corresponding columns ('columns')
+    """
+
+    if column_list is None:
+        column_list = grid['columns']
+    # end if column_list is None:
+    column_list = [col for col in column_list if col in grid['columns']]
+    pos = [grid['columns'].index(col) for col in column_list]
+    data = grid['data'][:,:,pos]
+
+    # number of samples in one time window and shift to the middle of the
+    # time window
+    tw = pd.to_timedelta(timespan)
+    period = pd.to_timedelta(str(grid['log_period'])+'min')
+    window = int(np.ceil(tw/period))
+    sample_shift = int(int(tw/period)/2)
+
+    mean,std = _rolling_mean_std(data,window)
+
+    # shift to the middle of the time window, the first and last
+    # sample_shift samples of each DataFrame are set to NaN
+    if sample_shift > 0:
+        t = np.arange(len(grid['date']))
+        valid = grid['present']
+        first = np.where(valid.any(axis=1),np.argmax(valid,axis=1),0)
+        last = len(t) - 1 - np.argmax(valid[:,::-1],axis=1)
+        edge = (t[None,:] < first[:,None] + sample_shift) | (t[None,:] > last[:,None] - sample_shift)
+        for arr in [mean,std]:
+            arr[:,:-sample_shift] = arr[:,sample_shift:].copy()
+            arr[:,-sample_shift:] = np.nan
+            arr[edge] = np.nan
+        # end for arr in [mean,std]:
+    # end if sample_shift > 0:
+
+    return({'mean' : mean, 'std' : std, 'columns' : column_list})
+# end def grid_mov_average_std(grid,timespan,column_list=None):
+
+def grid_diff_rel(grid,timespan,column_list=None,fac=None):
+    """Calculates relative changes to mean and first moving average of all
+    DataFrames in grid.
+
+    Same as calc_diff_rel_col() for all DataFrames at once.
+
+    It needs:
+    grid ... dict as returned by create_grid()
+    timespan ... Time period of each window for calculation of moving average
+    column_list (optional) ... list of columns for which relative changes
+        should be calculated (default is None -> all columns of grid)
+    fac (optional) ... list of factors the relative changes should be
+        multiplied with (default is None -> factor 1 for each column)
+
+    It returns:
+    stats ... dict as returned by grid_mov_average_std() with additional
+        difference of moving average with mean of column * fac ('diff') and
+        difference of moving average with first moving average * fac ('rel')
+    """
+
+    stats = grid_mov_average_std(grid,timespan,column_list)
+    column_list = stats['columns']
+    if fac is None:
+        fac = np.ones(len(column_list))
+    elif len(fac) != len(column_list):
+        print('Length of fac and colum_list do not match!')
+        print('Will use factor 1 for all columns in column list!')
+        fac = np.ones(len(column_list))
+    # end if fac is None:
+    fac = np.asarray(fac,dtype=float)
+
+    pos = [grid['columns'].index(col) for col in column_list]
+    mean = stats['mean']
+    with np.errstate(invalid='ignore'):
+        stats['diff'] = (mean - _nan_reduce(np.nanmean,grid['data'][:,:,pos]))*fac
+        stats['rel'] = (mean - _first_valid(mean))*fac
+    # end with np.errstate(invalid='ignore'):
+
+    return(stats)
+# end def grid_diff_rel(grid,timespan,column_list=None,fac=None):
+
+def grid_fc_data(grid,values=None,ref_val='first'):
+    """Calculates fractional change values of all DataFrames in grid.
+
+    fc = (<values>-<reference value>)/<refernce value>*1e6 (see
+    calc_fc_data())
+
+    It needs:
+    grid ... dict as returned by create_grid()
+    values (optional) ... numpy.ndarray (DataFrame x time x column) for which
+        fractional change values should be calculated (e.g. moving average
+        of grid_mov_average_std(), default is None -> data of grid)
+    ref_val (optional) ... reference value for each DataFrame and column:
+        'first' (default) --- first valid entry of values
+        'median' --- median of data of grid
+        'mean' --- mean of data of grid
+
+    It returns:
+    fc ... numpy.ndarray (DataFrame x time x column) with fractional change
+        values
+    """
+
+    if values is None:
+        values = grid['data']
+    # end if values is None:
+
+    if ref_val == 'first':
+        ref = _first_valid(values)
+    elif ref_val == 'median':
+        ref = _nan_reduce(np.nanmedian,grid['data'])
+    elif ref_val == 'mean':
+        ref = _nan_reduce(np.nanmean,grid['data'])
+    else:
+        print('No valid option for ref_val chosen!')
+        print('Return values!')
+        return(values)
+    # end if ref_val == 'first':
+
+    with np.errstate(invalid='ignore',divide='ignore'):
+        fc = (values - ref)/ref*1e6
+    # end with np.errstate(...):
+
+    return(fc)
+# end def grid_fc_data(grid,values=None,ref_val='first'):
+
+def grid_compare(grid,column):
+    """Creates DataFrame from same column(s) of all DataFrames in grid,
+    linear interpolated in time.
+
+    Same as compare_df() but on the regular time grid, each column is only
+    interpolated between its first and last measurement.
+
+    It needs:
+    grid ... dict as returned by create_grid()
+    column ... column or list of columns to be compared
+
+    It returns:
+    df_compare ... pandas.DataFrame which holds all columns <column>_<name_ext>
+    """
+
+    if type(column) == str:
+        column = [column]
+    # end if type(column) == str:
+    column = [col for col in column if col in grid['columns']]
+    pos = [grid['columns'].index(col) for col in column]
+    mask = grid['mask'][:,:,pos]
+    data = np.where(mask,grid['data'][:,:,pos],np.nan)
+
+    # linear interpolation between previous and next measurement
+    before = _take_index(mask,'prev')
+    after = _take_index(mask,'next')
+    t = np.arange(len(grid['date']))[None,:,None]
+    t_prev = before[1]
+    t_next = after[1]
+    with np.errstate(invalid='ignore',divide='ignore'):
+        weight = np.where(t_next > t_prev,(t - t_prev)/(t_next - t_prev),0.)
+    # end with np.errstate(...):
+    interp = data[before] + weight*(data[after] - data[before])
+    interp[mask] = data[mask]
+
+    values = {}
+    for i,ext in enumerate(grid['name_ext']):
+        for j,col in enumerate(column):
+            values[col+ext] = interp[i,:,j]
+        # end for j,col in enumerate(column):
+    # end for i,ext in enumerate(grid['name_ext']):
+    df_compare = pd.DataFrame(values,index=grid['date'])
+
+    return(df_compare)
+# end def grid_compare(grid,column):
+
+def grid2df(grid,i,stats=None):
+    """Extracts one DataFrame from grid.
+
+    It needs:
+    grid ... dict as returned by create_grid()
+    i ... position of DataFrame in df_list of create_grid()
+    stats (optional) ... dict as returned by grid_mov_average_std() or
+        grid_diff_rel(), its arrays are stored in columns <key>_<column>
+
+    It returns:
+    df ... pandas.DataFrame with columns of grid (and stats) between first
+        and last entry of DataFrame i
+    """
+
+    valid = np.flatnonzero(grid['present'][i])
+    if len(valid) == 0:
+        return(pd.DataFrame(columns=grid['columns'],index=pd.DatetimeIndex([],name='date'),dtype=float))
+    # end if len(valid) == 0:
+    sel = slice(valid[0],valid[-1]+1)
+
+    values = {}
+    for j,col in enumerate(grid['columns']):
+        values[col] = grid['data'][i,sel,j]
+    # end for j,col in enumerate(grid['columns']):
+    if stats is not None:
+        # order as in calc_diff_rel_col(): mean and std of each column, then
+        # diff and rel of each column
+        for keys in [['mean','std'],['diff','rel']]:
+            for j,col in enumerate(stats['columns']):
+                for key in keys:
+                    if key in stats:
+                        values[key+'_'+col] = stats[key][i,sel,j]
+                    # end if key in stats:
+                # end for key in keys:
+            # end for j,col in enumerate(stats['columns']):
+        # end for keys in [['mean','std'],['diff','rel']]:
+    # end if stats is not None:
+    df = pd.DataFrame(values,index=grid['date'][sel])
+
+    return(df)
+# end def grid2df(grid,i,stats=None):
+
+def _rolling_mean_std(data,window):
+    """Moving average and standard deviation along axis 1 over window
+    samples (at least 1 resp. 2 valid samples), NaN is ignored."""
+
+    valid = ~np.isnan(data)
+    # subtract mean of each series to avoid loss of precision in the sums
+    ref = np.nan_to_num(_nan_reduce(np.nanmean,data))
+    x = np.where(valid,data - ref,0.)
+
+    shape = (data.shape[0],1,data.shape[2])
+    sums = []
+    for val in [valid.astype(float),x,x*x]:
+        cs = np.concatenate((np.zeros(shape),np.cumsum(val,axis=1)),axis=1)
+        hi = np.arange(1,data.shape[1]+1)
+        lo = np.maximum(hi - window,0)
+        sums.append(cs[:,hi] - cs[:,lo])
+    # end for val in [...]:
+    n,s1,s2 = sums
+
+    with np.errstate(invalid='ignore',divide='ignore'):
+        mean = np.where(n > 0,s1/n + ref,np.nan)
+        std = np.where(n > 1,np.sqrt(np.maximum(s2 - s1*s1/n,0.)/(n - 1)),np.nan)
+    # end with np.errstate(...):
+
+    return(mean,std)
+# end def _rolling_mean_std(data,window):
+
+def _take_index(mask,how):
+    """Index to fill each series (axis 1) with previous, next or nearest
+    valid entry between its first and last valid entry. Ties of nearest go
+    to the next entry as in pandas.DataFrame.reindex(method='nearest')."""
+
+    nser,ntime,ncol = mask.shape
+    t = np.arange(ntime)[None,:,None]
+    before = np.maximum.accumulate(np.where(mask,t,-1),axis=1)
+    after = np.minimum.accumulate(np.where(mask,t,ntime)[:,::-1],axis=1)[:,::-1]
+    inside = (before >= 0) & (after < ntime)
+    if how == 'prev':
+        pos = before
+    elif how == 'next':
+        pos = after
+    else:
+        pos = np.where(t - before < after - t,before,after)
+    # end if how == 'prev':
+    # outside of first and last valid entry the entry itself (NaN) is used
+    pos = np.where(inside,pos,t)
+
+    i = np.arange(nser)[:,None,None]
+    j = np.arange(ncol)[None,None,:]
+
+    return((np.broadcast_to(i,pos.shape),pos,np.broadcast_to(j,pos.shape)))
+# end def _take_index(mask,how):
+
+def _first_valid(values):
+    """First valid entry of each series along axis 1."""
+
+    valid = ~np.isnan(values)
+    first = np.argmax(valid,axis=1)
+    ref = np.take_along_axis(values,first[:,None,:],axis=1)
+
+    return(np.where(valid.any(axis=1)[:,None,:],ref,np.nan))
+# end def _first_valid(values):
+
+def _nan_reduce(func,values):
+    """Applies nan-function along axis 1 (NaN for all NaN series)."""
+
+    valid = ~np.isnan(values)
+    ref = np.full((values.shape[0],1,values.shape[2]),np.nan)
+    has = valid.any(axis=1)
+    if has.any():
+        i,j = np.nonzero(has)
+        ref[i,0,j] = func(values[i,:,j],axis=1)
+    # end if has.any():
+
+    return(ref)
+# end def _nan_reduce(func,values):
@@ -9,10 +9,12 @@ import multiprocessing
 from .search_df import *
 from .extract_df import *
 from .calc import *
+from .store import *
+from .metrics import *
 
 GMT_DATEFORMAT = '%Y-%m-%dT%H:%M'
 
-def hori_bsl(ID,bsl_all,st_series,minmax,outlier_flag=None,writefile=True):
+def hori_bsl(ID,bsl_all,st_series,minmax,outlier_flag=None,writefile=True,processes=None,stats=False,fmt=None,verbose=True):
     """Calculates baselines for all possible pairs.
 
     It needs:
@@ -21,18 +23,30 @@ def hori_bsl(ID,bsl_all,st_series,minmax,outlier_flag=None,writefile=True):
         measurements: ID of other station ('range_ID'), traveltime ('range')
         and turn around time ('TAT') with corresponding times of measurement
         for each beacon (same order as items in ID)
-    ssp_all ... an 1-dim list with pandas.DataFrame with sound speed ('ssp')
-        with corresponding times of measurement for each beacon (same order
-        as items in ID)
+    st_series ... an 1-dim list with pandas.DataFrame with sound speed
+        ('ssp') and further sensor data (as returned by sv_leroy()) with
+        corresponding times of measurement for each beacon (same order as
+        items in ID)
     minmax ... half time window length for searching for sound speed at
         beacon 2
     outlier_flag (optional) ... if set to 1 all baselines with lengths
         +/-10m are removed
-    suffix (optional) ... file suffix for saved baseline files (default - no
-        suffix)
     writefile (optional) ... if True files containing all baseline parameters
         will be created in current directory, if False data will just be
         returned (default True)
+    processes (optional) ... number of worker processes used to calculate
+        the beacon pairs in parallel (default None -> all pairs are
+        calculated one after another, 0 -> number of CPUs). The station
+        data is handed over once to each worker process and not for every
+        single pair.
+    stats (optional) ... if True a pandas.DataFrame with statistics for
+        each beacon pair is returned additionally (default False)
+    fmt (optional) ... format of written files: 'dat' - text files, 'npy' -
+        binary files, 'both' - text and binary files (default see
+        write_data())
+    verbose (optional) ... if True the statistics of each beacon pair are
+        printed (default True), they are also stored in the records of stage
+        'pair' (see metric_stage()) if metrics are enabled
 
     It returns:
     ID_pair ... a 2-dim list with IDs of beacon pairs
@@ -45,177 +59,332 @@ def hori_bsl(ID,bsl_all,st_series,minmax,outlier_flag=None,writefile=True):
         ('range'), turn around time in milliseconds ('TAT') with
         corresponding times of measurement for each beacon pair (same order
         as list items in ID_pair)
+    df_stats (only if stats is True) ... pandas.DataFrame with number of
+        ranges found ('ranges'), successfully calculated baselines ('bsl'),
+        missing sound speed records at beacon 1 ('sv1_err') and beacon 2
+        ('sv2_err') and baselines kept after outlier removal ('kept') with
+        index <ID1>-<ID2> (same order as list items in ID_pair)
     """
 
-    cal_bsl_all = []
-    pool = multiprocessing.Pool(processes=4)
     ID_pair = []
-    st_svleroy = []
-        
+    pair_index = []
     for i, beacon_1 in enumerate(ID):
         for j, beacon_2 in enumerate(ID):
             if beacon_1 != beacon_2:
-
-                print('Baseline Calculation for: ' + str(beacon_1) + ' <-> ' + str(beacon_2))
-                print('-------------------------------------------------------------------------------')
                 ID_pair.append([beacon_1,beacon_2])
-                # create new pandas.DataFrame holding baseline measurements
-                # between beacon_1 and beacon_2 which are not 0.0 milli seconds
-                df_bsl = bsl_all[i].loc[(bsl_all[i]['range_ID']==int(beacon_2)) & (bsl_all[i]['range']!=0.0)]
-
-                if not df_bsl.empty and not st_series[i].empty and not st_series[j].empty:
-                    # set new column 'ID' of beacon 1
-                    df_bsl['ID']=int(beacon_1)
-                    # alternative version:
-                    #df_bsl.loc[df_bsl.index,'ID'] = int(beacon_1)
-
-                    df_bsl,SV_1_err_count = search_df(df_bsl,st_series[i],minmax,0.0,'ssp1',0)
-                    df_bsl,SV_1_err_count = search_df(df_bsl,st_series[i],minmax,0.0,'sv_hrt1',10)
-                    df_bsl,SV_1_err_count = search_df(df_bsl,st_series[i],minmax,0.0,'sv_tpr1',11)
-                    
-                    df_bsl,SV_1_err_count = search_df(df_bsl,st_series[i],minmax,0.0,'prs1',1)
-                    
-                    df_bsl,SV_1_err_count = search_df(df_bsl,st_series[i],minmax,0.0,'hrt1',2)
-                    df_bsl,SV_1_err_count = search_df(df_bsl,st_series[i],minmax,0.0,'tpr1',3)
-                    df_bsl,SV_1_err_count = search_df(df_bsl,st_series[i],minmax,0.0,'sal1',12)
-                    
-                    
-                    df_bsl,SV_2_err_count = search_df(df_bsl,st_series[i],minmax,0.0,'ssp2',0)
-                    df_bsl,SV_2_err_count = search_df(df_bsl,st_series[i],minmax,0.0,'sv_hrt2',10)
-                    df_bsl,SV_2_err_count = search_df(df_bsl,st_series[i],minmax,0.0,'sv_tpr2',11)
-                    
-                    df_bsl,SV_2_err_count = search_df(df_bsl,st_series[i],minmax,0.0,'prs2',1)
-                    
-                    df_bsl,SV_2_err_count = search_df(df_bsl,st_series[i],minmax,0.0,'hrt2',2)
-                    df_bsl,SV_2_err_count = search_df(df_bsl,st_series[i],minmax,0.0,'tpr2',3)
-                    df_bsl,SV_2_err_count = search_df(df_bsl,st_series[i],minmax,0.0,'sal2',12)
-                    
-                    # define criteria that ssp1 and ssp2 have to be not NaN
-                    # for row selection allow also single sided baseline
-                    # calculation
+                pair_index.append([i,j])
+            # end if beacon_1 != beacon_2:
+        # end for j, beacon_2 in enumerate(ID):
+    # end for i, beacon_1 in enumerate(ID):
+
+    if processes is None or processes == 1:
+        results = []
+        for i,j in pair_index:
+            results.append(calc_pair_bsl(ID[i],ID[j],bsl_all[i],st_series[i],st_series[j],minmax,outlier_flag,writefile,fmt))
+        # end for i,j in pair_index:
+    else:
+        if processes == 0:
+            processes = multiprocessing.cpu_count()
+        # end if processes == 0:
+        # the station data is passed once to each worker by the initializer,
+        # the single tasks only hold the position of the beacons in ID
+        with multiprocessing.Pool(processes=processes,initializer=_init_pair_worker,initargs=(ID,bsl_all,st_series,minmax,outlier_flag,writefile,fmt,metrics_enabled())) as pool:
+            # map keeps the order of pair_index
+            results = pool.map(_pair_worker,pair_index)
+        # end with multiprocessing.Pool(...) as pool:
+        # timings of the worker processes are returned with the results
+        for k,(df_bsl,bsl_stats,records) in enumerate(results):
+            add_metrics(records)
+            results[k] = (df_bsl,bsl_stats)
+        # end for k,(df_bsl,bsl_stats,records) in enumerate(results):
+    # end if processes is None or processes == 1:
+
+    final_bsls = []
+    pair_stats = []
+    for k,(df_bsl,bsl_stats) in enumerate(results):
+        if verbose:
+            print('Baseline Calculation for: ' + str(ID_pair[k][0]) + ' <-> ' + str(ID_pair[k][1]))
+            print('-------------------------------------------------------------------------------')
+            print(str(bsl_stats['ranges']) + '\t Ranges found')
+            print(str(bsl_stats['bsl']) + '\t Successfull Calculated Baselines')
+            if bsl_stats['ranges'] != 0:
+                print(str(bsl_stats['sv1_err']) + '\t No SV Record in -> ' + str(ID_pair[k][0]))
+                print(str(bsl_stats['sv2_err']) + '\t No SV Record in -> ' + str(ID_pair[k][1]))
+            # end if bsl_stats['ranges'] != 0:
+            if outlier_flag == 1:
+                print('Cut Off unrealistic Ranges and Baselines')
+                print("{0:d} baselines from {1:d} kept.".format(bsl_stats['kept'],bsl_stats['ranges']))
+            # end if outlier_flag == 1:
+            print(' \n')
+        # end if verbose:
+
+        final_bsls.append(df_bsl)
+        pair_stats.append(bsl_stats)
+    # end for k,(df_bsl,bsl_stats) in enumerate(results):
+
+    if not writefile and verbose:
+        print('\n')
+        print('Data has not been stored in files!')
+    # end if not writefile and verbose:
+
+    if stats:
+        df_stats = pd.DataFrame(pair_stats,index=[str(p[0])+'-'+str(p[1]) for p in ID_pair],columns=['ranges','bsl','sv1_err','sv2_err','kept'])
+        return(ID_pair,final_bsls,df_stats)
+    # end if stats:
+
+    return(ID_pair,final_bsls)
+# end def hori_bsl( ... ):
+
+def calc_pair_bsl(beacon_1,beacon_2,bsl_1,st_1,st_2,minmax,outlier_flag=None,writefile=True,fmt=None):
+    """Calculates baselines for one directed beacon pair.
+
+    It needs:
+    beacon_1 ... ID of beacon 1
+    beacon_2 ... ID of beacon 2
+    bsl_1 ... pandas.DataFrame with baseline measurements of beacon 1 (see
+        bsl_all in hori_bsl())
+    st_1 ... pandas.DataFrame with sound speed and sensor data of beacon 1
+        (see st_series in hori_bsl())
+    st_2 ... pandas.DataFrame with sound speed and sensor data of beacon 2
+    minmax ... half time window length for searching for sound speed at
+        beacon 1 and beacon 2
+    outlier_flag (optional) ... if set to 1 all baselines with lengths
+        +/-10m are removed
+    writefile (optional) ... if True files containing all baseline parameters
+        will be created in ../DATA/ (default True)
+    fmt (optional) ... format of written files (see write_data())
+
+    It returns:
+    df_bsl ... pandas.DataFrame with baselines of the beacon pair (see
+        final_bsls in hori_bsl())
+    bsl_stats ... dict with number of ranges found ('ranges'), successfully
+        calculated baselines ('bsl'), missing sound speed records at beacon 1
+        ('sv1_err') and beacon 2 ('sv2_err') and baselines kept after
+        outlier removal ('kept')
+    """
+
+    with metric_stage('pair',pair=str(beacon_1)+'-'+str(beacon_2)) as stage:
+        df_bsl,bsl_stats = match_pair_bsl(beacon_1,beacon_2,bsl_1,st_1,st_2,minmax)
+        if writefile:
+            write_data(df_bsl,'../DATA/' + beacon_1 +'-'+ beacon_2 +'-BSL',fmt,sep=',')
+        # end if writefile:
+
+        df_bsl = cut_pair_bsl(df_bsl,outlier_flag)
+        bsl_stats['kept'] = len(df_bsl)
+
+        if writefile:
+            write_data(df_bsl,'../DATA/' + beacon_1 +'-'+ beacon_2,fmt,sep=',')
+        # end if writefile:
+
+        # statistics of the pair are part of the record
+        stage.update(bsl_stats)
+        stage['records'] = bsl_stats['ranges']
+    # end with metric_stage('pair', ... ) as stage:
+
+    return(df_bsl,bsl_stats)
+# end def calc_pair_bsl( ... ):
+
+def match_pair_bsl(beacon_1,beacon_2,bsl_1,st_1,st_2,minmax):
+    """Matches sensor data to the ranges of one directed beacon pair and
+    calculates the baseline lengths.
+
+    It needs:
+    beacon_1 ... ID of beacon 1
+    beacon_2 ... ID of beacon 2
+    bsl_1 ... pandas.DataFrame with baseline measurements of beacon 1 (see
+        bsl_all in hori_bsl())
+    st_1 ... pandas.DataFrame with sound speed and sensor data of beacon 1
+        (see st_series in hori_bsl())
+    st_2 ... pandas.DataFrame with sound speed and sensor data of beacon 2
+    minmax ... half time window length for searching for sound speed at
+        beacon 1 and beacon 2
+
+    It returns:
+    df_bsl ... pandas.DataFrame with all baseline parameters (as written to
+        <ID1>-<ID2>-BSL.dat)
+    bsl_stats ... dict with number of ranges found ('ranges'), successfully
+        calculated baselines ('bsl') and missing sound speed records at
+        beacon 1 ('sv1_err') and beacon 2 ('sv2_err')
+    """
+
+    # create new pandas.DataFrame holding baseline measurements
+    # between beacon_1 and beacon_2 which are not 0.0 milli seconds
+    df_bsl = bsl_1.loc[(bsl_1['range_ID']==int(beacon_2)) & (bsl_1['range']!=0.0)].copy()
+
+    if not df_bsl.empty and not st_1.empty and not st_2.empty:
+        # set new column 'ID' of beacon 1
+        df_bsl['ID']=int(beacon_1)
+        # alternative version:
+        #df_bsl.loc[df_bsl.index,'ID'] = int(beacon_1)
+
+        # attach sound speed, pressure, temperature and salinity
+        # of beacon 1 and beacon 2 with one search per beacon
+        with metric_stage('search_df',records=len(df_bsl),pair=str(beacon_1)+'-'+str(beacon_2)):
+            df_bsl,SV_1_err_count = search_df_multi(df_bsl,st_1,minmax,0.0,['ssp1','sv_hrt1','sv_tpr1','prs1','hrt1','tpr1','sal1'],[0,10,11,1,2,3,12])
+            df_bsl,SV_2_err_count = search_df_multi(df_bsl,st_2,minmax,0.0,['ssp2','sv_hrt2','sv_tpr2','prs2','hrt2','tpr2','sal2'],[0,10,11,1,2,3,12])
+        # end with metric_stage('search_df', ... ):
+
+        with metric_stage('baseline',records=len(df_bsl),pair=str(beacon_1)+'-'+str(beacon_2)):
+            df_bsl,bsl_sucess = calc_pair_columns(df_bsl)
+        # end with metric_stage('baseline', ... ):
+
+    else:
+        bsl_sucess = 0
+        SV_1_err_count = 0
+        SV_2_err_count = 0
+    #end if not df_bsl.empty:
+
+    df_bsl = extract_df(df_bsl,column_list=['ID','range_ID','range','TAT','tt','hrt1','hrt2','prs1','prs2','tpr1','tpr2','sal1','sal2','ssp1','ssp2','bsl','sv_hrt1','sv_hrt2','bsl_hrt','sv_tpr1','sv_tpr2','bsl_tpr'])
+
+    bsl_stats = {'ranges' : len(df_bsl), 'bsl' : bsl_sucess, 'sv1_err' : SV_1_err_count, 'sv2_err' : SV_2_err_count}
+
+    return(df_bsl,bsl_stats)
+# end def match_pair_bsl( ... ):
+
+def calc_pair_columns(df_bsl):
+    """Calculates traveltime and baseline lengths from ranges with matched
+    sound speeds.
+
+    It needs:
+    df_bsl ... pandas.DataFrame with ranges ('range','TAT') and sound speeds
+        at beacon 1 and beacon 2 ('ssp1','ssp2','sv_hrt1','sv_hrt2',
+        'sv_tpr1','sv_tpr2', 0.0 if not found) as created in
+        match_pair_bsl()
+
+    It returns:
+    df_bsl ... pandas.DataFrame with additional one way traveltime in seconds
+        ('tt') and baseline lengths in metres ('bsl','bsl_hrt','bsl_tpr')
+    bsl_sucess ... number of successfully calculated baselines ('bsl')
+    """
+
+    # define criteria that ssp1 and ssp2 have to be not NaN
+    # for row selection allow also single sided baseline
+    # calculation
     #---------------------------------------------------------------------------------------
     #            SSP
-                    criteria_ssp = (df_bsl['ssp1']!=0.0) & (df_bsl['ssp2']!=0.0)
-                    ssp2_check = (df_bsl['ssp2'] == 0.0) & (df_bsl['ssp1']!=0.0)
-                    ssp1_check = (df_bsl['ssp1'] == 0.0) & (df_bsl['ssp2']!=0.0)
-                    
-                    df_bsl.loc[criteria_ssp,'tt'] = ((df_bsl[criteria_ssp]['range']-df_bsl[criteria_ssp]['TAT'])/2)/1000
-                    df_bsl.loc[ssp2_check,'tt'] = ((df_bsl[ssp2_check]['range']-df_bsl[ssp2_check]['TAT'])/2)/1000
-                    df_bsl.loc[ssp1_check,'tt'] = ((df_bsl[ssp1_check]['range']-df_bsl[ssp1_check]['TAT'])/2)/1000
-                    
-                    df_bsl.loc[criteria_ssp,'bsl'] = baseline_calc_hmean(df_bsl[criteria_ssp]['ssp1'],df_bsl[criteria_ssp]['ssp2'],df_bsl[criteria_ssp]['range'],df_bsl[criteria_ssp]['TAT'])
-                    
-                    df_bsl.loc[ssp1_check,'bsl'] = baseline_calc_hmean(df_bsl[ssp1_check]['ssp2'],df_bsl[ssp1_check]['ssp2'],df_bsl[ssp1_check]['range'],df_bsl[ssp1_check]['TAT'])
-
-                    df_bsl.loc[ssp2_check,'bsl'] = baseline_calc_hmean(df_bsl[ssp2_check]['ssp1'],df_bsl[ssp2_check]['ssp1'],df_bsl[ssp2_check]['range'],df_bsl[ssp2_check]['TAT'])
-                    
-                    bsl_sucess = len(df_bsl.loc[pd.notnull(df_bsl['bsl'])])
+    criteria_ssp = (df_bsl['ssp1']!=0.0) & (df_bsl['ssp2']!=0.0)
+    ssp2_check = (df_bsl['ssp2'] == 0.0) & (df_bsl['ssp1']!=0.0)
+    ssp1_check = (df_bsl['ssp1'] == 0.0) & (df_bsl['ssp2']!=0.0)
+    
+    df_bsl.loc[criteria_ssp,'tt'] = ((df_bsl[criteria_ssp]['range']-df_bsl[criteria_ssp]['TAT'])/2)/1000
+    df_bsl.loc[ssp2_check,'tt'] = ((df_bsl[ssp2_check]['range']-df_bsl[ssp2_check]['TAT'])/2)/1000
+    df_bsl.loc[ssp1_check,'tt'] = ((df_bsl[ssp1_check]['range']-df_bsl[ssp1_check]['TAT'])/2)/1000
+    
+    df_bsl.loc[criteria_ssp,'bsl'] = baseline_calc_hmean(df_bsl[criteria_ssp]['ssp1'],df_bsl[criteria_ssp]['ssp2'],df_bsl[criteria_ssp]['range'],df_bsl[criteria_ssp]['TAT'])
+    
+    df_bsl.loc[ssp1_check,'bsl'] = baseline_calc_hmean(df_bsl[ssp1_check]['ssp2'],df_bsl[ssp1_check]['ssp2'],df_bsl[ssp1_check]['range'],df_bsl[ssp1_check]['TAT'])
+
+    df_bsl.loc[ssp2_check,'bsl'] = baseline_calc_hmean(df_bsl[ssp2_check]['ssp1'],df_bsl[ssp2_check]['ssp1'],df_bsl[ssp2_check]['range'],df_bsl[ssp2_check]['TAT'])
+    
+    bsl_sucess = len(df_bsl.loc[pd.notnull(df_bsl['bsl'])])
     #---------------------------------------------------------------------------------------
     #            SV_HRT
 
-                    criteria_sv_hrt = (df_bsl['sv_hrt1']!=0.0) & (df_bsl['sv_hrt2']!=0.0)
-                    sv_hrt2_check = (df_bsl['sv_hrt2'] == 0.0) & (df_bsl['sv_hrt1']!=0.0)
-                    sv_hrt1_check = (df_bsl['sv_hrt1'] == 0.0) & (df_bsl['sv_hrt2']!=0.0)
-                    
-                    df_bsl.loc[criteria_sv_hrt,'tt'] = ((df_bsl[criteria_sv_hrt]['range']-df_bsl[criteria_sv_hrt]['TAT'])/2)/1000
-                    df_bsl.loc[sv_hrt2_check,'tt'] = ((df_bsl[sv_hrt2_check]['range']-df_bsl[sv_hrt2_check]['TAT'])/2)/1000
-                    df_bsl.loc[sv_hrt1_check,'tt'] = ((df_bsl[sv_hrt1_check]['range']-df_bsl[sv_hrt1_check]['TAT'])/2)/1000
-                    
-                    df_bsl.loc[criteria_sv_hrt,'bsl_hrt'] = baseline_calc_hmean(df_bsl[criteria_sv_hrt]['sv_hrt1'],df_bsl[criteria_sv_hrt]['sv_hrt2'],df_bsl[criteria_sv_hrt]['range'],df_bsl[criteria_sv_hrt]['TAT'])
-                    
-                    df_bsl.loc[sv_hrt1_check,'bsl_hrt'] = baseline_calc_hmean(df_bsl[sv_hrt1_check]['sv_hrt2'],df_bsl[sv_hrt1_check]['sv_hrt2'],df_bsl[sv_hrt1_check]['range'],df_bsl[sv_hrt1_check]['TAT'])
-
-                    df_bsl.loc[sv_hrt2_check,'bsl_hrt'] = baseline_calc_hmean(df_bsl[sv_hrt2_check]['sv_hrt1'],df_bsl[sv_hrt2_check]['sv_hrt1'],df_bsl[sv_hrt2_check]['range'],df_bsl[sv_hrt2_check]['TAT'])
-                    
-                    bsl_hrt_sucess = len(df_bsl.loc[pd.notnull(df_bsl['bsl_hrt'])])
+    criteria_sv_hrt = (df_bsl['sv_hrt1']!=0.0) & (df_bsl['sv_hrt2']!=0.0)
+    sv_hrt2_check = (df_bsl['sv_hrt2'] == 0.0) & (df_bsl['sv_hrt1']!=0.0)
+    sv_hrt1_check = (df_bsl['sv_hrt1'] == 0.0) & (df_bsl['sv_hrt2']!=0.0)
+    
+    df_bsl.loc[criteria_sv_hrt,'tt'] = ((df_bsl[criteria_sv_hrt]['range']-df_bsl[criteria_sv_hrt]['TAT'])/2)/1000
+    df_bsl.loc[sv_hrt2_check,'tt'] = ((df_bsl[sv_hrt2_check]['range']-df_bsl[sv_hrt2_check]['TAT'])/2)/1000
+    df_bsl.loc[sv_hrt1_check,'tt'] = ((df_bsl[sv_hrt1_check]['range']-df_bsl[sv_hrt1_check]['TAT'])/2)/1000
+    
+    df_bsl.loc[criteria_sv_hrt,'bsl_hrt'] = baseline_calc_hmean(df_bsl[criteria_sv_hrt]['sv_hrt1'],df_bsl[criteria_sv_hrt]['sv_hrt2'],df_bsl[criteria_sv_hrt]['range'],df_bsl[criteria_sv_hrt]['TAT'])
+    
+    df_bsl.loc[sv_hrt1_check,'bsl_hrt'] = baseline_calc_hmean(df_bsl[sv_hrt1_check]['sv_hrt2'],df_bsl[sv_hrt1_check]['sv_hrt2'],df_bsl[sv_hrt1_check]['range'],df_bsl[sv_hrt1_check]['TAT'])
+
+    df_bsl.loc[sv_hrt2_check,'bsl_hrt'] = baseline_calc_hmean(df_bsl[sv_hrt2_check]['sv_hrt1'],df_bsl[sv_hrt2_check]['sv_hrt1'],df_bsl[sv_hrt2_check]['range'],df_bsl[sv_hrt2_check]['TAT'])
+    
+    bsl_hrt_sucess = len(df_bsl.loc[pd.notnull(df_bsl['bsl_hrt'])])
     #---------------------------------------------------------------------------------------
     #            SV_TPR
     
-                    criteria_sv_tpr = (df_bsl['sv_tpr1']!=0.0) & (df_bsl['sv_tpr2']!=0.0)
-                    sv_tpr2_check = (df_bsl['sv_tpr2'] == 0.0) & (df_bsl['sv_tpr1']!=0.0)
-                    sv_tpr1_check = (df_bsl['sv_tpr1'] == 0.0) & (df_bsl['sv_tpr2']!=0.0)
-                    
-                    df_bsl.loc[criteria_sv_tpr,'tt'] = ((df_bsl[criteria_sv_tpr]['range']-df_bsl[criteria_sv_tpr]['TAT'])/2)/1000
-                    df_bsl.loc[sv_tpr2_check,'tt'] = ((df_bsl[sv_tpr2_check]['range']-df_bsl[sv_tpr2_check]['TAT'])/2)/1000
-                    df_bsl.loc[sv_tpr1_check,'tt'] = ((df_bsl[sv_tpr1_check]['range']-df_bsl[sv_tpr1_check]['TAT'])/2)/1000
-                    
-                    df_bsl.loc[criteria_sv_hrt,'bsl_tpr'] = baseline_calc_hmean(df_bsl[criteria_sv_tpr]['sv_tpr1'],df_bsl[criteria_sv_tpr]['sv_tpr2'],df_bsl[criteria_sv_tpr]['range'],df_bsl[criteria_sv_tpr]['TAT'])
-                    
-                    df_bsl.loc[sv_tpr1_check,'bsl_tpr'] = baseline_calc_hmean(df_bsl[sv_tpr1_check]['sv_tpr2'],df_bsl[sv_tpr1_check]['sv_tpr2'],df_bsl[sv_tpr1_check]['range'],df_bsl[sv_tpr1_check]['TAT'])
-
-                    df_bsl.loc[sv_tpr2_check,'bsl_tpr'] = baseline_calc_hmean(df_bsl[sv_tpr2_check]['sv_tpr1'],df_bsl[sv_tpr2_check]['sv_tpr1'],df_bsl[sv_tpr2_check]['range'],df_bsl[sv_tpr2_check]['TAT'])
-                    
-                    bsl_tpr_sucess = len(df_bsl.loc[pd.notnull(df_bsl['bsl_tpr'])])
-                    
-                    # calculate traveltime in seconds and store in new column of
-                    # df_bsl
-
-                    # calculate baseline length
-
-                    
-                    # count entries of df_bsl for which 'bsl' is not NaN
-
-                else:
-                    bsl_sucess = 0
-                #end if not df_bsl.empty:
-
-                df_bsl = extract_df(df_bsl,column_list=['ID','range_ID','range','TAT','tt','hrt1','hrt2','prs1','prs2','tpr1','tpr2','sal1','sal2','ssp1','ssp2','bsl','sv_hrt1','sv_hrt2','bsl_hrt','sv_tpr1','sv_tpr2','bsl_tpr'])
-                if writefile:
-                    df_bsl.to_csv('../DATA/' + beacon_1 +'-'+ beacon_2 +'-BSL.dat', header=True, date_format=GMT_DATEFORMAT)
-                    # end if suffix == None:
-                # end if writefile:
-
-                print(str(len(df_bsl)) + '\t Ranges found')
-                print(str(bsl_sucess) + '\t Successfull Calculated Baselines')
-                if len(df_bsl) != 0:
-                    print(str(SV_1_err_count) + '\t No SV Record in -> ' + str(beacon_1))
-                    print(str(SV_2_err_count) + '\t No SV Record in -> ' + str(beacon_2))
-                print(' \n')
-
-                #  append to data formats of other stations
-                cal_bsl_all.append(df_bsl)
+    criteria_sv_tpr = (df_bsl['sv_tpr1']!=0.0) & (df_bsl['sv_tpr2']!=0.0)
+    sv_tpr2_check = (df_bsl['sv_tpr2'] == 0.0) & (df_bsl['sv_tpr1']!=0.0)
+    sv_tpr1_check = (df_bsl['sv_tpr1'] == 0.0) & (df_bsl['sv_tpr2']!=0.0)
+    
+    df_bsl.loc[criteria_sv_tpr,'tt'] = ((df_bsl[criteria_sv_tpr]['range']-df_bsl[criteria_sv_tpr]['TAT'])/2)/1000
+    df_bsl.loc[sv_tpr2_check,'tt'] = ((df_bsl[sv_tpr2_check]['range']-df_bsl[sv_tpr2_check]['TAT'])/2)/1000
+    df_bsl.loc[sv_tpr1_check,'tt'] = ((df_bsl[sv_tpr1_check]['range']-df_bsl[sv_tpr1_check]['TAT'])/2)/1000
+    
+    df_bsl.loc[criteria_sv_hrt,'bsl_tpr'] = baseline_calc_hmean(df_bsl[criteria_sv_tpr]['sv_tpr1'],df_bsl[criteria_sv_tpr]['sv_tpr2'],df_bsl[criteria_sv_tpr]['range'],df_bsl[criteria_sv_tpr]['TAT'])
+    
+    df_bsl.loc[sv_tpr1_check,'bsl_tpr'] = baseline_calc_hmean(df_bsl[sv_tpr1_check]['sv_tpr2'],df_bsl[sv_tpr1_check]['sv_tpr2'],df_bsl[sv_tpr1_check]['range'],df_bsl[sv_tpr1_check]['TAT'])
 
+    df_bsl.loc[sv_tpr2_check,'bsl_tpr'] = baseline_calc_hmean(df_bsl[sv_tpr2_check]['sv_tpr1'],df_bsl[sv_tpr2_check]['sv_tpr1'],df_bsl[sv_tpr2_check]['range'],df_bsl[sv_tpr2_check]['TAT'])
+    
+    bsl_tpr_sucess = len(df_bsl.loc[pd.notnull(df_bsl['bsl_tpr'])])
+    
+    # calculate traveltime in seconds and store in new column of
+    # df_bsl
 
-            # end if beacon_1 != beacon_2:
+    # calculate baseline length
 
-        # end for j, beacon_2 in enumerate(ID):
+    
+    # count entries of df_bsl for which 'bsl' is not NaN
 
-    # end for i, beacon_1 in enumerate(ID):
+    return(df_bsl,bsl_sucess)
+# end def calc_pair_columns(df_bsl):
 
-    final_bsls = []
-    for i in range(len(cal_bsl_all)):
-        if outlier_flag == 1:
-            ### cut off unrealistic Ranges and Baselines ###
-
-            # This part removes all baselines with lengths +/-10m
-
-            print('Cut Off unrealistic Ranges and Baselines')
-            # calculate mean range exculding NaN value
-            mean_bsl = cal_bsl_all[i].mean(axis=0,skipna=True)['bsl']
-            # keep only those baselines within mean_bsl +/-10 m
-            df_bsl = cal_bsl_all[i].loc[ (cal_bsl_all[i]['bsl']>mean_bsl-10) & (cal_bsl_all[i]['bsl']<mean_bsl+10)]
-            print("Pair: {0:s} <-> {1:s}".format(ID_pair[i][0],ID_pair[i][1]))
-            print("{0:d} baselines from {1:d} kept.".format(len(df_bsl),len(cal_bsl_all[i])))
-        else:
-            df_bsl = cal_bsl_all[i]
-        # end if outlier_flag == 1:
-
-        # re-arange order of columns
-        df_bsl = extract_df(df_bsl,column_list=['ID','range_ID','bsl','tt','ssp1','ssp2','hrt1','hrt2','prs1','prs2','sal1','sal2','range','TAT'])
-        final_bsls.append(df_bsl)
+def cut_pair_bsl(df_bsl,outlier_flag=None):
+    """Removes outliers and selects final columns of baselines of one beacon
+    pair.
 
-        if writefile:
-            final_bsls[i].to_csv('../DATA/' + ID_pair[i][0] +'-'+ ID_pair[i][1] +'.dat', header=True, date_format=GMT_DATEFORMAT)
-      
-            # end if suffix is None:
-        # end if writefile:
-    # end for i in range(len(cal_bsl_all):
+    It needs:
+    df_bsl ... pandas.DataFrame with all baseline parameters as returned by
+        match_pair_bsl()
+    outlier_flag (optional) ... if set to 1 all baselines with lengths
+        +/-10m are removed
 
-    if not writefile:
-        print('\n')
-        print('Data has not been stored in files!')
-    # end if not writefile:
+    It returns:
+    df_bsl ... pandas.DataFrame with baselines of the beacon pair (see
+        final_bsls in hori_bsl())
+    """
 
+    if outlier_flag == 1 and not df_bsl.empty:
+        ### cut off unrealistic Ranges and Baselines ###
 
-    return(ID_pair,final_bsls)
-# end def sort_bsl( ... ):
+        # This part removes all baselines with lengths +/-10m
+
+        # calculate mean range exculding NaN value
+        mean_bsl = df_bsl['bsl'].mean(skipna=True)
+        # keep only those baselines within mean_bsl +/-10 m
+        df_bsl = df_bsl.loc[ (df_bsl['bsl']>mean_bsl-10) & (df_bsl['bsl']<mean_bsl+10)]
+    # end if outlier_flag == 1:
+
+    # re-arange order of columns
+    df_bsl = extract_df(df_bsl,column_list=['ID','range_ID','bsl','tt','ssp1','ssp2','hrt1','hrt2','prs1','prs2','sal1','sal2','range','TAT'])
+
+    return(df_bsl)
+# end def cut_pair_bsl(df_bsl,outlier_flag=None):
+
+# data shared with the worker processes of hori_bsl(), set once per worker
+_PAIR_DATA = {}
+
+def _init_pair_worker(ID,bsl_all,st_series,minmax,outlier_flag,writefile,fmt,metrics=False):
+    """Stores data needed by _pair_worker() in the worker process."""
+
+    _PAIR_DATA['ID'] = ID
+    _PAIR_DATA['bsl_all'] = bsl_all
+    _PAIR_DATA['st_series'] = st_series
+    _PAIR_DATA['minmax'] = minmax
+    _PAIR_DATA['outlier_flag'] = outlier_flag
+    _PAIR_DATA['writefile'] = writefile
+    _PAIR_DATA['fmt'] = fmt
+    _PAIR_DATA['metrics'] = metrics
+# end def _init_pair_worker( ... ):
+
+def _pair_worker(pair):
+    """Calculates baselines for pair [i,j] of positions in ID, the timings
+    of this pair (see get_metrics()) are returned additionally."""
+
+    i,j = pair
+    d = _PAIR_DATA
+
+    if d['metrics']:
+        enable_metrics()
+    # end if d['metrics']:
+    df_bsl,bsl_stats = calc_pair_bsl(d['ID'][i],d['ID'][j],d['bsl_all'][i],d['st_series'][i],d['st_series'][j],d['minmax'],d['outlier_flag'],d['writefile'],d['fmt'])
+    records = disable_metrics()
+
+    return(df_bsl,bsl_stats,records)
+# end def _pair_worker(pair):
@@ -0,0 +1,190 @@
+#-------------------------------------------------------------------------------
+#       Timing and Record Counts of Processing Stages
+#-------------------------------------------------------------------------------
+
+import contextlib
+import time
+import tracemalloc
+import pandas as pd
+
+# state of the recorder, records are only collected if enabled
+_METRICS = {'enabled' : False, 'records' : [], 'stack' : [], 'callback' : None}
+
+def enable_metrics(callback=None):
+    """Starts collecting timings and record counts of the processing stages.
+
+    Each stage (e.g. 'read', 'sv_leroy', 'search_df', 'baseline', 'write',
+    'vert_bsl') creates one record when it is finished. If tracemalloc is
+    tracing (tracemalloc.start()) also the peak memory of the stage is
+    stored.
+
+    It needs:
+    callback (optional) ... function called with each record (dict, see
+        get_metrics()) when it is finished, e.g. to write it to a log file
+        (default None)
+
+    It returns:
+    nothing
+    """
+
+    _METRICS['enabled'] = True
+    _METRICS['records'] = []
+    _METRICS['stack'] = []
+    _METRICS['callback'] = callback
+# end def enable_metrics(callback=None):
+
+def disable_metrics():
+    """Stops collecting timings and record counts.
+
+    It returns:
+    records ... 1-dim list with collected records (see get_metrics())
+    """
+
+    _METRICS['enabled'] = False
+    _METRICS['stack'] = []
+    _METRICS['callback'] = None
+
+    return(_METRICS['records'])
+# end def disable_metrics():
+
+def get_metrics():
+    """Returns collected records.
+
+    It returns:
+    records ... 1-dim list with dict for each finished stage with name of
+        stage ('stage'), start time in seconds since the epoch ('start'),
+        duration in seconds ('time'), duration without nested stages in
+        seconds ('self_time'), number of processed records ('records'), peak
+        memory in bytes ('peak_mem', None if tracemalloc is not tracing) and
+        further information given by the stage (e.g. 'station', 'pair')
+    """
+
+    return(_METRICS['records'])
+# end def get_metrics():
+
+def add_metrics(records):
+    """Appends records collected elsewhere (e.g. in worker processes).
+
+    As these stages run in parallel their durations are not subtracted from
+    self_time of the enclosing stage.
+
+    It needs:
+    records ... 1-dim list with records (see get_metrics())
+
+    It returns:
+    nothing
+    """
+
+    if _METRICS['enabled']:
+        _METRICS['records'].extend(records)
+    # end if _METRICS['enabled']:
+# end def add_metrics(records):
+
+def metrics_enabled():
+    """Returns True if timings and record counts are collected."""
+
+    return(_METRICS['enabled'])
+# end def metrics_enabled():
+
+@contextlib.contextmanager
+def metric_stage(name,records=None,**info):
+    """Measures one processing stage (use with 'with').
+
+    Example:
+        with metric_stage('search_df',records=len(df_bsl)) as stage:
+            ...
+            stage['records'] = ...
+
+    It needs:
+    name ... name of stage
+    records (optional) ... number of processed records, can also be set
+        within the stage (default None)
+    info (optional) ... further information stored in record (e.g.
+        pair='2201-2202')
+
+    It returns:
+    stage ... dict with record of the stage (also if metrics are disabled)
+    """
+
+    stage = {'stage' : name, 'start' : time.time(), 'records' : records}
+    stage.update(info)
+    if not _METRICS['enabled']:
+        yield stage
+        return
+    # end if not _METRICS['enabled']:
+
+    stack = _METRICS['stack']
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        # keep peak of enclosing stage before measuring this stage
+        if stack:
+            stack[-1]['_peak'] = max(stack[-1]['_peak'],tracemalloc.get_traced_memory()[1])
+        # end if stack:
+        if hasattr(tracemalloc,'reset_peak'):
+            tracemalloc.reset_peak()
+        # end if hasattr(tracemalloc,'reset_peak'):
+    # end if tracing:
+    stage['_peak'] = 0
+    stage['_child'] = 0.
+    stack.append(stage)
+    t0 = time.perf_counter()
+    try:
+        yield stage
+    finally:
+        duration = time.perf_counter() - t0
+        stack.pop()
+        stage['time'] = duration
+        stage['self_time'] = duration - stage.pop('_child')
+        peak = stage.pop('_peak')
+        stage['peak_mem'] = None
+        if tracing:
+            stage['peak_mem'] = max(peak,tracemalloc.get_traced_memory()[1])
+        # end if tracing:
+        if stack:
+            stack[-1]['_child'] += duration
+            if tracing:
+                stack[-1]['_peak'] = max(stack[-1]['_peak'],stage['peak_mem'])
+            # end if tracing:
+        # end if stack:
+        _METRICS['records'].append(stage)
+        if _METRICS['callback'] is not None:
+            _METRICS['callback'](stage)
+        # end if _METRICS['callback'] is not None:
+    # end try:
+# end def metric_stage(name,records=None,**info):
+
+def metrics_summary(records=None):
+    """Summarises records for each stage.
+
+    It needs:
+    records (optional) ... 1-dim list with records (default is
+        get_metrics())
+
+    It returns:
+    df_summary ... pandas.DataFrame with number of calls ('calls'), total
+        duration in seconds ('time'), total duration without nested stages
+        ('self_time'), processed records ('records'), records per second
+        of self_time ('records_per_s') and maximum peak memory in MB
+        ('peak_mem_MB') with name of stage as index (order of first call)
+    """
+
+    if records is None:
+        records = get_metrics()
+    # end if records is None:
+
+    columns = ['calls','time','self_time','records','records_per_s','peak_mem_MB']
+    if len(records) == 0:
+        return(pd.DataFrame(columns=columns))
+    # end if len(records) == 0:
+
+    df = pd.DataFrame(records,columns=['stage','start','time','self_time','records','peak_mem'])
+    df['records'] = pd.to_numeric(df['records'])
+    df['peak_mem'] = pd.to_numeric(df['peak_mem'])
+    df['calls'] = 1
+    df_summary = df.groupby('stage',sort=False).agg({'calls' : 'sum','time' : 'sum','self_time' : 'sum','records' : 'sum','peak_mem' : 'max'})
+    df_summary['records_per_s'] = df_summary['records']/df_summary['self_time']
+    df_summary['peak_mem_MB'] = df_summary['peak_mem']/1024**2
+    df_summary = df_summary.loc[:,columns]
+
+    return(df_summary)
+# end def metrics_summary(records=None):
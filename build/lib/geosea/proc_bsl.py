@@ -5,10 +5,12 @@
 from .read import *
 from .vert_bsl import *
 from .hori_bsl import *
+from .update_bsl import *
 
 from .sw import *
+from .metrics import *
 
-def proc_bsl (SAL,phi,minmax,outlier_flag=None,writefile=True):
+def proc_bsl (SAL,phi,minmax,outlier_flag=None,writefile=True,processes=None,fmt=None,incremental=False,verbose=True):
     """ Complete Baseline processing of GeoSEA Raw data.
 
     It needs:
@@ -16,20 +18,60 @@ def proc_bsl (SAL,phi,minmax,outlier_flag=None,writefile=True):
     phi ... Latitude for Leroy formular
     minmax ... half time window length for searching for sound speed at
     beacon 2
+    outlier_flag (optional) ... if set to 1 all baselines with lengths
+    +/-10m are removed
+    writefile (optional) ... if True all results are written to files (not
+    used with incremental=True)
+    processes (optional) ... number of worker processes for the baseline
+    calculation (see hori_bsl())
+    fmt (optional) ... format of written files (see write_data())
+    incremental (optional) ... if True only new or changed raw files are
+    processed and merged into the existing files (see update_bsl()), the
+    files in ../DATA/ are always updated in this mode as the new records are
+    merged into them
+    verbose (optional) ... if True the found records and statistics of all
+    stages are printed (default True)
 
     It returns:
     bsl ... list of pandas.DataFrame with calculated Baselines
 
+    Timings and record counts of the single processing stages (e.g. found
+    records of each station in stage 'extract', statistics of each beacon
+    pair in stage 'pair') are collected if enable_metrics() has been called
+    before (see get_metrics() and metrics_summary()).
     """
-    ID,st_series,bsl_series = read()
-    
-    st_series_leroy = []
-    
-    for i, id in enumerate(ID):
-        st_series_leroy.append(sv_leroy(st_series[i],SAL,phi))
-        
-    bsl_horizonal = hori_bsl(ID,bsl_series,st_series_leroy,7600,outlier_flag,writefile)
-    
-    bsl_vertical = vert_bsl(ID)
+    if incremental:
+        if not writefile and verbose:
+            print('Incremental processing always updates the files in ../DATA/!')
+        # end if not writefile and verbose:
+        ID = read_id()
+        ID_pair,bsl = update_bsl(SAL,phi,minmax,outlier_flag,processes=processes,fmt=fmt,verbose=verbose)
+        bsl_vertical = vert_bsl(ID,verbose=verbose)
+        return(bsl)
+    # end if incremental:
+
+    ID,st_series,bsl_series = read(writefile=writefile,processes=processes,fmt=fmt,verbose=verbose)
     
+    # sound speed of all stations in one batch
+    st_series_leroy = sv_leroy_network(st_series,SAL,phi)
+
+    with metric_stage('hori_bsl') as stage:
+        ID_pair,bsl = hori_bsl(ID,bsl_series,st_series_leroy,minmax,outlier_flag,writefile,processes,fmt=fmt,verbose=verbose)
+        stage['records'] = sum(len(df) for df in bsl)
+    # end with metric_stage('hori_bsl') as stage:
+
+    if writefile:
+        # all raw files are processed, later runs with incremental=True
+        # only process new or changed raw files
+        manifest = {'files' : {}}
+        for station,ifiles in find_raw(ID).items():
+            for filename in ifiles:
+                manifest['files'][filename] = raw_file_info(filename)
+            # end for filename in ifiles:
+        # end for station,ifiles in find_raw(ID).items():
+        write_manifest(manifest)
+    # end if writefile:
+
+    bsl_vertical = vert_bsl(ID,verbose=verbose)
+
     return(bsl)
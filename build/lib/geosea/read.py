@@ -16,11 +16,14 @@ from .extract_df import *
 from .change2dateindex import *
 from .read_data import *
 from .read_id import *
+from .read_raw import *
+from .store import *
+from .metrics import *
 
 ### Global Variables ###
 GMT_DATEFORMAT = '%Y-%m-%dT%H:%M'
 
-def read(starttime=None, endtime=None, pathname=None, writefile=True):
+def read(starttime=None, endtime=None, pathname=None, writefile=True, processes=None, fmt=None, station_files=None, verbose=True):
     """ Reads data from *csv files.
 
     Note that the *csv files have to be unique for each station!
@@ -33,6 +36,17 @@ def read(starttime=None, endtime=None, pathname=None, writefile=True):
     writefile (optional) ... if True files containing all read-in parameters
         will be created in current directory, if False data will just be
         returned (default True)
+    processes (optional) ... number of worker processes used to read the raw
+        files of the stations in parallel (default None -> stations are read
+        one after another, 0 -> number of CPUs)
+    fmt (optional) ... format of written files: 'dat' - text files, 'npy' -
+        binary files, 'both' - text and binary files (default see
+        write_data())
+    station_files (optional) ... dict with station ID as key and list of raw
+        files to be read (default is all raw files in pathname, see
+        find_raw())
+    verbose (optional) ... if True the opened files and the number of found
+        records of each station are printed (default True)
 
     It returns:
     ID ... an 1-dim list with station IDs
@@ -46,8 +60,15 @@ def read(starttime=None, endtime=None, pathname=None, writefile=True):
         and turn around time ('TAT') with corresponding times of measurement
         for each beacon (same order as items in ID)
 
-    It further writes human readable files for pressure, inclinometer
-    data, battery, and pages, respectively.
+    It further writes human readable and/ or binary files for pressure,
+    inclinometer data, battery, and pages, respectively.
+
+    The number of found records of each station is also stored in the
+    record of stage 'extract' (see metric_stage()) if metrics are enabled.
+
+    Dates are stored with a precision of minutes (see write_data()). Thus only
+    the first sensor record within each minute is kept, e.g. if raw files
+    overlap. Baseline records are not removed.
     """
     
     ID = []
@@ -55,293 +76,257 @@ def read(starttime=None, endtime=None, pathname=None, writefile=True):
     if pathname is None:
         pathname = '../RAW/'
     
-    ID = read_id(pathname)
-    ifiles = glob.glob(pathname + 'Data_*_*_*.csv')
-        
-#-------------------------------------------------------------------------------
-#       Open and merge all Raw Files
-#-------------------------------------------------------------------------------
+    if station_files is None:
+        ID = read_id(pathname)
+        station_files = find_raw(ID,pathname)
+    else:
+        ID = sorted(station_files)
+    # end if station_files is None:
+
     st_series = []
     bsl_series = []
 
-    # pre-define column names (needed because of different number of columns
-    # per row in input files)
-    my_cols = ["A","B","C","D","E","F","G","H","I","J"]
-    
-    print('-------------------------------------------------------------------------------\n')
-    print('GeoSEA Python Module  v1.21   20 July 2020\n')
-    print('GEOMAR Helmholtz Centre for Ocean Research Kiel')
-    print('-------------------------------------------------------------------------------\n\n')
-    
-    for j,station in enumerate(ID):
-
-        print('\nData Processing for Station: ' + station)
-        print('-------------------------------------------------------------------------------')
-        print('Open Files:')
-
-        # create empty pandas.DataFrame for storing of data from file
-        all_data = pd.DataFrame()
-        for i,data in enumerate(ifiles):
-            stationname = data.split('_', 3)
-            if station in stationname:
-                print(data)
-                # reads data from csv-file using pandas
-                # my_cols ... pre-defined column names
-                # skiprow=13 ... skips first 13 rows
-                # index_col=0 ... uses first column as index
-                # final dataframe has columns 'B'-'J' (0-9) and index column
-                # with ['PAG','BSL',...]
-                curfile = pd.read_csv(data,names=my_cols,skiprows=13,index_col=0,low_memory=False)
-                # append curfile to DataFrame, needs to be stored to all_data
-                # otherwise no permanent change
-                all_data = all_data.append(curfile)
-        #print curfile
-            # end if station in stationname:
-        print('   ')
-        # end for i,data in enumerate(ifiles):
-
-        # remove duplicates, again has to be stored to all_data otherwise no
-        # permanent change
-        all_data = all_data.drop_duplicates()
-        
-        # transform date column 'B' to time format used by pandas
-        all_data['B'] = pd.to_datetime(all_data['B'])
-        
-        if starttime is not None:
-            # remove all entries before starttime
-            all_data = all_data.loc[all_data['B'] >= starttime]
-        # end if starttime is not None:
-
-        if endtime is not None:
-            # remove all entries after endtime
-            all_data = all_data.loc[all_data['B'] <= endtime]
-        # end if endtime is not None:
-    
-        ######## Sort Files to Sensor
+    if verbose:
+        print('-------------------------------------------------------------------------------\n')
+        print('GeoSEA Python Module  v1.21   20 July 2020\n')
+        print('GEOMAR Helmholtz Centre for Ocean Research Kiel')
+        print('-------------------------------------------------------------------------------\n\n')
+    # end if verbose:
 
-        # position of date in following column_lists
-        date_pos = 0
+#-------------------------------------------------------------------------------
+#       Read all Raw Files
+#-------------------------------------------------------------------------------
+    # each raw file is read once and its rows are sorted directly by record
+    # type (BSL, SSP, PRS, ...), stations may be read in parallel
+    with metric_stage('read') as stage:
+        ID,raw_all,invalid_all = read_raw(ID,pathname,starttime,endtime,processes=processes,station_files=station_files)
+        stage['records'] = sum(len(df) for raw in raw_all for df in raw.values())
+    # end with metric_stage('read') as stage:
 
-        sv_fr = 0
+    for j,station in enumerate(ID):
+        with metric_stage('extract',station=station) as stage:
+            if verbose:
+                print('\nData Processing for Station: ' + station)
+                print('-------------------------------------------------------------------------------')
+                print('Open Files:')
+                for data in station_files[station]:
+                    print(data)
+                # end for data in station_files[station]:
+                print('   ')
+            # end if verbose:
+
+            raw = raw_all[j]
+
+            ######## Sort Files to Sensor
+
+            sv_fr = 0
+            # empty sound speed and temperature data if not found in raw files
+            # (e.g. for short downloads)
+            df_ssp = extract_raw(raw,'SSP')
+            df_hrt = extract_raw(raw,'HRT')
 #-------------------------------------------------------------------------------
 #       Travel Time measurement
 #-------------------------------------------------------------------------------
-        index = 'BSL'
-        column_list = ['B','F','G','H']
-        # columns contain date, ID of other station, traveltime measurement in
-        # milliseconds and turn around time in milliseconds
-        label_list = ['date','range_ID','range','TAT']
-        # data types for columns except date
-        dtype = ['d','f','f']
-        df_bsl = extract_df(all_data,index,column_list,label_list,dtype,date_pos)
+            index = 'BSL'
+            # columns contain ID of other station, traveltime measurement in
+            # milliseconds and turn around time in milliseconds
+            df_bsl = extract_raw(raw,index)
         
-        if writefile:
-            # writes data to file
-            df_bsl.to_csv('../DATA/' + str(station) +'-'+ index+'.dat',sep='\t', header=True, date_format=GMT_DATEFORMAT)
-            #df_bsl = read_data(str(station),'BSL')
-            #df_bsl = df_bsl.reset_index().drop_duplicates(subset='date').set_index('date')
-            #df_bsl.to_csv('../DATA/' + str(station) +'-'+ index+'.dat',sep='\t', header=True, date_format=GMT_DATEFORMAT)
-        # end if writefile:
-        # df_bsl is not written to a file because first needs to be sorted
+            if writefile:
+                # writes data to file
+                write_data(df_bsl,'../DATA/' + str(station) +'-'+ index,fmt)
+            # end if writefile:
+            # df_bsl is not written to a file because first needs to be sorted
         
 #-------------------------------------------------------------------------------
 #       Sound speed and temperature for Fetch Stations
 #-------------------------------------------------------------------------------
-        if 'SVT' in all_data.index:
-            index = 'SVT'
-            print('SVT - Sound Speed and Temperature Sensor !')
-            column_list = ['B','F']
-            # columns contain date and sound speed measurement in metres per second
-            label_list = ['date','hrt']
-            # data types for columns except date
-            dtype = ['f','f']
-            df_svt = extract_df(all_data,index,column_list,label_list,dtype,date_pos)
+            if 'SVT' in raw:
+                index = 'SVT'
+                if verbose:
+                    print('SVT - Sound Speed and Temperature Sensor !')
+                # end if verbose:
+                # columns contain temperature in degree Celsius
+                df_svt = extract_raw(raw,index)
         
-            # removes sound speed measurements which are not in water
-            #df_svt = df_svt.loc[df_svt['SSP']!=9996.]
-            index = 'HRT'
-            if writefile:
-                # writes data to file
-                df_svt.to_csv('../DATA/' + str(station) +'-'+ index+'.dat',sep='\t', header=True, date_format=GMT_DATEFORMAT)
-                df_svt = read_data(str(station),index)
-                df_svt = df_svt.reset_index().drop_duplicates(subset='date').set_index('date')
-                df_svt.to_csv('../DATA/' + str(station) +'-'+ index+'.dat',sep='\t', header=True, date_format=GMT_DATEFORMAT)
-            # end if writefile:
+                # removes sound speed measurements which are not in water
+                #df_svt = df_svt.loc[df_svt['SSP']!=9996.]
+                index = 'HRT'
+                # remove entries with same date in minutes (precision of stored files,
+                # e.g. from overlapping raw files)
+                df_svt = df_svt[~floor_dates(df_svt.index).duplicated(keep='first')]
+                if writefile:
+                    # writes data to file
+                    write_data(df_svt,'../DATA/' + str(station) +'-'+ index,fmt)
+                # end if writefile:
         
 #-------------------------------------------------------------------------------
 #       Sound Speed
 #-------------------------------------------------------------------------------
-        if 'SSP' in all_data.index:
-            index = 'SSP'
-            column_list = ['B','E']
-            # columns contain date and sound speed measurement in metres per second
-            label_list = ['date','ssp']
-            # data types for columns except date
-            dtype = ['f']
-            df_ssp = extract_df(all_data,index,column_list,label_list,dtype,date_pos)
-
-            # removes sound speed measurements which are not in water
-            df_ssp = df_ssp.loc[df_ssp['ssp']!=9996.]
-
-            if writefile:
-                # writes data to file
-                df_ssp.to_csv('../DATA/' + str(station) +'-'+ index+'.dat',sep='\t', header=True, date_format=GMT_DATEFORMAT)
-                df_ssp = read_data(str(station),'SSP')
-                df_ssp = df_ssp.reset_index().drop_duplicates(subset='date').set_index('date')
-                df_ssp.to_csv('../DATA/' + str(station) +'-'+ index+'.dat',sep='\t', header=True, date_format=GMT_DATEFORMAT)
-            # end if writefile:
+            if 'SSP' in raw:
+                index = 'SSP'
+                # columns contain sound speed measurement in metres per second
+                df_ssp = extract_raw(raw,index)
+
+                # removes sound speed measurements which are not in water
+                df_ssp = df_ssp.loc[df_ssp['ssp']!=9996.]
+
+                # remove entries with same date in minutes (precision of stored files,
+                # e.g. from overlapping raw files)
+                df_ssp = df_ssp[~floor_dates(df_ssp.index).duplicated(keep='first')]
+                if writefile:
+                    # writes data to file
+                    write_data(df_ssp,'../DATA/' + str(station) +'-'+ index,fmt)
+                # end if writefile:
             
 #-------------------------------------------------------------------------------
 #       Temperature
 #-------------------------------------------------------------------------------
-        if 'TMP' in all_data.index:
-            index = 'TMP'
-            # columns contain date and temperature in degree Celsius
-            label_list = ['date','tmp']
-            df_tp = extract_df(all_data,index,column_list,label_list,dtype,date_pos)
-        
-        if 'HRT' in all_data.index:
-            index = 'HRT'
-            column_list = ['B','E']
-            # same label_list as 'TMP'
-            label_list = ['date','hrt']
-            df_hrt = extract_df(all_data,index,column_list,label_list,dtype,date_pos)
-
-            #if index == 'TMP':# concatenat both temperature dataframes to one
-            #df_hrt = pd.concat([df_tmp,df_hrt])
-
-            if writefile:
-            # writes data to file
-                df_hrt.to_csv('../DATA/' + str(station) +'-'+ index+'.dat',sep='\t', header=True, date_format=GMT_DATEFORMAT)
-                df_hrt = read_data(str(station),'HRT')
-                df_hrt = df_hrt.reset_index().drop_duplicates(subset='date').set_index('date')
-                df_hrt.to_csv('../DATA/' + str(station) +'-'+ index+'.dat',sep='\t', header=True, date_format=GMT_DATEFORMAT)
-            # end if writefile:
+            if 'TMP' in raw:
+                index = 'TMP'
+                # columns contain temperature in degree Celsius
+                df_tp = extract_raw(raw,index)
+
+            if 'HRT' in raw:
+                index = 'HRT'
+                # columns contain temperature in degree Celsius
+                df_hrt = extract_raw(raw,index)
+
+                #if index == 'TMP':# concatenat both temperature dataframes to one
+                #df_hrt = pd.concat([df_tmp,df_hrt])
+
+                # remove entries with same date in minutes (precision of stored files,
+                # e.g. from overlapping raw files)
+                df_hrt = df_hrt[~floor_dates(df_hrt.index).duplicated(keep='first')]
+                if writefile:
+                # writes data to file
+                    write_data(df_hrt,'../DATA/' + str(station) +'-'+ index,fmt)
+                # end if writefile:
 
 #-------------------------------------------------------------------------------
 #       Pressure and Temperature data
 #-------------------------------------------------------------------------------
-        index = 'PRS'
-        column_list = ['B','E']
-        column_list2 = ['B','F']
-        # columns contain date and pressure in kPa
-        label_list = ['date','prs']
-        label_list2 = ['date','tpr']
-        df_tpr = extract_df(all_data,index,column_list2,label_list2,dtype,date_pos)
-        df_prs = extract_df(all_data,index,column_list,label_list,dtype,date_pos)
-        dtype = ['f']
-        if writefile:
-            # writes data to file
-            df_prs.to_csv('../DATA/' + str(station) +'-'+ index+'.dat',sep='\t', header=True, date_format=GMT_DATEFORMAT)
-            df_prs = read_data(str(station),'PRS')
-            df_prs = df_prs.reset_index().drop_duplicates(subset='date').set_index('date')
-            df_prs.to_csv('../DATA/' + str(station) +'-'+ index+'.dat',sep='\t', header=True, date_format=GMT_DATEFORMAT)
-            # writes temperature from pressure sensor to file
-            df_tpr.to_csv('../DATA/' + str(station) +'-'+ 'TPR'+'.dat',sep='\t', header=True, date_format=GMT_DATEFORMAT)
-            df_tpr = read_data(str(station),'TPR')
-            df_tpr = df_tpr.reset_index().drop_duplicates(subset='date').set_index('date')
-            df_tpr.to_csv('../DATA/' + str(station) +'-'+ 'TPR'+'.dat',sep='\t', header=True, date_format=GMT_DATEFORMAT)
-            # end if writefile:
+            index = 'PRS'
+            # columns contain pressure in kPa and temperature from pressure sensor
+            df_tpr = extract_raw(raw,index,['tpr'])
+            df_prs = extract_raw(raw,index,['prs'])
+            # remove entries with same date in minutes (precision of stored files,
+            # e.g. from overlapping raw files)
+            df_prs = df_prs[~floor_dates(df_prs.index).duplicated(keep='first')]
+            df_tpr = df_tpr[~floor_dates(df_tpr.index).duplicated(keep='first')]
+            if writefile:
+                # writes data to file
+                write_data(df_prs,'../DATA/' + str(station) +'-'+ index,fmt)
+                # writes temperature from pressure sensor to file
+                write_data(df_tpr,'../DATA/' + str(station) +'-'+ 'TPR',fmt)
+                # end if writefile:
 
 #-------------------------------------------------------------------------------
 #       Recorded pages in Bytes
 #-------------------------------------------------------------------------------
-        index = 'PAG'
-        column_list = ['B','E']
-        # columns contain date and page number
-        label_list = ['date','pag']
-        #  data types for columns except date
-        dtype = ['d']
-        df_pag = extract_df(all_data,index,column_list,label_list,dtype,date_pos)
-
-        if writefile:
-            # writes data to file
-            df_pag.to_csv('../DATA/' + str(station) +'-'+ index+'.dat',sep='\t', header=True, date_format=GMT_DATEFORMAT)
-            df_pag = read_data(str(station),'PAG')
-            df_pag = df_pag.reset_index().drop_duplicates(subset='date').set_index('date')
-            df_pag.to_csv('../DATA/' + str(station) +'-'+ index+'.dat',sep='\t', header=True, date_format=GMT_DATEFORMAT)
-        # end if writefile:
-
-        # tranform page numbers to Bytes
-        df_pag['size'] = df_pag['pag']*512/1000
-
-        # total size of downloaded data in kB last entry in column 'pag'
-        pag_size = df_pag['size'].iloc[-1]/1024
+            index = 'PAG'
+            # columns contain page number
+            df_pag = extract_raw(raw,index)
+
+            # remove entries with same date in minutes (precision of stored files,
+            # e.g. from overlapping raw files)
+            df_pag = df_pag[~floor_dates(df_pag.index).duplicated(keep='first')]
+            if writefile:
+                # writes data to file
+                write_data(df_pag,'../DATA/' + str(station) +'-'+ index,fmt)
+            # end if writefile:
+
+            # tranform page numbers to Bytes
+            df_pag['size'] = df_pag['pag']*512/1000
+
+            # total size of downloaded data in kB last entry in column 'pag'
+            if not df_pag.empty:
+                pag_size = df_pag['size'].iloc[-1]/1024
+            else:
+                pag_size = 0
+            # end if not df_pag.empty:
 
 #-------------------------------------------------------------------------------
 #       Battery Power
 #-------------------------------------------------------------------------------
-        index = 'BAT'
-        column_list = ['B','E','F']
-        # columns contain date, battery consumption in per cent and voltage in
-        # volt
-        label_list = ['date','bat','vlt']
-        #  data types for columns except date
-        dtype = ['d','f']
-        df_bat = extract_df(all_data,index,column_list,label_list,dtype,date_pos)
-
-        if writefile:
-            # writes data to file
-            df_bat.to_csv('../DATA/' + str(station) +'-'+ index+'.dat',sep='\t', header=True, date_format=GMT_DATEFORMAT)
-            df_bat = read_data(str(station),'BAT')
-            df_bat = df_bat.reset_index().drop_duplicates(subset='date').set_index('date')
-            df_bat.to_csv('../DATA/' + str(station) +'-'+ index+'.dat',sep='\t', header=True, date_format=GMT_DATEFORMAT)
-        # end if writefile:
+            index = 'BAT'
+            # columns contain battery consumption in per cent and voltage in volt
+            df_bat = extract_raw(raw,index)
+
+            # remove entries with same date in minutes (precision of stored files,
+            # e.g. from overlapping raw files)
+            df_bat = df_bat[~floor_dates(df_bat.index).duplicated(keep='first')]
+            if writefile:
+                # writes data to file
+                write_data(df_bat,'../DATA/' + str(station) +'-'+ index,fmt)
+            # end if writefile:
 
 #-------------------------------------------------------------------------------
 #       Inclinometer
 #-------------------------------------------------------------------------------
-        index = 'INC'
-        # columns contain date, pitch and roll in radians
-        label_list = ['date','pitch','roll']
-        #  data types for columns except date
-        dtype = ['f','f']
-        df_inc = extract_df(all_data,index,column_list,label_list,dtype,date_pos)
-
-        # transform radians to degrees
-        df_inc['pitch'] = df_inc['pitch']*180/np.pi
-        df_inc['roll'] = df_inc['roll']*180/np.pi
-
-        if writefile:
-            # writes data to file
-            df_inc.to_csv('../DATA/' + str(station) +'-'+ index+'.dat',sep='\t', header=True, date_format=GMT_DATEFORMAT)
-            df_inc = read_data(str(station),'INC')
-            df_inc = df_inc.reset_index().drop_duplicates(subset='date').set_index('date')
-            df_inc.to_csv('../DATA/' + str(station) +'-'+ index+'.dat',sep='\t', header=True, date_format=GMT_DATEFORMAT)
-        # end writefile:
-
-        # Standard output
-        print('Found: ' + str(len(df_bsl)) + '\t Baseline Records')
-        print('Found: ' + str(len(df_prs)) + '\t Pressure Records')
-        if sv_fr == 1:
-            print('Found: ' + str(len(df_svt)) + '\t Sound Speed Records')
-            print('Found: ' + str(len(df_svt)) + '\t Temperature Records')
-        else:
-            print('Found: ' + str(len(df_ssp)) + '\t Sound Speed Records')
-            print('Found: ' + str(len(df_hrt)) + '\t HiRes Temperature Records')
-        print('Found: ' + str(len(df_inc)) + '\t Inclination Records')
-        print('Found: ' + str(len(df_bat)) + '\t Battery Records')
-        print('Found: ' + str(pag_size) + '\t MB Data')
-
-
-    # concatenate pandas data formats in one data format for temperature,
-        # pressure, sound speed, inclinometer, battery, and pages
-        if sv_fr == 1:
-            df = pd.concat([df_svt, df_prs, df_inc, df_bat, df_pag], axis=1)
-        else:
-            df = pd.concat([df_ssp, df_prs, df_hrt, df_tpr, df_inc, df_bat, df_pag], axis=1)
-    # append this to data formats of other stations
-        st_series.append(df)
-
-        # baseline data not included in pandas.concat as it holds multiple
-        # entries per day for different baselines
-        bsl_series.append(df_bsl)
+            index = 'INC'
+            # columns contain pitch and roll in radians
+            df_inc = extract_raw(raw,index)
+
+            # transform radians to degrees
+            df_inc['pitch'] = df_inc['pitch']*180/np.pi
+            df_inc['roll'] = df_inc['roll']*180/np.pi
+
+            # remove entries with same date in minutes (precision of stored files,
+            # e.g. from overlapping raw files)
+            df_inc = df_inc[~floor_dates(df_inc.index).duplicated(keep='first')]
+            if writefile:
+                # writes data to file
+                write_data(df_inc,'../DATA/' + str(station) +'-'+ index,fmt)
+            # end writefile:
+
+            # number of found records
+            if sv_fr == 1:
+                found = {'bsl' : len(df_bsl), 'prs' : len(df_prs), 'ssp' : len(df_svt), 'hrt' : len(df_svt)}
+            else:
+                found = {'bsl' : len(df_bsl), 'prs' : len(df_prs), 'ssp' : len(df_ssp), 'hrt' : len(df_hrt)}
+            # end if sv_fr == 1:
+            found.update({'inc' : len(df_inc), 'bat' : len(df_bat), 'MB' : pag_size, 'invalid_date' : sum(invalid_all[j].values())})
+            stage.update(found)
+            stage['records'] = found['bsl'] + found['prs'] + found['ssp'] + found['hrt'] + found['inc'] + found['bat']
+
+            # Standard output
+            if verbose:
+                print('Found: ' + str(found['bsl']) + '\t Baseline Records')
+                print('Found: ' + str(found['prs']) + '\t Pressure Records')
+                if sv_fr == 1:
+                    print('Found: ' + str(found['ssp']) + '\t Sound Speed Records')
+                    print('Found: ' + str(found['hrt']) + '\t Temperature Records')
+                else:
+                    print('Found: ' + str(found['ssp']) + '\t Sound Speed Records')
+                    print('Found: ' + str(found['hrt']) + '\t HiRes Temperature Records')
+                # end if sv_fr == 1:
+                print('Found: ' + str(found['inc']) + '\t Inclination Records')
+                print('Found: ' + str(found['bat']) + '\t Battery Records')
+                print('Found: ' + str(found['MB']) + '\t MB Data')
+                print('Found: ' + str(found['invalid_date']) + '\t Records with invalid Date (skipped)')
+            # end if verbose:
+
+
+        # concatenate pandas data formats in one data format for temperature,
+            # pressure, sound speed, inclinometer, battery, and pages
+            if sv_fr == 1:
+                df = pd.concat([df_svt, df_prs, df_inc, df_bat, df_pag], axis=1)
+            else:
+                df = pd.concat([df_ssp, df_prs, df_hrt, df_tpr, df_inc, df_bat, df_pag], axis=1)
+        # append this to data formats of other stations
+            st_series.append(df)
+
+            # baseline data not included in pandas.concat as it holds multiple
+            # entries per day for different baselines
+            bsl_series.append(df_bsl)
+        # end with metric_stage('extract',station=station) as stage:
     # end for j,station in enumerate(ID):
 
-    if not writefile:
+    if not writefile and verbose:
         print('\n')
         print('Data has not been stored in files!')
-    # end if not writefile:
+    # end if not writefile and verbose:
 
 
     return(ID,st_series,bsl_series)
@@ -4,6 +4,8 @@
 
 import pandas as pd 
 
+from .store import *
+
 def read_bsl(ID1, ID2, starttime=None, endtime=None, pathname=None,suffix=None):
     """ Read baseline data from file created with sort_bsl().
 
@@ -24,6 +26,11 @@ def read_bsl(ID1, ID2, starttime=None, endtime=None, pathname=None,suffix=None):
     If file given by <pathname><ID1>-<ID2>.dat (or
     <pathname><ID1>-<ID2>-<suffix>.dat) does not exist, an error message
     will be printed and an empty pandas.DataFrame will be returned.
+
+    If a binary file <pathname><ID1>-<ID2>.npy (see write_store()) exists
+    which is not older than the text file, it is used instead and only the
+    data between starttime and endtime is loaded. Both files hold the dates
+    with a precision of minutes (see write_data()).
     """
 
     if pathname is None:
@@ -31,13 +38,17 @@ def read_bsl(ID1, ID2, starttime=None, endtime=None, pathname=None,suffix=None):
     # end if pathname is None:
 
     if suffix is None:
-        filename = pathname + str(ID1) + '-' + str(ID2) + '.dat'
+        filename = pathname + str(ID1) + '-' + str(ID2)
     else:
-        filename = pathname + str(ID1) + '-' + str(ID2) + '-' + str(suffix) + '.dat'
+        filename = pathname + str(ID1) + '-' + str(ID2) + '-' + str(suffix)
     # end if suffix is None:
 
     try:
-        df_tmp = pd.read_csv(filename,sep=',',index_col=0,header=0,parse_dates=True)
+        if find_store(filename):
+            # time window is already selected while reading
+            return(read_store(filename + '.npy',starttime,endtime))
+        # end if find_store(filename):
+        df_tmp = pd.read_csv(filename + '.dat',sep=',',index_col=0,header=0,parse_dates=True)
         if starttime is not None:
             # remove all entries before starttime
             df_tmp2 = df_tmp.loc[df_tmp.index >= starttime]
@@ -4,6 +4,8 @@
 
 import pandas as pd 
 
+from .store import *
+
 
 def read_data(ID, sensor, starttime=None, endtime=None, pathname=None,suffix=None):
     """ Reads sensor data from file created with read().
@@ -19,6 +21,7 @@ def read_data(ID, sensor, starttime=None, endtime=None, pathname=None,suffix=Non
         'YYYY-MM-DD hh:mm:ss')
     pathname (optional) ... location of files created with read() (default
         is ../DATA/)
+    suffix (optional) ... file suffix (default - no suffix)
 
     It returns:
     df ... pandas.DataFrame with requested data
@@ -26,6 +29,11 @@ def read_data(ID, sensor, starttime=None, endtime=None, pathname=None,suffix=Non
     If file given by <pathname><ID>-<sensor>.dat (<sensor> will be
     transformed to uppercase) does not exist, an error message will be
     printed and an empty pandas.DataFrame will be returned.
+
+    If a binary file <pathname><ID>-<sensor>.npy (see write_store()) exists
+    which is not older than the text file, it is used instead and only the
+    data between starttime and endtime is loaded. Both files hold the dates
+    with a precision of minutes (see write_data()).
     """
 
     if pathname is None:
@@ -40,14 +48,18 @@ def read_data(ID, sensor, starttime=None, endtime=None, pathname=None,suffix=Non
     if sensor in ['SSP','HRT','PRS','PAG','BAT','INC', 'SVT','BSL','SAL','TMP', 'TPR']:
         # create file name
         if suffix is None:
-            filename = pathname + str(ID) + '-' + sensor + '.dat'
+            filename = pathname + str(ID) + '-' + sensor
         else:
-            filename = pathname + str(ID) + '-' + sensor + '-' + str(suffix) + '.dat'
+            filename = pathname + str(ID) + '-' + sensor + '-' + str(suffix)
             # end if suffix is None:
 
         # read data from file in pandas.DataFrame
         try:
-            df_data = pd.read_csv(filename,sep='\t',index_col=0,parse_dates=True)
+            if find_store(filename):
+                # time window is already selected while reading
+                return(read_store(filename + '.npy',starttime,endtime))
+            # end if find_store(filename):
+            df_data = pd.read_csv(filename + '.dat',sep='\t',index_col=0,parse_dates=True)
 
             if starttime is not None:
                 # remove all entries before starttime
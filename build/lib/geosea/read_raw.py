@@ -0,0 +1,256 @@
+#-------------------------------------------------------------------------------
+#       Streaming Read of RAW Files
+#-------------------------------------------------------------------------------
+
+import glob # Unix style pathname pattern expansion
+import multiprocessing
+import numpy as np # fundamental package for scientific computing
+import pandas as pd # open source, BSD-licensed library providing high-performance, easy-to-use data structures and data analysis tools
+
+# pre-defined column names of the raw files (needed because of different
+# number of columns per row in input files), column 'A' holds the record
+# type and column 'B' the date
+RAW_COLUMNS = ["A","B","C","D","E","F","G","H","I","J"]
+
+# columns, labels and data types (d - integer, f - float) extracted for each
+# record type
+RAW_RECORDS = {
+    # ID of other station, traveltime and turn around time in milliseconds
+    'BSL' : (['F','G','H'], ['range_ID','range','TAT'], ['d','f','f']),
+    # temperature of fetch stations
+    'SVT' : (['F'], ['hrt'], ['f']),
+    # sound speed in metres per second
+    'SSP' : (['E'], ['ssp'], ['f']),
+    # temperature in degree Celsius
+    'TMP' : (['E'], ['tmp'], ['f']),
+    # high resolution temperature in degree Celsius
+    'HRT' : (['E'], ['hrt'], ['f']),
+    # pressure in kPa and temperature from pressure sensor
+    'PRS' : (['E','F'], ['prs','tpr'], ['f','f']),
+    # recorded pages
+    'PAG' : (['E'], ['pag'], ['d']),
+    # battery consumption in per cent and voltage in volt
+    'BAT' : (['E','F'], ['bat','vlt'], ['d','f']),
+    # pitch and roll in radians
+    'INC' : (['E','F'], ['pitch','roll'], ['f','f']),
+}
+
+# number of rows read at once from a raw file
+RAW_CHUNKSIZE = 100000
+
+# date format of raw files
+RAW_DATEFORMAT = '%Y/%m/%d %H:%M:%S'
+
+def find_raw(ID=None,pathname=None):
+    """Searches raw files (Data_*_*_*.csv) for each station.
+
+    It needs:
+    ID (optional) ... 1-dim list with station IDs (default is all stations
+        found by read_id())
+    pathname (optional) ... location of input files (default ../RAW/)
+
+    It returns:
+    station_files ... dict with station ID as key and sorted 1-dim list
+        with the file names of this station
+    """
+
+    if pathname is None:
+        pathname = '../RAW/'
+    # end if pathname is None:
+
+    # the file list is scanned only once for all stations
+    station_files = {}
+    for filename in sorted(glob.glob(pathname + 'Data_*_*_*.csv')):
+        # extract beacon ID from file name
+        station = filename.split('_', 3)[2]
+        if ID is None or station in ID:
+            station_files.setdefault(station,[]).append(filename)
+        # end if ID is None or station in ID:
+    # end for filename in ... :
+
+    if ID is not None:
+        for station in ID:
+            station_files.setdefault(station,[])
+        # end for station in ID:
+    # end if ID is not None:
+
+    return(station_files)
+# end def find_raw(ID=None,pathname=None):
+
+def read_raw_station(ifiles,starttime=None,endtime=None,chunksize=None):
+    """Reads all raw files of one station in a single pass.
+
+    Every file is read once in chunks of chunksize rows. The rows of each
+    chunk are sorted directly by their record type (see RAW_RECORDS) and
+    only the typed columns are kept, thus the memory needed is bound to one
+    chunk plus the extracted data.
+
+    It needs:
+    ifiles ... 1-dim list with raw files of one station
+    starttime (optional) ... no measurement before this time is used (format
+        'YYYY-MM-DD hh:mm:ss')
+    endtime (optional) ... no measurement after this time is used (format
+        'YYYY-MM-DD hh:mm:ss')
+    chunksize (optional) ... number of rows read at once (default is
+        RAW_CHUNKSIZE)
+
+    It returns:
+    raw ... dict with record type ('BSL','SSP','PRS',...) as key and
+        pandas.DataFrame with date as index and labelled columns (see
+        RAW_RECORDS), record types not found in ifiles are missing
+    invalid ... dict with record type as key and number of rows which are
+        skipped because their date does not match RAW_DATEFORMAT
+    """
+
+    if chunksize is None:
+        chunksize = RAW_CHUNKSIZE
+    # end if chunksize is None:
+    if starttime is not None:
+        starttime = pd.Timestamp(starttime)
+    # end if starttime is not None:
+    if endtime is not None:
+        endtime = pd.Timestamp(endtime)
+    # end if endtime is not None:
+
+    # columnar buffers for each record type, one array per chunk
+    buffers = {}
+    invalid = {}
+    for filename in ifiles:
+        # skiprows=13 ... skips header of raw file
+        reader = pd.read_csv(filename,names=RAW_COLUMNS,skiprows=13,header=None,dtype=str,chunksize=chunksize)
+        for chunk in reader:
+            for index,pos in chunk.groupby('A',sort=False).indices.items():
+                if index not in RAW_RECORDS:
+                    continue
+                # end if index not in RAW_RECORDS:
+                column_list,label_list,dtype = RAW_RECORDS[index]
+
+                date = pd.to_datetime(chunk['B'].values[pos],format=RAW_DATEFORMAT,errors='coerce')
+                keep = ~np.isnat(date.values)
+                invalid[index] = invalid.get(index,0) + int((~keep).sum())
+                if starttime is not None:
+                    keep &= date >= starttime
+                # end if starttime is not None:
+                if endtime is not None:
+                    keep &= date <= endtime
+                # end if endtime is not None:
+
+                buffer = buffers.setdefault(index,{'date' : []})
+                buffer['date'].append(date.values[keep])
+                for col,label in zip(column_list,label_list):
+                    values = pd.to_numeric(chunk[col].values[pos],errors='coerce')
+                    buffer.setdefault(label,[]).append(np.asarray(values,dtype=float)[keep])
+                # end for col,label in zip(column_list,label_list):
+            # end for index,pos in ... :
+        # end for chunk in reader:
+    # end for filename in ifiles:
+
+    raw = {}
+    for index,buffer in buffers.items():
+        column_list,label_list,dtype = RAW_RECORDS[index]
+        data = {}
+        for label in label_list:
+            data[label] = np.concatenate(buffer[label])
+        # end for label in label_list:
+        df = pd.DataFrame(data,index=pd.DatetimeIndex(np.concatenate(buffer['date']),name='date'))
+
+        # drops entries which include just NaN and duplicates of overlapping
+        # raw files
+        df = df.dropna(how='all')
+        df = df.reset_index().drop_duplicates().set_index('date')
+        df = df.sort_index(kind='mergesort')
+
+        for label,typ in zip(label_list,dtype):
+            if typ.upper() == 'D' and not df[label].isnull().any():
+                df[label] = df[label].astype(int)
+            # end if typ.upper() == 'D' and ... :
+        # end for label,typ in zip(label_list,dtype):
+
+        raw[index] = df
+    # end for index,buffer in buffers.items():
+
+    return(raw,invalid)
+# end def read_raw_station(ifiles,starttime=None,endtime=None,chunksize=None):
+
+def read_raw(ID=None,pathname=None,starttime=None,endtime=None,chunksize=None,processes=None,station_files=None):
+    """Reads raw files of all stations.
+
+    It needs:
+    ID (optional) ... 1-dim list with station IDs (default is all stations
+        found in pathname)
+    pathname (optional) ... location of input files (default ../RAW/)
+    starttime (optional) ... no measurement before this time is used (format
+        'YYYY-MM-DD hh:mm:ss')
+    endtime (optional) ... no measurement after this time is used (format
+        'YYYY-MM-DD hh:mm:ss')
+    chunksize (optional) ... number of rows read at once (default is
+        RAW_CHUNKSIZE)
+    processes (optional) ... number of worker processes used to read the
+        stations in parallel (default None -> stations are read one after
+        another, 0 -> number of CPUs)
+    station_files (optional) ... dict with station ID as key and list of raw
+        files to be read (default is all raw files in pathname, see
+        find_raw())
+
+    It returns:
+    ID ... an 1-dim list with station IDs
+    raw_all ... an 1-dim list with dicts as returned by read_raw_station()
+        (same order as items in ID)
+    invalid_all ... an 1-dim list with dicts with the number of rows with
+        invalid date for each record type (see read_raw_station(), same order
+        as items in ID)
+    """
+
+    if station_files is None:
+        station_files = find_raw(ID,pathname)
+    # end if station_files is None:
+    if ID is None:
+        ID = sorted(station_files)
+    # end if ID is None:
+
+    args = [(station_files[station],starttime,endtime,chunksize) for station in ID]
+    if processes is None or processes == 1:
+        results = [read_raw_station(*arg) for arg in args]
+    else:
+        if processes == 0:
+            processes = multiprocessing.cpu_count()
+        # end if processes == 0:
+        with multiprocessing.Pool(processes=processes) as pool:
+            # starmap keeps the order of ID
+            results = pool.starmap(read_raw_station,args)
+        # end with multiprocessing.Pool(...) as pool:
+    # end if processes is None or processes == 1:
+    raw_all = [raw for raw,invalid in results]
+    invalid_all = [invalid for raw,invalid in results]
+
+    return(ID,raw_all,invalid_all)
+# end def read_raw(ID=None, ... ):
+
+def extract_raw(raw,index,label_list=None):
+    """Extracts data of one record type from dict returned by read_raw_station().
+
+    It needs:
+    raw ... dict as returned by read_raw_station()
+    index ... record type ('BSL','SSP','PRS',...)
+    label_list (optional) ... 1-dim list with labels of columns to be
+        extracted (default is all columns of record type, see RAW_RECORDS)
+
+    It returns:
+    df ... pandas.DataFrame with requested columns and date as index, if
+        record type does not exist in raw an empty pandas.DataFrame with
+        the requested columns will be returned
+    """
+
+    if label_list is None:
+        label_list = RAW_RECORDS[index][1]
+    # end if label_list is None:
+
+    if index in raw:
+        # drops entries which include just NaN
+        df = raw[index].loc[:,label_list].dropna(how='all')
+    else:
+        df = pd.DataFrame(columns=label_list,index=pd.DatetimeIndex([],name='date'),dtype=float)
+    # end if index in raw:
+
+    return(df)
+# end def extract_raw(raw,index,label_list=None):
@@ -2,6 +2,7 @@
 #       Search for nearest entry of Sensor data
 #-------------------------------------------------------------------------------
 
+import numpy as np
 import pandas as pd
 
 def search_df(df,df2,minmax,def_val=None,new_column=None,column_num=None):
@@ -28,12 +29,54 @@ def search_df(df,df2,minmax,def_val=None,new_column=None,column_num=None):
 
     if column_num is None:
         column_num = 0
-    
+
     if new_column is None:
         new_column = df2.columns[column_num]
-   
     # end if new_column is None:
 
+    # same search as for several columns, just with a single column
+    df_new,err_count = search_df_multi(df,df2,minmax,def_val,[new_column],[column_num])
+
+    return(df_new,err_count)
+# end def search_df(df,df2,minmax):
+
+def search_df_multi(df,df2,minmax,def_val=None,new_columns=None,column_nums=None):
+    """Searches closest (in time) entry of df2 in relation to df for several
+    columns of df2 at once.
+
+    In contrast to calling search_df() once per column, the nearest entries
+    are searched only once on the sorted time index of df2 (using
+    numpy.searchsorted) and all requested columns are attached in one pass.
+
+    It needs:
+    df ... pandas.DataFrame with one or more columns and date as index
+    df2 ... pandas.DataFrame with one or more columns and date as index
+    minmax ... maximum half time window length in seconds for searching for
+        value in df2 relative to value in df
+    def_val (optional) ... default value to be set to df2 if no match is
+        found (default is NaN)
+    new_columns (optional) ... 1-dim list with names of columns for df_new
+        (default is column names of df2 given by column_nums)
+    column_nums (optional) ... 1-dim list with positions of columns in df2
+        to be extracted (default is all columns of df2), the order has to
+        match new_columns
+
+    It returns:
+    df_new ... pandas.DataFrame with the columns of df and additional
+        columns holding the values extracted from df2
+    err_count ... counter for number of entries in df for which no matching
+        entry in df2 was found within minmax, the values of these entries
+        are set to def_val
+    """
+
+    if column_nums is None:
+        column_nums = list(range(len(df2.columns)))
+    # end if column_nums is None:
+
+    if new_columns is None:
+        new_columns = [df2.columns[k] for k in column_nums]
+    # end if new_columns is None:
+
     if def_val is None:
         def_val = np.nan
     # end if def_val is None:
@@ -42,35 +85,65 @@ def search_df(df,df2,minmax,def_val=None,new_column=None,column_num=None):
     df_new = df.copy()
     err_count = 0
     if not df.empty and not df2.empty:
-        for i in range(len(df)):
-            # set default value for value in df2
-            val = def_val
-            try:
-                # search index of value in df2 for time of value in df with
-                # minmax s tolerance
-                # method = 'nearest' ensures that nearest measurement in time is
-                # chosen
-                ind = df2.index.get_loc(df.index[i],method='nearest',tolerance=pd.tseries.offsets.Second(minmax))
-            except KeyError:
-                # if date is the same in df or does not exist a
-                # InvalidIndexError is raised
-                # search index of value in df2 for time of value in df
-                try:
-                    val = df2.loc[df.index[i],df2.columns[column_num]]
-                except KeyError:
-                    # if date does not exist in df2 a KeyError is raised
-                    err_count += 1
-                # end try: (same date in df2?)
-            else:
-                # choose value based on index found
-                val = df2.iloc[ind,column_num]
-            # end try: (nearest date in df?)
-            # store value in df_new
-            df_new.at[df.index[i],new_column] = val
-
-        # end for i in range(len(df)):
-    # end if not df.empty and df2.empty:
+        # searchsorted needs a monotonic increasing index
+        if not df2.index.is_monotonic_increasing:
+            df2 = df2.sort_index()
+        # end if not df2.index.is_monotonic_increasing:
+
+        ind,found = search_nearest(df2.index,df.index,minmax)
+        err_count = int(len(found) - found.sum())
+
+        for new_column,column_num in zip(new_columns,column_nums):
+            values = df2.iloc[:,column_num].values[ind]
+            # store values in df_new, default value if no match was found
+            df_new[new_column] = np.where(found,values,def_val)
+        # end for new_column,column_num in zip(new_columns,column_nums):
+    # end if not df.empty and not df2.empty:
 
     return(df_new,err_count)
-# end def search_df(df,df2,minmax):
+# end def search_df_multi(df,df2,minmax, ... ):
+
+def search_nearest(index,target,minmax):
+    """Searches position of nearest (in time) entry in index for each entry
+    of target.
+
+    It needs:
+    index ... monotonic increasing pandas.DatetimeIndex which is searched
+    target ... pandas.DatetimeIndex with times for which the nearest entry in
+        index should be found (does not need to be sorted)
+    minmax ... maximum time difference in seconds between entry in target
+        and nearest entry in index
+
+    It returns:
+    ind ... numpy.ndarray with positions of nearest entries in index (0 if
+        no entry was found)
+    found ... boolean numpy.ndarray which is True if an entry in index was
+        found within minmax
+    """
+
+    # work on integer nanoseconds, much faster than on Timestamps
+    idx = np.asarray(index.values,dtype='datetime64[ns]').view('i8')
+    tgt = np.asarray(target.values,dtype='datetime64[ns]').view('i8')
+    tol = int(minmax*1e9)
+
+    # position of first entry in index which is not smaller than target
+    right = np.searchsorted(idx,tgt,side='left')
+    left = right - 1
+    right_ok = right < len(idx)
+    left_ok = left >= 0
+    right = np.clip(right,0,len(idx)-1)
+    left = np.clip(left,0,len(idx)-1)
+
+    dist_right = np.where(right_ok,idx[right]-tgt,np.iinfo('i8').max)
+    dist_left = np.where(left_ok,tgt-idx[left],np.iinfo('i8').max)
+
+    # for equal distances take the later entry (same as
+    # pandas.Index.get_loc with method='nearest')
+    use_left = dist_left < dist_right
+    ind = np.where(use_left,left,right)
+    dist = np.where(use_left,dist_left,dist_right)
+    found = dist <= tol
+    ind = np.where(found,ind,0)
 
+    return(ind,found)
+# end def search_nearest(index,target,minmax):
@@ -0,0 +1,175 @@
+#-------------------------------------------------------------------------------
+#       Binary Storage of Station and Baseline Data
+#-------------------------------------------------------------------------------
+
+import os
+import numpy as np
+import pandas as pd
+
+from .metrics import *
+
+GMT_DATEFORMAT = '%Y-%m-%dT%H:%M'
+# precision of dates in text and binary files (same as GMT_DATEFORMAT)
+STORE_PRECISION = 'min'
+
+# default output format of write_data(): 'dat' (text), 'npy' (binary) or
+# 'both'
+STORE_FORMAT = 'dat'
+
+def write_data(df,filename,fmt=None,sep='\t'):
+    """Writes pandas.DataFrame to text and/ or binary file.
+
+    In both formats the dates are stored with a precision of minutes (see
+    GMT_DATEFORMAT and STORE_PRECISION), seconds are truncated.
+
+    It needs:
+    df ... pandas.DataFrame with date as index
+    filename ... name of output file without extension
+    fmt (optional) ... output format: 'dat' - text file <filename>.dat,
+        'npy' - binary file <filename>.npy (see write_store()), 'both' -
+        text and binary file (default is STORE_FORMAT, i.e. 'dat')
+    sep (optional) ... seperator in text file (default is '\t')
+
+    It returns:
+    nothing, data is written to file(s)
+    """
+
+    if fmt is None:
+        fmt = STORE_FORMAT
+    # end if fmt is None:
+
+    with metric_stage('write',records=len(df),file=filename):
+        if fmt in ['dat','both']:
+            df.to_csv(filename + '.dat',sep=sep, header=True, date_format=GMT_DATEFORMAT)
+        # end if fmt in ['dat','both']:
+        if fmt in ['npy','both']:
+            write_store(df,filename + '.npy')
+        # end if fmt in ['npy','both']:
+    # end with metric_stage(...):
+    if fmt not in ['dat','npy','both']:
+        print('No valid format: {0}! Data has not been stored!'.format(fmt))
+    # end if fmt not in ['dat','npy','both']:
+# end def write_data(df,filename,fmt=None,sep='\t'):
+
+def write_store(df,filename):
+    """Writes pandas.DataFrame to binary file which can be memory-mapped.
+
+    The data is stored as numpy structured array (first field holds the
+    date, all other fields the columns of df) sorted by date. Thus
+    read_store() can load a time window without reading the whole file.
+    Dates are truncated to minutes like in the text files (see
+    floor_dates()).
+
+    It needs:
+    df ... pandas.DataFrame with date as index
+    filename ... name of output file (should end with '.npy')
+
+    It returns:
+    nothing, data is written to file
+    """
+
+    df = df.sort_index(kind='mergesort')
+
+    date_name = df.index.name
+    if date_name is None:
+        date_name = 'date'
+    # end if date_name is None:
+
+    fields = [(date_name,'M8[ns]')]
+    columns = []
+    for col in df.columns:
+        if pd.api.types.is_numeric_dtype(df[col].dtype):
+            values = np.asarray(df[col])
+        else:
+            # text (also empty) columns are stored as fixed-width strings,
+            # object arrays cannot be stored without pickle
+            values = np.asarray(df[col].astype(str),dtype=str)
+        # end if pd.api.types.is_numeric_dtype(df[col].dtype):
+        fields.append((str(col),values.dtype))
+        columns.append(values)
+    # end for col in df.columns:
+
+    arr = np.empty(len(df),dtype=fields)
+    arr[date_name] = np.asarray(floor_dates(df.index).values,dtype='M8[ns]')
+    for values,field in zip(columns,fields[1:]):
+        arr[field[0]] = values
+    # end for values,field in zip(columns,fields[1:]):
+
+    np.save(filename,arr,allow_pickle=False)
+# end def write_store(df,filename):
+
+def read_store(filename,starttime=None,endtime=None):
+    """Reads pandas.DataFrame from binary file created with write_store().
+
+    The file is memory-mapped and only the rows between starttime and
+    endtime are loaded.
+
+    It needs:
+    filename ... name of binary file
+    starttime (optional) ... no measurement before this time is used (format
+        'YYYY-MM-DD hh:mm:ss')
+    endtime (optional) ... no measurement after this time is used (format
+        'YYYY-MM-DD hh:mm:ss')
+
+    It returns:
+    df ... pandas.DataFrame with requested data and date as index
+    """
+
+    arr = np.load(filename,mmap_mode='r',allow_pickle=False)
+    date_name = arr.dtype.names[0]
+    date = arr[date_name]
+
+    # dates are sorted, thus the time window is found by bisection
+    start = 0
+    end = len(arr)
+    if starttime is not None:
+        start = np.searchsorted(date,np.datetime64(pd.Timestamp(starttime),'ns'),side='left')
+    # end if starttime is not None:
+    if endtime is not None:
+        end = np.searchsorted(date,np.datetime64(pd.Timestamp(endtime),'ns'),side='right')
+    # end if endtime is not None:
+
+    sub = np.array(arr[start:end])
+    data = {}
+    for name in arr.dtype.names[1:]:
+        data[name] = sub[name]
+    # end for name in arr.dtype.names[1:]:
+    df = pd.DataFrame(data,index=pd.DatetimeIndex(sub[date_name],name=date_name),columns=list(arr.dtype.names[1:]))
+
+    return(df)
+# end def read_store(filename,starttime=None,endtime=None):
+
+def find_store(filename):
+    """Checks whether binary file should be used instead of text file.
+
+    It needs:
+    filename ... name of file without extension
+
+    It returns:
+    True if <filename>.npy exists and is not older than <filename>.dat (e.g.
+        text file has not been changed afterwards), otherwise False
+    """
+
+    if not os.path.isfile(filename + '.npy'):
+        return(False)
+    # end if not os.path.isfile(filename + '.npy'):
+    if not os.path.isfile(filename + '.dat'):
+        return(True)
+    # end if not os.path.isfile(filename + '.dat'):
+
+    return(os.path.getmtime(filename + '.npy') >= os.path.getmtime(filename + '.dat'))
+# end def find_store(filename):
+
+def floor_dates(index):
+    """Truncates dates to the precision of stored files.
+
+    It needs:
+    index ... pandas.DatetimeIndex
+
+    It returns:
+    index ... pandas.DatetimeIndex with dates truncated to STORE_PRECISION
+        (minutes)
+    """
+
+    return(pd.DatetimeIndex(index).floor(STORE_PRECISION))
+# end def floor_dates(index):
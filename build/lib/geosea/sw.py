@@ -8,6 +8,7 @@ import pandas as pd
 import numpy as np
 
 from .extract_df import *
+from .metrics import *
 
 def sal_wilson ( HRT, SSP, PRS ):
     """ Calculates salinity at one beacon using the Wilson formula.
@@ -27,19 +28,7 @@ def sal_wilson ( HRT, SSP, PRS ):
     # concatenate Data.Frames of temperature, sound speed and pressure
     df = pd.concat([HRT, SSP, PRS], axis=1)
 
-    # transform pressure from kPa to kilogram-force per square centimetres
-    # 1 kPa = 0.010197266 kg_f/cm^2
-    df['prs'] = df['prs']*0.010197266
-
-    df['S_t'] = -3.31986*df['hrt'] - 2.57236*10**(-3)*df['hrt']**2 + 2.32009*10**(-4)*df['hrt']**3 - 2.20892*10**(-6)*df['hrt']**4
-
-    df['S_p'] = -1.14663*10**(-1)*df['prs'] - 1.00488*10**(-5)*df['prs']**2 - 2.14038 * 10**(-8)*df['prs']**3 + 2.23490 * 10**(-12) * df['prs']**4
-
-    df['S_v'] = 7.21467 * 10**(-1) * (df['ssp'] - 1448.54) - 6.52575 * 10**(-4)* ( df['ssp'] - 1448.54)**2
-
-    df['S_tpv'] = (df['ssp'] - 1448.54) * (1.17 * 10**(-2)*df['hrt'] + 1.04088 * 10**(-4) * df['prs'] + 1.29184 * 10**(-7) * df['prs']**2 + 4.43572 * 10**(-6) * df['prs'] * df['hrt'] - 9.63357 * 10**(-8) * df['prs'] * df['hrt']**2) + df['prs'] * (-1.45 * 10**(-3) * df['hrt'] - 2.5563 * 10**(-5) * df['hrt']**2 + 3.45997 * 10**(-7) * df['hrt']**3) + df['prs']**2 * (-7.29321 * 10**(-7) * df['hrt'] + 2.05515 * 10**(-8) * df['hrt']**2) + df['prs']**3 * (-1.19869 * 10**(-10) * df['hrt'])
-
-    df['sal'] = 35 + df['S_t'] + df['S_p'] + df['S_v'] + df['S_tpv']
+    df['sal'] = sal_wilson_array(df['hrt'].values, df['ssp'].values, df['prs'].values)
 
     # store salinity in data frame
     df_sal = extract_df(df,column_list=['sal'],dtype=['f'])
@@ -69,10 +58,7 @@ def sal_medwin ( HRT, SSP, PRS ):
     # concatenate Data.Frames of temperature, sound speed and pressure
     df = pd.concat([HRT, SSP, PRS], axis=1)
 
-    # pressure in depth (m)??
-    df['prs'] = (df['prs']-100)/10
-
-    df['sal'] = (((1449.2 + 4.6*df['hrt'] - 0.055*df['hrt']**2 + 0.00029*df['hrt']**3 + 0.016 * df['prs'] - df['ssp'])*(-1))/(1.34 - 0.010*df['hrt']))+35
+    df['sal'] = sal_medwin_array(df['hrt'].values, df['ssp'].values, df['prs'].values)
 
     # store salinity in data frame
     df_sal = extract_df(df,column_list=['sal'],dtype=['f'])
@@ -111,18 +97,7 @@ def sv_wilson ( HRT, PRS, SAL):
         df = pd.concat([HRT, PRS ], axis=1)
         df['sal']=SAL
 
-    # transform pressure from kPa to kilogram-force per square centimetres
-    # 1 kPa = 0.010197266 kg_f/cm^2
-    df['prs'] = df['prs']*0.010197266
-
-    df['V_t'] = 4.6233 * df['hrt'] - 5.4585 * 10**(-2) * df['hrt']**2 + 2.822 * 10**(-4) * df['hrt']**3 - 5.07 * 10**(-7) * df['hrt']**4
-
-    df['V_p'] = 1.60518 * 10**(-1) * df['prs'] + 1.0279 * 10**(-5) * df['prs']**2 + 3.451 * 10**(-9) *df['prs']**3 - 3.503 * 10**(-12) * df['prs']**4
-
-    df['V_s'] = 1.391 * (df['sal']-35) - 7.8 * 10**(-2) * (df['sal']-35)
-    df['V_stp'] = (df['sal']-35) * (-1.197 * 10**(-2) * df['hrt'] + 2.61 * 10**(-4) * df['prs'] - 1.96* 10**(-7) * df['prs']**2 - 2.09 * 10**(-6) * df['prs'] * df['hrt']) + df['prs'] *(-2.796 * 10**(-4) * df['hrt'] + 1.3302 * 10**(-5) * df['hrt']**2 - 6.644*10**(-8) * df['hrt']**3) + df['prs']**2 * (-2.391 * 10**(-7) * df['hrt']+ 9.286 * 10**(-10) * df['hrt']**2) - 1.745 * 10**(-10) * df['prs']** 3 * df['hrt']
-
-    df['ssp'] = 1449.22 + df['V_t'] + df['V_p'] + df['V_s'] + df['V_stp']
+    df['ssp'] = sv_wilson_array(df['hrt'].values, df['prs'].values, df['sal'].values)
 
     # store sound speed in data frame
     df_ssp = extract_df(df,column_list=['ssp'],dtype=['f'])
@@ -151,52 +126,93 @@ def sv_leroy (st_series, SAL, phi):
         accuracy of +/- 1 metre
 
     It needs:
-    HRT ... pandas.DataFrame with measured temperature in degrees Celsius at
-        one beacon
-    PRS ... pandas.DataFrame with measured pressure in kPa at one beacon
-    SAL ... constant salinity in parts per thousand
+    st_series ... pandas.DataFrame with measured temperature ('hrt') and/ or
+        temperature of pressure sensor ('tpr') in degrees Celsius and
+        pressure ('prs') in kPa at one beacon
+    SAL ... constant salinity in parts per thousand or pandas.DataFrame with
+        salinity ('sal')
     phi ... latitude of working area in degrees
 
     It returns:
-    df_ssp ... pandas.DataFrame holding the estimated sound speeds
-        ('ssp_l') in metres per second
+    df_leroy ... pandas.DataFrame holding st_series and the estimated sound
+        speeds in metres per second ('svl_hrt', 'svl_tpr') and the salinity
+        ('sal')
     """
 
-    # concatenate Data.Frames of temperature and pressure
+    return(sv_leroy_network([st_series], SAL, phi)[0])
+# end def sv_leroy (HRT, PRS, SAL, phi):
 
-    if isinstance(SAL, pd.DataFrame):
-        df = pd.concat([st_series, SAL], axis=1)
-    else:
-    # set constant salinity value
-        df = pd.concat([st_series ], axis=1)
-        df['sal']=SAL
+def sv_leroy_network (st_series, SAL, phi):
+    """ Calculates sound speed using the Leroy formula for all beacons at once.
 
-    ##### transform pressure in kPa in depth in m #####
+    The measurements of all beacons are evaluated in one call of
+    sv_leroy_array() and split up afterwards.
 
-    # transform latitude in radians
-    phi_rad = phi*np.pi/180
-    # international formula for gravity (eq. 4 in Leroy and Parthiot, 1998)
-    g = 9.780318*(1+5.2788*10**(-3)*(np.sin(phi_rad))**2-2.36*10**(-5)*(np.sin(phi_rad))**4)
+    It needs:
+    st_series ... an 1-dim list with pandas.DataFrame with measured
+        temperature ('hrt') and/ or temperature of pressure sensor ('tpr')
+        in degrees Celsius and pressure ('prs') in kPa for each beacon
+    SAL ... constant salinity in parts per thousand, pandas.DataFrame with
+        salinity ('sal') or 1-dim list with one of both for each beacon
+        (same order as items in st_series)
+    phi ... latitude of working area in degrees
 
-    # transformation of pressure in kPa into MPa which is used in equation 3 in
-    # Leroy and Parthiot (1998)
-    df['prs'] = df['prs']/1000
-    # transform pressure in MPa into depth in metres
-    df['z'] = (9.72659*10**2*df['prs']-2.2512*10**(-1)*df['prs']**2+2.279*10**(-4)*df['prs']**3-1.82*10**(-7)*df['prs']**4)/(g+1.092*10**(-4)*df['prs'])
-
-    # calculate sound speed in metres per second with eq.2 in Leroy et al.(2008)
-    if 'hrt' in df:
-        df['svl_hrt'] = 1402.5 + 5 * df['hrt'] - 5.44 * 10**(-2)*df['hrt']**2 + 2.1 * 10**(-4) * df['hrt']**3 + 1.33 * df['sal'] - 1.23 * 10**(-2) * df['sal'] * df['hrt'] + 8.7 * 10**(-5) * df['sal']* df['hrt']**2 + 1.56 * 10**(-2) * df['z'] + 2.55 * 10**(-7) * df['z']**2 - 7.3 * 10**(-12) * df['z']**3 + 1.2 * 10**(-6) * df['z'] * (phi - 45) - 9.5 * 10**(-13) * df['hrt'] * df['z']**3 + 3 * 10**(-7) * df['hrt']**2 * df['z'] + 1.43 * 10**(-5) * df['sal'] * df['z']
-    if 'tpr' in df:
-        df['svl_tpr'] = 1402.5 + 5 * df['tpr'] - 5.44 * 10**(-2)*df['tpr']**2 + 2.1 * 10**(-4) * df['tpr']**3 + 1.33 * df['sal'] - 1.23 * 10**(-2) * df['sal'] * df['tpr'] + 8.7 * 10**(-5) * df['sal']* df['tpr']**2 + 1.56 * 10**(-2) * df['z'] + 2.55 * 10**(-7) * df['z']**2 - 7.3 * 10**(-12) * df['z']**3 + 1.2 * 10**(-6) * df['z'] * (phi - 45) - 9.5 * 10**(-13) * df['tpr'] * df['z']**3 + 3 * 10**(-7) * df['tpr']**2 * df['z'] + 1.43 * 10**(-5) * df['sal'] * df['z']
-      
-    # store sound speed in data frame
-    df_svl_hrt = extract_df(df,column_list=['svl_hrt'],dtype=['f'])
-    df_svl_tpr = extract_df(df,column_list=['svl_tpr'],dtype=['f'])
-    df_leroy = pd.concat([st_series, df_svl_hrt, df_svl_tpr, df['sal']], axis=1)
+    It returns:
+    st_leroy ... an 1-dim list with pandas.DataFrame as returned by
+        sv_leroy() for each beacon (same order as items in st_series)
+    """
 
-    return(df_leroy)
-# end def sv_leroy (HRT, PRS, SAL, phi):
+    if len(st_series) == 0:
+        return([])
+    # end if len(st_series) == 0:
+    if not isinstance(SAL, (list, tuple)):
+        SAL = [SAL] * len(st_series)
+    # end if not isinstance(SAL, (list, tuple)):
+
+    # concatenate Data.Frames of temperature and pressure
+    frames = []
+    for st, sal in zip(st_series, SAL):
+        if isinstance(sal, pd.DataFrame):
+            df = pd.concat([st, sal], axis=1)
+        else:
+        # set constant salinity value
+            df = pd.concat([st ], axis=1)
+            df['sal'] = sal
+        # end if isinstance(sal, pd.DataFrame):
+        frames.append(df)
+    # end for st, sal in zip(st_series, SAL):
+
+    # all measurements of all beacons in one array
+    offsets = np.cumsum([0] + [len(df) for df in frames])
+    prs = np.concatenate([_column(df, 'prs') for df in frames])
+    sal = np.concatenate([_column(df, 'sal') for df in frames])
+
+    sv = {}
+    with metric_stage('sv_leroy', records=len(prs)):
+        for col in ['hrt', 'tpr']:
+            if not any(col in df for df in frames):
+                continue
+            # end if not any(col in df for df in frames):
+            tmp = np.concatenate([_column(df, col) for df in frames])
+            sv[col] = sv_leroy_array(tmp, prs, sal, phi)
+        # end for col in ['hrt', 'tpr']:
+    # end with metric_stage('sv_leroy', records=len(prs)):
+
+    # store sound speed in data frame
+    st_leroy = []
+    for k, (st, df) in enumerate(zip(st_series, frames)):
+        df_leroy = df.loc[:, list(st.columns)].copy()
+        for col in ['hrt', 'tpr']:
+            if col in df:
+                df_leroy['svl_' + col] = sv[col][offsets[k]:offsets[k+1]]
+            # end if col in df:
+        # end for col in ['hrt', 'tpr']:
+        df_leroy['sal'] = df['sal']
+        st_leroy.append(df_leroy)
+    # end for k, (st, df) in enumerate(zip(st_series, frames)):
+
+    return(st_leroy)
+# end def sv_leroy_network (st_series, SAL, phi):
 
 #-------------------------------------------------------------------------------
 #       Sound Velocity Del Grosso
@@ -225,23 +241,196 @@ def sv_delgrosso ( HRT, PRS, SAL):
     # set constant salinity value
     df['sal']=SAL
 
-    # transform pressure from kPa to kilogram-force per square centimetres
-    # 1 kPa = 0.010197266 kg_f/cm^2
-    df['prs'] = df['prs']*0.010197266
+    df['ssp_d'] = sv_delgrosso_array(df['hrt'].values, df['prs'].values, df['sal'].values)
 
-    df['Ct'] = 0.501209398873*10*df['hrt'] -0.550946843172*10**(-1)*df['hrt']**2 + 0.22153596924*10**(-3)*df['hrt']**3
+    # store sound speed in data frame
+    df_ssp = extract_df(df,column_list=['ssp_d'],dtype=['f'])
 
-    df['Cs'] = 0.132952290781*10*df['sal'] + 0.128955756844*10**(-3)*df['sal']**2
+    return(df_ssp)
+# end def sv_delgrosso ( HRT, PRS, SAL):
 
-    df['Cp'] = 0.156059257041*df['prs'] + 0.244998688441*10**(-4)*df['prs']**2  -0.883392332513*10**(-8)*df['prs']**3
 
-    df['Cstp'] = -0.127562783426*10**(-1)*df['hrt']*df['sal'] + 0.635191613389*10**(-2)*df['hrt']*df['prs'] +0.265484716608*10**(-7)*df['hrt']**2*df['prs']**2-0.159349479045*10**(-5)*df['hrt']*df['prs']**2 + 0.522116437235*10**(-9)*row['hrt']*df['prs']**3 -0.438031096213*10**(-6)*df['hrt']**3*df['prs'] - 0.161674495909*10**(-8)*df['sal']**2*df['prs']**2 + 0.96840315641*10**(-4)*df['hrt']**2*df['sal'] + 0.485639620015*10**(-5)*df['hrt']*df['sal']**2*df['prs'] -0.340597039004*10**(-3)*df['hrt']*df['sal']*df['prs']
+#-------------------------------------------------------------------------------
+#       Array Kernels
+#-------------------------------------------------------------------------------
 
-    df['ssp_d'] = 1402.392 + df['Ct'] + df['Cs'] + df['Cp'] + df['Cstp']
+# 1 kPa = 0.010197266 kg_f/cm^2
+KPA2KGF = 0.010197266
 
-    # store sound speed in data frame
-    df_ssp = extract_df(df,column_list=['ssp_d'],dtype=['f'])
+def sal_wilson_array ( tmp, ssp, prs ):
+    """ Calculates salinity with the Wilson formula (see sal_wilson()).
 
-    return(df_ssp)
-# end def sv_delgrosso ( HRT, PRS, SAL):
+    All arguments are numpy.ndarrays (or scalars) which are broadcast
+    against each other.
+
+    It needs:
+    tmp ... temperature in degrees Celsius
+    ssp ... sound speed in metres per second
+    prs ... pressure in kPa
+
+    It returns:
+    sal ... salinity in parts per thousand
+    """
+
+    t = np.asarray(tmp, dtype=float)
+    p = np.asarray(prs, dtype=float) * KPA2KGF
+    v = np.asarray(ssp, dtype=float) - 1448.54
+
+    S_t = t * (-3.31986 + t * (-2.57236e-3 + t * (2.32009e-4 - 2.20892e-6 * t)))
+    S_p = p * (-1.14663e-1 + p * (-1.00488e-5 + p * (-2.14038e-8 + 2.23490e-12 * p)))
+    S_v = v * (7.21467e-1 - 6.52575e-4 * v)
+    S_tpv = v * (t * (1.17e-2 + p * (4.43572e-6 - 9.63357e-8 * t)) + p * (1.04088e-4 + 1.29184e-7 * p)) \
+        + p * t * (-1.45e-3 + t * (-2.5563e-5 + 3.45997e-7 * t) + p * (-7.29321e-7 + 2.05515e-8 * t - 1.19869e-10 * p))
+
+    return(35 + S_t + S_p + S_v + S_tpv)
+# end def sal_wilson_array ( tmp, ssp, prs ):
+
+def sal_medwin_array ( tmp, ssp, prs ):
+    """ Calculates salinity with the Medwin formula (see sal_medwin()).
+
+    It needs:
+    tmp ... temperature in degrees Celsius
+    ssp ... sound speed in metres per second
+    prs ... pressure in kPa
+
+    It returns:
+    sal ... salinity in parts per thousand
+    """
+
+    t = np.asarray(tmp, dtype=float)
+    # pressure in depth (m)??
+    z = (np.asarray(prs, dtype=float) - 100) / 10
+
+    return((np.asarray(ssp, dtype=float) - 1449.2 - t * (4.6 + t * (-0.055 + 0.00029 * t)) - 0.016 * z) / (1.34 - 0.010 * t) + 35)
+# end def sal_medwin_array ( tmp, ssp, prs ):
+
+def sv_wilson_array ( tmp, prs, sal ):
+    """ Calculates sound speed with the Wilson formula (see sv_wilson()).
+
+    It needs:
+    tmp ... temperature in degrees Celsius
+    prs ... pressure in kPa
+    sal ... salinity in parts per thousand
+
+    It returns:
+    ssp ... sound speed in metres per second
+    """
+
+    t = np.asarray(tmp, dtype=float)
+    p = np.asarray(prs, dtype=float) * KPA2KGF
+    s = np.asarray(sal, dtype=float) - 35
+
+    V_t = t * (4.6233 + t * (-5.4585e-2 + t * (2.822e-4 - 5.07e-7 * t)))
+    V_p = p * (1.60518e-1 + p * (1.0279e-5 + p * (3.451e-9 - 3.503e-12 * p)))
+    V_s = s * (1.391 - 7.8e-2 * s)
+    V_stp = s * (-1.197e-2 * t + p * (2.61e-4 - 1.96e-7 * p - 2.09e-6 * t)) \
+        + p * t * (-2.796e-4 + t * (1.3302e-5 - 6.644e-8 * t) + p * (-2.391e-7 + 9.286e-10 * t - 1.745e-10 * p))
+
+    return(1449.22 + V_t + V_p + V_s + V_stp)
+# end def sv_wilson_array ( tmp, prs, sal ):
+
+def sv_delgrosso_array ( tmp, prs, sal ):
+    """ Calculates sound speed with the Del Grosso formula (see sv_delgrosso()).
+
+    It needs:
+    tmp ... temperature in degrees Celsius
+    prs ... pressure in kPa
+    sal ... salinity in parts per thousand
+
+    It returns:
+    ssp ... sound speed in metres per second
+    """
+
+    t = np.asarray(tmp, dtype=float)
+    p = np.asarray(prs, dtype=float) * KPA2KGF
+    s = np.asarray(sal, dtype=float)
+
+    Ct = t * (0.501209398873e1 + t * (-0.550946843172e-1 + 0.22153596924e-3 * t))
+    Cs = s * (0.132952290781e1 + 0.128955756844e-3 * s)
+    Cp = p * (0.156059257041 + p * (0.244998688441e-4 - 0.883392332513e-8 * p))
+    Cstp = t * (s * (-0.127562783426e-1 + 0.96840315641e-4 * t) \
+        + p * (0.635191613389e-2 - 0.438031096213e-6 * t * t - 0.340597039004e-3 * s + 0.485639620015e-5 * s * s \
+        + p * (-0.159349479045e-5 + 0.265484716608e-7 * t + 0.522116437235e-9 * p))) \
+        - 0.161674495909e-8 * s * s * p * p
+
+    return(1402.392 + Ct + Cs + Cp + Cstp)
+# end def sv_delgrosso_array ( tmp, prs, sal ):
+
+def depth_leroy ( prs, phi ):
+    """ Converts pressure into depth (see sv_leroy()).
+
+    It needs:
+    prs ... pressure in kPa
+    phi ... latitude of working area in degrees
+
+    It returns:
+    z ... depth in metres
+    """
+
+    # transform latitude in radians
+    sin2 = np.sin(phi*np.pi/180)**2
+    # international formula for gravity (eq. 4 in Leroy and Parthiot, 1998)
+    g = 9.780318 * (1 + sin2 * (5.2788e-3 - 2.36e-5 * sin2))
+
+    # transformation of pressure in kPa into MPa which is used in equation 3 in
+    # Leroy and Parthiot (1998)
+    p = np.asarray(prs, dtype=float) / 1000
+
+    return(p * (9.72659e2 + p * (-2.2512e-1 + p * (2.279e-4 - 1.82e-7 * p))) / (g + 1.092e-4 * p))
+# end def depth_leroy ( prs, phi ):
+
+def sv_leroy_array ( tmp, prs, sal, phi ):
+    """ Calculates sound speed with the Leroy formula (see sv_leroy()).
+
+    It needs:
+    tmp ... temperature in degrees Celsius
+    prs ... pressure in kPa
+    sal ... salinity in parts per thousand
+    phi ... latitude of working area in degrees
+
+    It returns:
+    ssp ... sound speed in metres per second
+    """
+
+    c0, c1 = sv_leroy_coef(tmp, prs, phi)
+
+    return(c0 + np.asarray(sal, dtype=float) * c1)
+# end def sv_leroy_array ( tmp, prs, sal, phi ):
+
+def sv_leroy_coef ( tmp, prs, phi ):
+    """ Calculates the salinity independent terms of the Leroy formula.
+
+    The sound speed is linear in salinity (ssp = c0 + sal * c1). Thus for
+    many salinity values (e.g. sensitivity studies) the terms of
+    temperature and pressure have to be evaluated only once.
+
+    It needs:
+    tmp ... temperature in degrees Celsius
+    prs ... pressure in kPa
+    phi ... latitude of working area in degrees
+
+    It returns:
+    c0 ... sound speed in metres per second for salinity 0
+    c1 ... change of sound speed in metres per second per part per thousand
+    """
+
+    t = np.asarray(tmp, dtype=float)
+    z = depth_leroy(prs, phi)
+
+    # eq.2 in Leroy et al.(2008)
+    c0 = 1402.5 + t * (5 + t * (-5.44e-2 + 2.1e-4 * t)) \
+        + z * (1.56e-2 + 1.2e-6 * (phi - 45) + 3e-7 * t * t + z * (2.55e-7 + z * (-7.3e-12 - 9.5e-13 * t)))
+    c1 = 1.33 + t * (-1.23e-2 + 8.7e-5 * t) + 1.43e-5 * z
+
+    return(c0, c1)
+# end def sv_leroy_coef ( tmp, prs, phi ):
+
+def _column ( df, col ):
+    """Returns column col of df as float array (NaN if missing)."""
+
+    if col in df:
+        return(np.asarray(df[col], dtype=float))
+    # end if col in df:
 
+    return(np.full(len(df), np.nan))
+# end def _column ( df, col ):
@@ -0,0 +1,363 @@
+#-------------------------------------------------------------------------------
+#       Incremental Baseline processing
+#-------------------------------------------------------------------------------
+
+import hashlib
+import json
+import os
+import pandas as pd
+
+from .read import *
+from .read_data import *
+from .read_bsl import *
+from .hori_bsl import *
+from .store import *
+from .sw import *
+from .metrics import *
+
+# sensors of st_series (same order of columns as in read()) and their
+# columns
+ST_SENSORS = [('SSP',['ssp']), ('PRS',['prs']), ('HRT',['hrt']), ('TPR',['tpr']), ('INC',['pitch','roll']), ('BAT',['bat','vlt']), ('PAG',['pag'])]
+
+def update_bsl(SAL,phi,minmax,outlier_flag=None,pathname=None,processes=None,fmt=None,verbose=True):
+    """Incremental baseline processing of new or changed raw files.
+
+    Only raw files which are not yet listed in the manifest (see
+    read_manifest()) or whose size or checksum have changed are read. The
+    new records are merged into the existing station and baseline files in
+    ../DATA/ (existing records are kept, duplicates are removed). Sound
+    speed matching and baseline calculation are only repeated for ranges
+    measured after the first new record minus minmax.
+
+    It needs:
+    SAL ... constant salinity value
+    phi ... Latitude for Leroy formular
+    minmax ... half time window length in seconds for searching for sound
+        speed at beacon 1 and beacon 2
+    outlier_flag (optional) ... if set to 1 all baselines with lengths
+        +/-10m are removed
+    pathname (optional) ... location of raw files (default ../RAW/)
+    processes (optional) ... number of worker processes used to read the
+        raw files (see read())
+    fmt (optional) ... format of written files (see write_data())
+    verbose (optional) ... if True the number of new records and
+        recalculated ranges are printed (default True), they are also stored
+        in the records of stages 'merge' and 'pair' (see metric_stage()) if
+        metrics are enabled
+
+    It returns:
+    ID_pair ... a 2-dim list with IDs of updated beacon pairs
+    final_bsls ... an 1-dim list with pandas.DataFrame with all baselines of
+        the updated beacon pairs (see hori_bsl(), same order as list items
+        in ID_pair)
+    """
+
+    if pathname is None:
+        pathname = '../RAW/'
+    # end if pathname is None:
+
+    manifest = read_manifest()
+    ID = read_id(pathname)
+    station_files = find_raw(ID,pathname)
+
+    # search for new or changed raw files
+    file_info = {}
+    new_files = {}
+    for station in ID:
+        for filename in station_files[station]:
+            file_info[filename] = raw_file_info(filename)
+            if manifest['files'].get(filename) != file_info[filename]:
+                new_files.setdefault(station,[]).append(filename)
+            # end if manifest['files'].get(filename) != ... :
+        # end for filename in station_files[station]:
+    # end for station in ID:
+
+    if not new_files:
+        if verbose:
+            print('No new or changed raw files found!')
+        # end if verbose:
+        return([],[])
+    # end if not new_files:
+
+    new_ID,new_st,new_bsl = read(pathname=pathname,writefile=False,processes=processes,station_files=new_files,verbose=verbose)
+
+#-------------------------------------------------------------------------------
+#       Merge new records into station files
+#-------------------------------------------------------------------------------
+    # time of first new sensor record per station and of first new range per
+    # station and ID of other station
+    first_st = {}
+    first_bsl = {}
+    for k,station in enumerate(new_ID):
+        # number of new records of each sensor are stored in the record
+        with metric_stage('merge',station=station) as stage:
+            if verbose:
+                print('\nUpdate of Station: ' + station)
+                print('-------------------------------------------------------------------------------')
+            # end if verbose:
+            for sensor,columns in ST_SENSORS:
+                if not set(columns).issubset(new_st[k].columns):
+                    continue
+                # end if not set(columns).issubset(new_st[k].columns):
+                df_new = new_st[k].loc[:,columns].dropna(how='all')
+                df_old = read_data(station,sensor)
+                df_merged,df_added = merge_data(df_old,df_new)
+                write_data(df_merged,'../DATA/' + str(station) +'-'+ sensor,fmt)
+                stage[sensor.lower()] = len(df_added)
+                if verbose:
+                    print('New: ' + str(len(df_added)) + '\t ' + sensor + ' Records')
+                # end if verbose:
+                if not df_added.empty:
+                    first_st[station] = min(first_st.get(station,df_added.index[0]),df_added.index[0])
+                # end if not df_added.empty:
+            # end for sensor,columns in ST_SENSORS:
+
+            df_old = read_data(station,'BSL')
+            df_merged,df_added = merge_data(df_old,new_bsl[k],by_date=False)
+            write_data(df_merged,'../DATA/' + str(station) +'-BSL',fmt)
+            stage['bsl'] = len(df_added)
+            if verbose:
+                print('New: ' + str(len(df_added)) + '\t BSL Records')
+            # end if verbose:
+            if not df_added.empty:
+                first_bsl[station] = df_added.reset_index().groupby('range_ID')['date'].min().to_dict()
+            # end if not df_added.empty:
+            stage['records'] = sum(stage.get(sensor.lower(),0) for sensor,columns in ST_SENSORS) + stage['bsl']
+        # end with metric_stage('merge',station=station) as stage:
+    # end for k,station in enumerate(new_ID):
+
+#-------------------------------------------------------------------------------
+#       Time window of baselines to be recalculated
+#-------------------------------------------------------------------------------
+    margin = pd.Timedelta(seconds=minmax)
+    pair_start = {}
+    for beacon_1 in ID:
+        for beacon_2 in ID:
+            if beacon_1 != beacon_2:
+                times = []
+                if beacon_1 in first_bsl and int(beacon_2) in first_bsl[beacon_1]:
+                    times.append(first_bsl[beacon_1][int(beacon_2)])
+                # end if beacon_1 in first_bsl and ... :
+                # new sensor records change the match of ranges within minmax
+                if beacon_1 in first_st:
+                    times.append(first_st[beacon_1]-margin)
+                # end if beacon_1 in first_st:
+                if beacon_2 in first_st:
+                    times.append(first_st[beacon_2]-margin)
+                # end if beacon_2 in first_st:
+                if times:
+                    pair_start[(beacon_1,beacon_2)] = min(times)
+                # end if times:
+            # end if beacon_1 != beacon_2:
+        # end for beacon_2 in ID:
+    # end for beacon_1 in ID:
+
+    # sensor data is only loaded from first needed record on
+    st_start = {}
+    for (beacon_1,beacon_2),start in pair_start.items():
+        for station in [beacon_1,beacon_2]:
+            st_start[station] = min(st_start.get(station,start-margin),start-margin)
+        # end for station in [beacon_1,beacon_2]:
+    # end for (beacon_1,beacon_2),start in pair_start.items():
+    # sound speed of all stations in one batch
+    stations = list(st_start)
+    st_leroy = dict(zip(stations,sv_leroy_network([load_st(station,st_start[station]) for station in stations],SAL,phi)))
+
+#-------------------------------------------------------------------------------
+#       Recalculate baselines
+#-------------------------------------------------------------------------------
+    ID_pair = []
+    final_bsls = []
+    for beacon_1 in ID:
+        for beacon_2 in ID:
+            if (beacon_1,beacon_2) not in pair_start:
+                continue
+            # end if (beacon_1,beacon_2) not in pair_start:
+            start = pair_start[(beacon_1,beacon_2)]
+            with metric_stage('pair',pair=beacon_1+'-'+beacon_2) as stage:
+                if verbose:
+                    print('Baseline Update for: ' + str(beacon_1) + ' <-> ' + str(beacon_2) + ' from ' + start.strftime(GMT_DATEFORMAT))
+                    print('-------------------------------------------------------------------------------')
+                # end if verbose:
+
+                bsl_1 = read_data(beacon_1,'BSL',starttime=start)
+                df_new,bsl_stats = match_pair_bsl(beacon_1,beacon_2,bsl_1,st_leroy[beacon_1],st_leroy[beacon_2],minmax)
+
+                # keep all baselines before start
+                df_old = read_bsl(beacon_1,beacon_2,suffix='BSL')
+                if not df_old.empty:
+                    df_old = df_old.loc[df_old.index < start]
+                # end if not df_old.empty:
+                df_bsl = pd.concat([df_old,df_new]).sort_index(kind='mergesort')
+                write_data(df_bsl,'../DATA/' + beacon_1 +'-'+ beacon_2 +'-BSL',fmt,sep=',')
+
+                df_bsl = cut_pair_bsl(df_bsl,outlier_flag)
+                write_data(df_bsl,'../DATA/' + beacon_1 +'-'+ beacon_2,fmt,sep=',')
+
+                stage.update(bsl_stats)
+                stage['records'] = bsl_stats['ranges']
+                if verbose:
+                    print(str(bsl_stats['ranges']) + '\t Ranges recalculated')
+                    print(str(bsl_stats['bsl']) + '\t Successfull Calculated Baselines')
+                    print(' \n')
+                # end if verbose:
+            # end with metric_stage('pair', ... ) as stage:
+
+            ID_pair.append([beacon_1,beacon_2])
+            final_bsls.append(df_bsl)
+        # end for beacon_2 in ID:
+    # end for beacon_1 in ID:
+
+    # store processed files
+    manifest['files'].update(file_info)
+    write_manifest(manifest)
+
+    return(ID_pair,final_bsls)
+# end def update_bsl( ... ):
+
+def merge_data(df_old,df_new,by_date=True):
+    """Merges new records into existing pandas.DataFrame.
+
+    It needs:
+    df_old ... pandas.DataFrame with existing records and date as index
+    df_new ... pandas.DataFrame with new records and date as index
+    by_date (optional) ... if True records of df_new are new if their date
+        does not exist in df_old, if False the whole record (date and all
+        columns) is compared, e.g. for baseline records (default True)
+
+    Dates of df_new are truncated to the precision of the stored files
+    (minutes, see floor_dates()) before they are compared with df_old.
+
+    It returns:
+    df_merged ... pandas.DataFrame with records of df_old and new records of
+        df_new sorted by date
+    df_added ... pandas.DataFrame with new records of df_new
+    """
+
+    # dates in files have a precision of minutes
+    df_new = df_new.copy()
+    df_new.index = floor_dates(df_new.index).rename(df_new.index.name)
+
+    if df_old.empty:
+        df_added = df_new
+    elif by_date:
+        df_added = df_new.loc[~df_new.index.isin(df_old.index)]
+    else:
+        # compare whole records including the dates
+        old = df_old.reset_index()
+        new = df_new.reset_index()
+        old.columns = new.columns
+        flag = new.merge(old.drop_duplicates(),how='left',indicator=True)['_merge'] == 'left_only'
+        df_added = df_new.loc[flag.values]
+    # end if df_old.empty:
+
+    if by_date:
+        df_added = df_added.loc[~df_added.index.duplicated(keep='first')]
+    else:
+        df_added = df_added.loc[~df_added.reset_index().duplicated().values]
+    # end if by_date:
+
+    df_merged = pd.concat([df_old,df_added]).sort_index(kind='mergesort')
+    df_merged.index.name = df_new.index.name
+
+    return(df_merged,df_added)
+# end def merge_data(df_old,df_new,by_date=True):
+
+def load_st(station,starttime=None):
+    """Loads sensor data of one station from files created with read().
+
+    It needs:
+    station ... beacon ID
+    starttime (optional) ... no measurement before this time is used
+
+    It returns:
+    df ... pandas.DataFrame with same columns as st_series in read()
+
+    Missing files (e.g. no sound speed sensor) result in columns with NaN,
+    thus the position of all columns is the same as in read().
+    """
+
+    st = []
+    for sensor,columns in ST_SENSORS:
+        df = read_data(station,sensor,starttime=starttime)
+        if df.empty:
+            df = pd.DataFrame(columns=columns,index=pd.DatetimeIndex([],name='date'),dtype=float)
+        # end if df.empty:
+        df = df.reindex(columns=columns)
+        if sensor == 'PAG':
+            # tranform page numbers to Bytes
+            df['size'] = df['pag']*512/1000
+        # end if sensor == 'PAG':
+        st.append(df)
+    # end for sensor,columns in ST_SENSORS:
+
+    return(pd.concat(st,axis=1))
+# end def load_st(station,starttime=None):
+
+def raw_file_info(filename):
+    """Returns size and SHA-1 checksum of a raw file.
+
+    It needs:
+    filename ... name of raw file
+
+    It returns:
+    info ... dict with size in bytes ('size') and checksum ('sha1')
+    """
+
+    sha1 = hashlib.sha1()
+    with open(filename,'rb') as f:
+        for block in iter(lambda: f.read(1048576),b''):
+            sha1.update(block)
+        # end for block in ... :
+    # end with open(filename,'rb') as f:
+
+    return({'size' : os.path.getsize(filename), 'sha1' : sha1.hexdigest()})
+# end def raw_file_info(filename):
+
+def read_manifest(pathname=None):
+    """Reads manifest of processed raw files.
+
+    It needs:
+    pathname (optional) ... location of manifest file 'manifest.json'
+        (default is ../DATA/)
+
+    It returns:
+    manifest ... dict with processed raw files ('files', size and checksum
+        for each file name), if file does not exist an empty manifest will
+        be returned
+    """
+
+    if pathname is None:
+        pathname = '../DATA/'
+    # end if pathname is None:
+
+    manifest = {'files' : {}}
+    try:
+        with open(pathname + 'manifest.json','r') as f:
+            # entries of older manifests besides 'files' are not used
+            manifest['files'] = json.load(f).get('files',{})
+        # end with open(...) as f:
+    except IOError:
+        print('No manifest found, all raw files will be processed.')
+    # end try:
+
+    return(manifest)
+# end def read_manifest(pathname=None):
+
+def write_manifest(manifest,pathname=None):
+    """Writes manifest of processed raw files (see read_manifest()).
+
+    It needs:
+    manifest ... dict as returned by read_manifest()
+    pathname (optional) ... location of manifest file 'manifest.json'
+        (default is ../DATA/)
+    """
+
+    if pathname is None:
+        pathname = '../DATA/'
+    # end if pathname is None:
+
+    with open(pathname + 'manifest.json','w') as f:
+        json.dump(manifest,f,indent=1,sort_keys=True)
+    # end with open(...) as f:
+# end def write_manifest(manifest,pathname=None):
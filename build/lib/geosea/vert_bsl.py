@@ -2,12 +2,14 @@
 #       Calculate Pressure Differences of Seafloor Geodetic Network
 #-------------------------------------------------------------------------------
 
+import numpy as np
 import pandas as pd
 
 from .read_data import *
 from .read_tides import *
+from .metrics import *
 
-def vert_bsl(ID, tidesfile=None, starttime=None, freq=None):
+def vert_bsl(ID, tidesfile=None, starttime=None, freq=None, writefile=True, verbose=True):
     """ Calculates vertical pressure differences by subtracting pressure from each other.
 
     It needs:
@@ -19,75 +21,214 @@ def vert_bsl(ID, tidesfile=None, starttime=None, freq=None):
     starttime (optional) ... no measurement before this time is used ( format
         'YYYY-MM-DD hh:mm:ss')
 
-    freq (optional) ... frequancy of movingaverage in pressure data (Default = 7d)
+    freq (optional) ... frequancy of movingaverage in pressure data (Default = 7D)
+
+    writefile (optional) ... if True the pressure differences of each pair
+        are written to ../DATA/<ID1>-<ID2>-PRS.dat (default True)
+
+    verbose (optional) ... if True the offset of each pair is printed
+        (default True)
 
     It returns:
     List of vertical motion differences in cm
 
     """
-    # convert tide data from kPa to dbar and subtract the mean
-    if tidesfile is not None:
-        df_tides = read_tides(tidesfile)
-        tides = df_tides
-        tides_mean = tides - tides.mean()
-    
-    # read pressure data from file and convert Kpa to dbar
-    prs_corr = []
-    for id in ID:
 
-        if starttime is None:
-            prs_dummy = ((read_data(id, 'prs')-100)/10)
+    # pressure differences of all pairs at once
+    with metric_stage('vert_bsl') as stage:
+        df_diff = calc_prs_diff(ID, tidesfile, starttime, freq)
+        stage['records'] = len(df_diff)
+    # end with metric_stage('vert_bsl') as stage:
+    pairs = {}
+    for key, df_pair in df_diff.groupby(['ID1', 'ID2'], sort=False):
+        pairs[key] = df_pair.loc[:, ['prs']]
+    # end for key, df_pair in ... :
+
+    offset = []
+    # Loop over all Statsions
+    for i, id1 in enumerate(ID):
 
-        else:
-            prs_dummy = ((read_data(id, 'prs',starttime=starttime)-100)/10)
+        if verbose:
+            print(' ')
+            print('Station: ', ID[i])
+            print(' ')
+        # end if verbose:
+        for j, id2 in enumerate(ID):
 
-        # subtract mean and append to a list of pandas.DataFrame
-        prs_dummy = prs_dummy - prs_dummy.mean()
+            if i != j:
+                prs_diff_mean = pairs.get((id1, id2), pd.DataFrame(columns=['prs']))
+                if writefile:
+                    prs_diff_mean.to_csv('../DATA/'+ str(ID[i]) + '-' + str(ID[j]) + '-PRS.dat', sep='\t', header=False, date_format='%Y-%m-%dT%H:%M')
+                # end if writefile:
 
-        if tidesfile is None:
-            prs_corr.append(prs_dummy)
+                # calculation of pressure difference from last to first rolling median entry
+                # and convert to cm
+                if prs_diff_mean.empty:
+                    off = np.nan
+                else:
+                    off = (prs_diff_mean['prs'].iloc[-1] - prs_diff_mean['prs'].iloc[0])*100
+                # end if prs_diff_mean.empty:
 
-        else:
-        # add Index of reference station to DataFrame and interpolate the pressure in between
-            df_tide_newindex=tides_mean.reindex(prs_dummy.index).append(tides_mean).sort_index()
-            print(df_tide_newindex)
-            tide_interpolate = df_tide_newindex.interpolate(method ='slinear')
-            prs_corr.append(pd.DataFrame({"prs": prs_dummy.prs.subtract(tide_interpolate.tide).dropna()}))
-        offset = []
+                # append to List
+                offset.append(off)
 
-    if freq is None:
-        rolling_freq = '7d'
+                if verbose:
+                    print(ID[j], ' ', off)
+                # end if verbose:
 
-    else:
-        rolling_freq = str(freq)
+    return(offset)
+# end def calc_vert_motion(ID, tidesfile=None, starttime=None, freq=None):
 
-    # Loop over all Statsions
-    for i ,df_prs1 in enumerate(prs_corr):
+def calc_prs_diff(ID, tidesfile=None, starttime=None, freq=None):
+    """ Calculates smoothed pressure differences of all station pairs at once.
 
-        print(' ')
-        print('Station: ', ID[i])
-        print(' ')
-        for j , df_prs2 in enumerate(prs_corr):
+    The pressure of all stations is aligned once on a common time grid (see
+    calc_prs_matrix()). For each pair (ID1, ID2) the difference of the
+    pressure at ID2 and the interpolated pressure at ID1 is taken at the
+    times of measurement of ID2. The median of these differences is taken in
+    bins of length freq (like rolling(freq=freq,window=1).median() of older
+    pandas versions, which resampled each bin with its median). All bins
+    start at midnight of the first day of the common time grid.
 
-            if i != j:
-                # add Index of reference station to DataFrame and interpolate the pressure in between
-                df_prs1_newindex=df_prs1.reindex(df_prs2.index).append(df_prs1).sort_index()
-                prs_interpolate = df_prs1_newindex.interpolate(method ='slinear')
-                prs_diff = pd.DataFrame({"prs": df_prs2.prs.subtract(prs_interpolate.prs).dropna()})
-
-                # calculation of rolling mean to smoth dataset ans remove high tide frequancies
-                prs_diff_mean = prs_diff.rolling(freq=rolling_freq,window=1).median().dropna()
-                prs_diff_mean.to_csv('../DATA/'+ str(ID[i]) + '-' + str(ID[j]) + '-PRS.dat', sep='\t', header=False, date_format='%Y-%m-%dT%H:%M')
-                # calculation of pressure difference from last to first rolling median entry
-                first = prs_diff_mean.first('1s').values
-                last = prs_diff_mean.last('1s').values
+    It needs:
+    ID ... list of station IDs
+    tidesfile (optional) ... filename of global or regional tide model (see
+        read_tides())
+    starttime (optional) ... no measurement before this time is used (format
+        'YYYY-MM-DD hh:mm:ss')
+    freq (optional) ... length of bins for smoothing (default '7D')
 
-                # append to List and convert to cm
-                offset.append((last - first)*100)
-                off = (last - first)*100
+    It returns:
+    df_diff ... pandas.DataFrame with station ID of the reference station
+        ('ID1'), station ID of the other station ('ID2') and smoothed
+        pressure difference in dbar ('prs') with date of bin as index,
+        sorted by ID1, ID2 and date (same order as in ID)
+    """
 
-                print(ID[j], ' ', off)
+    if freq is None:
+        rolling_freq = '7D'
+    else:
+        rolling_freq = str(freq)
+    # end if freq is None:
+
+    grid, prs, mask = calc_prs_matrix(ID, tidesfile, starttime)
+    if len(grid) == 0:
+        return(pd.DataFrame(columns=['ID1', 'ID2', 'prs'], index=pd.DatetimeIndex([], name='date')))
+    # end if len(grid) == 0:
+
+    # bin number for each time of the grid
+    step = pd.to_timedelta(rolling_freq)
+    origin = grid[0].normalize()
+    bins = np.asarray((grid - origin) // step, dtype=int)
+
+    # differences of all pairs at the times of measurement of ID2 as tidy
+    # table (ID1, ID2, bin, prs)
+    n = len(ID)
+    pos1, pos2, pos_bin, values = [], [], [], []
+    for i in range(n):
+        # difference of all stations to station i at their own times
+        d = np.where(mask, prs - prs[i], np.nan)
+        d[i] = np.nan
+        j, k = np.nonzero(~np.isnan(d))
+        pos1.append(np.full(len(j), i))
+        pos2.append(j)
+        pos_bin.append(bins[k])
+        values.append(d[j, k])
+    # end for i in range(n):
+
+    # median of each bin, sorted by ID1, ID2 and bin
+    df_tidy = pd.DataFrame({'i': np.concatenate(pos1), 'j': np.concatenate(pos2), 'bin': np.concatenate(pos_bin), 'prs': np.concatenate(values)})
+    median = df_tidy.groupby(['i', 'j', 'bin'], sort=True)['prs'].median()
+    i, j, k = (median.index.get_level_values(level).values for level in ['i', 'j', 'bin'])
+
+    ID = np.asarray(ID)
+    df_diff = pd.DataFrame({'ID1': ID[i], 'ID2': ID[j], 'prs': median.values}, index=pd.DatetimeIndex(origin + k * step, name='date'))
+
+    return(df_diff)
+# end def calc_prs_diff(ID, tidesfile=None, starttime=None, freq=None):
+
+def calc_prs_matrix(ID, tidesfile=None, starttime=None):
+    """ Aligns de-meaned (and tide corrected) pressure of all stations on a common time grid.
+
+    The pressure is converted from kPa to dbar and the mean is subtracted.
+    If tidesfile is given, the tides interpolated to the times of
+    measurement are subtracted. The common time grid holds all times of
+    measurement of all stations, the pressure of each station is linearly
+    interpolated in time on this grid (no extrapolation).
 
-    return(offset)
-# end def calc_vert_motion(ID, tidesfile=None, starttime=None, freq=None):
+    It needs:
+    ID ... list of station IDs
+    tidesfile (optional) ... filename of global or regional tide model (see
+        read_tides())
+    starttime (optional) ... no measurement before this time is used (format
+        'YYYY-MM-DD hh:mm:ss')
 
+    It returns:
+    grid ... pandas.DatetimeIndex with common time grid
+    prs ... numpy.ndarray (station x time) with pressure in dbar (NaN outside
+        time span of station)
+    mask ... boolean numpy.ndarray (station x time) which is True at times of
+        measurement of each station
+    """
+
+    if tidesfile is not None:
+        tides = read_tides(tidesfile)
+        tides = (tides - tides.mean()).dropna().sort_index()
+        tide_time = _time2int(tides.index)
+        tide_value = tides['tide'].values
+    # end if tidesfile is not None:
+
+    times = []
+    values = []
+    for id in ID:
+        prs_dummy = read_data(id, 'prs', starttime=starttime)
+        if prs_dummy.empty:
+            times.append(np.array([], dtype='i8'))
+            values.append(np.array([]))
+            continue
+        # end if prs_dummy.empty:
+
+        # convert kPa to dbar and subtract mean
+        prs_dummy = (prs_dummy['prs'] - 100) / 10
+        prs_dummy = (prs_dummy - prs_dummy.mean()).dropna().sort_index()
+        prs_dummy = prs_dummy.loc[~prs_dummy.index.duplicated(keep='first')]
+
+        time = _time2int(prs_dummy.index)
+        value = prs_dummy.values
+        if tidesfile is not None:
+            value = value - _interp(time, tide_time, tide_value)
+            keep = ~np.isnan(value)
+            time = time[keep]
+            value = value[keep]
+        # end if tidesfile is not None:
+
+        times.append(time)
+        values.append(value)
+    # end for id in ID:
+
+    grid = np.unique(np.concatenate(times))
+    prs = np.full((len(ID), len(grid)), np.nan)
+    mask = np.zeros((len(ID), len(grid)), dtype=bool)
+    for k in range(len(ID)):
+        prs[k] = _interp(grid, times[k], values[k])
+        mask[k, np.searchsorted(grid, times[k])] = True
+    # end for k in range(len(ID)):
+
+    return(pd.DatetimeIndex(grid.astype('datetime64[ns]'), name='date'), prs, mask)
+# end def calc_prs_matrix(ID, tidesfile=None, starttime=None):
+
+def _time2int(index):
+    """Converts pandas.DatetimeIndex to integer nanoseconds."""
+
+    return(np.asarray(index.values, dtype='datetime64[ns]').view('i8'))
+# end def _time2int(index):
+
+def _interp(x, xp, fp):
+    """Linear interpolation of fp(xp) at x, NaN outside of xp."""
+
+    if len(xp) == 0:
+        return(np.full(len(x), np.nan))
+    # end if len(xp) == 0:
+
+    return(np.interp(x, xp, fp, left=np.nan, right=np.nan))
+# end def _interp(x, xp, fp):
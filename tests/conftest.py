@@ -0,0 +1,123 @@
+#-------------------------------------------------------------------------------
+#       Test Configuration
+#-------------------------------------------------------------------------------
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# the package is located in build/lib/geosea
+sys.path.insert(0,os.path.join(os.path.dirname(os.path.abspath(__file__)),'..','build','lib'))
+
+#-------------------------------------------------------------------------------
+#       Synthetic Data
+#-------------------------------------------------------------------------------
+
+@pytest.fixture
+def rng():
+    """Random number generator with fixed seed."""
+
+    return(np.random.default_rng(1))
+# end def rng():
+
+@pytest.fixture
+def random_df(rng):
+    """Sensor data (two columns) and targets with random times."""
+
+    t0 = pd.Timestamp('2020-01-01').value
+    t2 = pd.DatetimeIndex(np.sort(t0 + rng.integers(0,10**14,500)).astype('datetime64[ns]'))
+    t1 = pd.DatetimeIndex((t0 + rng.integers(-10**12,11*10**13,300)).astype('datetime64[ns]'))
+    df2 = pd.DataFrame({'a' : rng.normal(size=500), 'b' : rng.normal(size=500)},index=t2)
+    df1 = pd.DataFrame({'x' : np.arange(300)},index=t1)
+
+    return(df1,df2)
+# end def random_df(rng):
+
+@pytest.fixture
+def network(rng):
+    """Station and range data of three beacons (see hori_bsl())."""
+
+    ID = ['2201','2202','2203']
+    t = pd.date_range('2020-01-01',periods=200,freq='2h')
+    st_series = []
+    bsl_all = []
+    for station in ID:
+        df = pd.DataFrame({'ssp' : 1500+rng.normal(size=200), 'prs' : 3e4+rng.normal(size=200), 'hrt' : 4+rng.normal(size=200), 'tpr' : 4.},index=t)
+        for col in ['pitch','roll','bat','vlt','pag','size']:
+            df[col] = 1.
+        # end for col in [...]:
+        df['svl_hrt'] = df['ssp']
+        df['svl_tpr'] = df['ssp']
+        df['sal'] = 35.
+        st_series.append(df)
+
+        # ranges 5 minutes after the sensor records, alternating to both
+        # other beacons
+        other = [x for x in ID if x != station]
+        bsl = pd.DataFrame({'range_ID' : [int(other[i % 2]) for i in range(200)], 'range' : 2000+rng.normal(size=200), 'TAT' : 100.},index=t+pd.Timedelta('5min'))
+        bsl_all.append(bsl)
+    # end for station in ID:
+
+    return(ID,bsl_all,st_series)
+# end def network(rng):
+
+@pytest.fixture
+def raw_network(tmp_path):
+    """Creates working directories with synthetic raw files.
+
+    Returns a function make(name,**kwargs) which creates <tmp_path>/<name>
+    with RAW/ (raw files of create_raw(), kwargs are passed, default 3
+    beacons and 6 days), DATA/ and PROC/ and returns the path of PROC/
+    (processing uses ../RAW/ and ../DATA/).
+    """
+
+    from geosea.benchmark import create_raw
+
+    def make(name='network',**kwargs):
+        path = os.path.join(str(tmp_path),name)
+        for folder in ['RAW','DATA','PROC']:
+            os.makedirs(os.path.join(path,folder))
+        # end for folder in ['RAW','DATA','PROC']:
+        kwargs.setdefault('nbeacons',3)
+        kwargs.setdefault('days',6)
+        create_raw(os.path.join(path,'RAW',''),**kwargs)
+
+        return(os.path.join(path,'PROC'))
+    # end def make(name='network',**kwargs):
+
+    return(make)
+# end def raw_network(tmp_path):
+
+@pytest.fixture
+def prs_network(tmp_path,monkeypatch,rng):
+    """Writes pressure of three stations with different sampling to
+    <tmp_path>/DATA/ and changes to <tmp_path>/PROC/.
+
+    Returns the station IDs and the written pressure converted to dbar with
+    subtracted mean (see calc_prs_matrix()).
+    """
+
+    from geosea.store import write_data
+
+    for folder in ['DATA','PROC']:
+        os.makedirs(os.path.join(str(tmp_path),folder))
+    # end for folder in ['DATA','PROC']:
+
+    ID = ['2201','2202','2203']
+    prs = []
+    for k,station in enumerate(ID):
+        t = pd.date_range('2020-01-01 03:00',periods=400,freq=str(60+10*k)+'min',name='date')
+        df = pd.DataFrame({'prs' : 25000 + rng.normal(size=400)},index=t)
+        # single spikes change the mean but not the median of a bin
+        df.iloc[::50] += 500
+        write_data(df,os.path.join(str(tmp_path),'DATA',station + '-PRS'),'dat')
+        df = (df['prs'] - 100)/10
+        prs.append(df - df.mean())
+    # end for k,station in enumerate(ID):
+    monkeypatch.chdir(os.path.join(str(tmp_path),'PROC'))
+
+    return(ID,prs)
+# end def prs_network(tmp_path,monkeypatch,rng):
@@ -0,0 +1,114 @@
+#-------------------------------------------------------------------------------
+#       Tests of Constant Baseline Estimation
+#-------------------------------------------------------------------------------
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from geosea.est_cont_bsl import est_const_bsl_series, est_const_bsl_pairs
+
+@pytest.fixture
+def pair_bsl(rng):
+    """Traveltimes of one beacon pair (baseline 1500 m, 5 us offset) every
+    hour over 20 days with NaN and a gap of four days."""
+
+    t = pd.date_range('2020-01-01 00:30',periods=480,freq='h',name='date')
+    recp_v = 1/(1500 + rng.normal(0,2,480))
+    tt = 1500.*recp_v + 5e-6 + rng.normal(0,1e-6,480)
+    bsl = pd.DataFrame({'tt' : tt, '1/v' : recp_v},index=t)
+    bsl.iloc[::7,0] = np.nan
+    bsl.iloc[3::11,1] = np.nan
+    bsl = bsl.drop(bsl.loc['2020-01-08':'2020-01-11'].index)
+
+    return(bsl)
+# end def pair_bsl(rng):
+
+def _lstsq(bsl,start,window,intercept):
+    """Regression of one time window with numpy.linalg.lstsq() (as in
+    est_const_bsl())."""
+
+    df = bsl.loc[start:start + pd.Timedelta(window)].dropna()
+    x = df['1/v'].values[:,np.newaxis]
+    if intercept:
+        x = np.hstack((x,np.ones((len(df),1))))
+    # end if intercept:
+    if len(df) <= x.shape[1]:
+        return([np.nan]*(x.shape[1] + 1),len(df))
+    # end if len(df) <= x.shape[1]:
+    S,residuals,_,_ = np.linalg.lstsq(x,df['tt'].values,rcond=None)
+    sigma = np.sqrt(residuals[0]/(len(df)-1))
+
+    return(list(S) + [sigma],len(df))
+# end def _lstsq(bsl,start,window,intercept):
+
+@pytest.mark.parametrize('intercept',[False,True])
+def test_est_const_bsl_series_lstsq(pair_bsl,intercept):
+    df_const = est_const_bsl_series(pair_bsl,'3D','12h',intercept=intercept)
+
+    columns = ['bsl_const','intercept','std_dev_tt'] if intercept else ['bsl_const','std_dev_tt']
+    assert list(df_const.columns) == columns + ['n']
+    assert df_const.index[0] == pd.Timestamp('2020-01-01')
+    assert df_const.index[-1] <= pair_bsl.index[-1]
+    for start,row in df_const.iterrows():
+        expected,n = _lstsq(pair_bsl,start,'3D',intercept)
+        assert row['n'] == n
+        np.testing.assert_allclose(row[columns].values.astype(float),expected,rtol=1e-6,atol=1e-12,err_msg=str(start))
+    # end for start,row in df_const.iterrows():
+    # windows within the gap
+    assert (df_const['n'] == 0).any()
+    assert df_const.loc[df_const['n'] == 0,columns].isnull().all().all()
+    np.testing.assert_allclose(df_const['bsl_const'].dropna(),1500.,atol=1 if intercept else 0.01)
+# end def test_est_const_bsl_series_lstsq(pair_bsl,intercept):
+
+@pytest.mark.parametrize('intercept',[False,True])
+def test_est_const_bsl_series_few(pair_bsl,intercept):
+    bsl = pair_bsl.dropna().iloc[:3]
+    npar = 2 if intercept else 1
+
+    # one valid point is not enough for a standard deviation, with intercept
+    # two points are fitted exactly
+    for k in [1,2,3]:
+        df_const = est_const_bsl_series(bsl.iloc[:k],'1D','1D',intercept=intercept)
+        assert len(df_const) == 1
+        assert df_const['n'].iloc[0] == k
+        assert df_const['bsl_const'].notnull().iloc[0] == (k > npar)
+        assert df_const['std_dev_tt'].notnull().iloc[0] == (k > npar)
+    # end for k in [1,2,3]:
+# end def test_est_const_bsl_series_few(pair_bsl,intercept):
+
+@pytest.mark.parametrize('intercept',[False,True])
+def test_est_const_bsl_series_all_nan(pair_bsl,intercept):
+    bsl = pair_bsl.copy()
+    bsl['tt'] = np.nan
+
+    df_const = est_const_bsl_series(bsl,'3D','1D',intercept=intercept)
+    assert df_const.empty
+
+    # time windows are given
+    df_const = est_const_bsl_series(bsl,'3D','1D','2020-01-01','2020-01-05',intercept=intercept)
+    assert len(df_const) == 5
+    assert (df_const['n'] == 0).all()
+    assert df_const.drop(columns='n').isnull().all().all()
+# end def test_est_const_bsl_series_all_nan(pair_bsl,intercept):
+
+def test_est_const_bsl_pairs(pair_bsl):
+    bsl2 = pair_bsl.loc['2020-01-05':].copy()
+    bsl3 = pair_bsl.copy()
+    bsl3['1/v'] = np.nan
+
+    const_list = est_const_bsl_pairs([pair_bsl,bsl2,bsl3],'3D','1D',intercept=True)
+
+    # all pairs share the same time windows
+    for df_const in const_list:
+        assert df_const.index.equals(const_list[0].index)
+    # end for df_const in const_list:
+    pd.testing.assert_frame_equal(const_list[0],est_const_bsl_series(pair_bsl,'3D','1D',intercept=True))
+    for start,row in const_list[1].iterrows():
+        expected,n = _lstsq(bsl2,start,'3D',True)
+        assert row['n'] == n
+        np.testing.assert_allclose(row[['bsl_const','intercept','std_dev_tt']].values.astype(float),expected,rtol=1e-6,atol=1e-12)
+    # end for start,row in const_list[1].iterrows():
+    assert (const_list[2]['n'] == 0).all()
+    assert const_list[2]['bsl_const'].isnull().all()
+# end def test_est_const_bsl_pairs(pair_bsl):
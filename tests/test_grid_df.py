@@ -0,0 +1,22 @@
+#-------------------------------------------------------------------------------
+#       Tests of Aligned Time Grid
+#-------------------------------------------------------------------------------
+
+import numpy as np
+import pytest
+
+from geosea.grid_df import create_grid
+
+@pytest.mark.parametrize('method',['pad','bfill','nearest'])
+def test_create_grid_fill(network,method):
+    ID,bsl_all,st_series = network
+    # ranges of one pair every 4 hours, gaps of 3 hours on an hourly grid
+    # with a tie for 'nearest' in the middle of each gap
+    bsl = bsl_all[0].loc[bsl_all[0]['range_ID'] == int(ID[1])]
+
+    grid = create_grid([bsl],60,column_list=['range'],method=method)
+    expected = bsl.reindex(grid['date'],method=method)
+
+    assert len(grid['date']) == 4*(len(bsl) - 1) + 1
+    np.testing.assert_array_equal(grid['data'][0,:,0],expected['range'].values)
+# end def test_create_grid_fill(network,method):
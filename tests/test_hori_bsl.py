@@ -0,0 +1,37 @@
+#-------------------------------------------------------------------------------
+#       Tests of Baseline Calculation
+#-------------------------------------------------------------------------------
+
+import numpy as np
+import pandas as pd
+
+from geosea.hori_bsl import hori_bsl
+
+def test_hori_bsl_parallel(network):
+    ID,bsl_all,st_series = network
+    ID_pair,bsls,df_stats = hori_bsl(ID,bsl_all,st_series,600,1,False,None,True)
+    ID_pair2,bsls2,df_stats2 = hori_bsl(ID,bsl_all,st_series,600,1,False,2,True)
+
+    assert ID_pair == ID_pair2
+    assert df_stats.equals(df_stats2)
+    for df,df2 in zip(bsls,bsls2):
+        pd.testing.assert_frame_equal(df,df2)
+    # end for df,df2 in zip(bsls,bsls2):
+    assert len(ID_pair) == 6
+    assert (df_stats['bsl'] > 0).all()
+# end def test_hori_bsl_parallel(network):
+
+def test_hori_bsl_values(network):
+    ID,bsl_all,st_series = network
+    ID_pair,bsls = hori_bsl(ID,bsl_all,st_series,600,None,False)
+
+    df = bsls[0]
+    # range 5 minutes after sensor record, harmonic mean of sound speeds
+    ssp1 = st_series[0]['ssp'].reindex(df.index - pd.Timedelta('5min')).values
+    ssp2 = st_series[1]['ssp'].reindex(df.index - pd.Timedelta('5min')).values
+    tt = (df['range'] - df['TAT'])/2/1000
+    bsl = tt*2*ssp1*ssp2/(ssp1+ssp2)
+    np.testing.assert_allclose(df['ssp1'].values,ssp1)
+    np.testing.assert_allclose(df['tt'].values,tt.values)
+    np.testing.assert_allclose(df['bsl'].values,bsl.values)
+# end def test_hori_bsl_values(network):
@@ -0,0 +1,141 @@
+#-------------------------------------------------------------------------------
+#       Tests of Timings and Record Counts
+#-------------------------------------------------------------------------------
+
+import glob
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from geosea.benchmark import run_scaling
+from geosea.hori_bsl import hori_bsl
+from geosea.proc_bsl import proc_bsl
+from geosea.metrics import enable_metrics, disable_metrics, get_metrics, metric_stage, metrics_summary
+
+@pytest.fixture
+def metrics():
+    """Collects records during the test."""
+
+    records = []
+    enable_metrics(callback=records.append)
+    yield records
+    disable_metrics()
+# end def metrics():
+
+def test_metric_stage_nesting(metrics):
+    with metric_stage('outer',records=10,station='2201') as outer:
+        time.sleep(0.02)
+        with metric_stage('inner') as inner:
+            time.sleep(0.05)
+            inner['records'] = 5
+        # end with metric_stage('inner') as inner:
+    # end with metric_stage('outer',...) as outer:
+
+    # inner stage is finished first
+    assert [r['stage'] for r in get_metrics()] == ['inner','outer']
+    assert metrics == get_metrics()
+    assert outer['station'] == '2201'
+    assert (outer['records'],inner['records']) == (10,5)
+    assert inner['self_time'] == inner['time']
+    assert outer['time'] >= inner['time'] + 0.02
+    np.testing.assert_allclose(outer['self_time'],outer['time'] - inner['time'])
+    assert '_child' not in outer and '_peak' not in outer
+# end def test_metric_stage_nesting(metrics):
+
+def test_metric_stage_disabled():
+    disable_metrics()
+    with metric_stage('outer',records=3) as stage:
+        stage['records'] = 4
+    # end with metric_stage('outer',records=3) as stage:
+
+    assert stage['records'] == 4
+    assert 'time' not in stage
+    assert stage not in get_metrics()
+# end def test_metric_stage_disabled():
+
+def test_metrics_summary():
+    records = [{'stage' : 'read', 'start' : 0., 'time' : 4., 'self_time' : 1., 'records' : 100, 'peak_mem' : 2*1024**2},
+               {'stage' : 'write', 'start' : 1., 'time' : 1., 'self_time' : 1., 'records' : 20, 'peak_mem' : 1024**2},
+               {'stage' : 'write', 'start' : 2., 'time' : 2., 'self_time' : 2., 'records' : 40, 'peak_mem' : 3*1024**2},
+               {'stage' : 'pair', 'start' : 3., 'time' : 0.5, 'self_time' : 0.5, 'records' : None, 'peak_mem' : None, 'pair' : '2201-2202'}]
+    df = metrics_summary(records)
+
+    # order of first call
+    assert list(df.index) == ['read','write','pair']
+    assert list(df.columns) == ['calls','time','self_time','records','records_per_s','peak_mem_MB']
+    assert list(df['calls']) == [1,2,1]
+    np.testing.assert_allclose(df.loc['write',['time','self_time','records','peak_mem_MB']].values.astype(float),[3.,3.,60.,3.])
+    np.testing.assert_allclose(df['records_per_s'].values[:2],[100.,20.])
+    assert df.loc['pair','records'] == 0
+    assert np.isnan(df.loc['pair','peak_mem_MB'])
+    assert metrics_summary([]).empty
+# end def test_metrics_summary():
+
+def test_hori_bsl_metrics_parallel(network,metrics):
+    ID,bsl_all,st_series = network
+    hori_bsl(ID,bsl_all,st_series,600,None,False,None,verbose=False)
+    serial = disable_metrics()
+    enable_metrics()
+    hori_bsl(ID,bsl_all,st_series,600,None,False,2,verbose=False)
+    parallel = get_metrics()
+
+    # records of the worker processes are merged
+    for records in [serial,parallel]:
+        df = metrics_summary(records)
+        assert list(df.loc[['pair','search_df','baseline'],'calls']) == [6,6,6]
+    # end for records in [serial,parallel]:
+    pairs = [{k : r[k] for k in ['pair','records','ranges','bsl','sv1_err','sv2_err','kept']} for r in serial if r['stage'] == 'pair']
+    pairs2 = [{k : r[k] for k in ['pair','records','ranges','bsl','sv1_err','sv2_err','kept']} for r in parallel if r['stage'] == 'pair']
+    assert pairs2 == pairs
+    assert pairs[0]['pair'] == '2201-2202'
+    assert all(p['records'] > 0 for p in pairs)
+# end def test_hori_bsl_metrics_parallel(network,metrics):
+
+def test_run_scaling_days(tmp_path):
+    # days of kwargs is replaced by days_list
+    df = run_scaling([2],days_list=[1],days=5,bsl_period=240,sensor_period=60,memory=False,workdir=str(tmp_path))
+
+    assert sorted(set(df.index.droplevel('stage'))) == [(2,1)]
+    assert df.loc[(2,1,'extract'),'calls'] == 2
+    assert df.loc[(2,1,'pair'),'calls'] == 2
+# end def test_run_scaling_days(tmp_path):
+
+def test_proc_bsl_metrics(raw_network,monkeypatch,capsys,metrics):
+    proc = raw_network(nbeacons=2,days=2)
+    monkeypatch.chdir(proc)
+    # first download holds only a part of the records
+    content = {}
+    for filename in glob.glob(os.path.join(os.path.dirname(proc),'RAW','*.csv')):
+        with open(filename,'r') as f:
+            content[filename] = f.read()
+        # end with open(filename,'r') as f:
+        lines = content[filename].splitlines(True)
+        with open(filename,'w') as f:
+            f.write(''.join(lines[:len(lines)//2]))
+        # end with open(filename,'w') as f:
+    # end for filename in glob.glob(...):
+    proc_bsl(35.,40.,3600,fmt='dat',verbose=False)
+    for filename in content:
+        with open(filename,'w') as f:
+            f.write(content[filename])
+        # end with open(filename,'w') as f:
+    # end for filename in content:
+    proc_bsl(35.,40.,3600,fmt='dat',incremental=True,verbose=False)
+
+    # counts are stored in the records instead of being printed
+    assert capsys.readouterr().out == ''
+    extract = [r for r in metrics if r['stage'] == 'extract']
+    merge = [r for r in metrics if r['stage'] == 'merge']
+    # extract of the complete and the new records
+    assert [r['station'] for r in extract] == ['2201','2202']*2
+    assert [r['station'] for r in merge] == ['2201','2202']
+    assert all(r['bsl'] > 0 and r['records'] > 0 for r in merge)
+    for r in extract:
+        assert r['bsl'] > 0 and r['prs'] > 0 and r['invalid_date'] == 0
+        assert r['records'] >= r['bsl'] + r['prs']
+    # end for r in extract:
+    assert [r['pair'] for r in metrics if r['stage'] == 'pair'] == ['2201-2202','2202-2201']*2
+# end def test_proc_bsl_metrics(raw_network,monkeypatch,capsys,metrics):
@@ -0,0 +1,75 @@
+#-------------------------------------------------------------------------------
+#       Tests of Streaming Read of RAW Files
+#-------------------------------------------------------------------------------
+
+import glob
+import os
+
+import pandas as pd
+import pytest
+
+from geosea.extract_df import extract_df
+from geosea.read_raw import RAW_COLUMNS, RAW_RECORDS, read_raw, read_raw_station, extract_raw
+
+def _raw_files(proc,station):
+    """Raw files of one station, the second download starts with the last
+    records of the first one (overlapping files)."""
+
+    ifiles = sorted(glob.glob(os.path.join(os.path.dirname(proc),'RAW','*_' + station + '_*.csv')))
+    with open(ifiles[1],'r') as f:
+        lines = f.readlines()
+    # end with open(ifiles[1],'r') as f:
+    with open(ifiles[0],'a') as f:
+        f.write(''.join(lines[13:33]))
+    # end with open(ifiles[0],'a') as f:
+
+    return(ifiles)
+# end def _raw_files(proc,station):
+
+def _extract_df(ifiles,index):
+    """Data of one record type as extracted by read() before the streaming
+    read (all files in one frame, extract_df() per record type)."""
+
+    all_data = pd.concat([pd.read_csv(data,names=RAW_COLUMNS,skiprows=13,index_col=0,low_memory=False) for data in ifiles])
+    all_data = all_data.drop_duplicates()
+    all_data['B'] = pd.to_datetime(all_data['B'])
+    column_list,label_list,dtype = RAW_RECORDS[index]
+
+    df = extract_df(all_data,index,['B'] + column_list,['date'] + label_list,dtype,0)
+
+    return(df.sort_index(kind='mergesort'))
+# end def _extract_df(ifiles,index):
+
+@pytest.mark.parametrize('chunksize',[7,100000])
+def test_read_raw_station_extract_df(raw_network,chunksize):
+    proc = raw_network(nbeacons=2,days=2,sensor_period=30,status_period=360,files_per_station=2)
+    ifiles = _raw_files(proc,'2201')
+
+    # small chunks hold mixed record types and split them across chunks
+    raw,invalid = read_raw_station(ifiles,chunksize=chunksize)
+
+    assert sum(invalid.values()) == 0
+    for index in ['BSL','SSP','HRT','PRS','PAG','BAT','INC']:
+        df = extract_raw(raw,index)
+        df_ref = _extract_df(ifiles,index)
+        assert len(df) > 0
+        pd.testing.assert_frame_equal(df,df_ref,check_dtype=False,check_names=False,check_freq=False,obj=index)
+    # end for index in [...]:
+# end def test_read_raw_station_extract_df(raw_network,chunksize):
+
+def test_read_raw_invalid_date(raw_network,monkeypatch):
+    monkeypatch.chdir(raw_network(nbeacons=2,days=1))
+    filename = glob.glob('../RAW/Data_*_2201_*.csv')[0]
+    with open(filename,'a') as f:
+        # malformed date and date in a different format
+        f.write('PRS,2020/01/01 25:00:00,0,0,25000.0,4.0\n')
+        f.write('PRS,01/02/2020 00:00:00,0,0,25000.0,4.0\n')
+    # end with open(filename,'a') as f:
+
+    ID,raw_all,invalid_all = read_raw(['2201','2202'])
+    raw,invalid = read_raw_station([filename])
+
+    assert invalid_all[0] == {**invalid_all[1],'PRS' : 2}
+    assert invalid['PRS'] == 2
+    assert len(raw['PRS']) == len(raw_all[1]['PRS'])
+# end def test_read_raw_invalid_date(raw_network,monkeypatch):
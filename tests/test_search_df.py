@@ -0,0 +1,73 @@
+#-------------------------------------------------------------------------------
+#       Tests of Nearest-in-time Search
+#-------------------------------------------------------------------------------
+
+import numpy as np
+import pandas as pd
+
+from geosea.search_df import search_df, search_df_multi
+
+def _brute_force(df1,df2,minmax,column):
+    """Nearest entry of df2 for each entry of df1 by full search."""
+
+    t2 = df2.index.asi8
+    values = []
+    miss = 0
+    for t in df1.index.asi8:
+        dist = np.abs(t2 - t)
+        j = np.argmin(dist)
+        if dist[j] <= minmax*1e9:
+            values.append(df2[column].iloc[j])
+        else:
+            values.append(0.0)
+            miss += 1
+        # end if dist[j] <= minmax*1e9:
+    # end for t in df1.index.asi8:
+
+    return(np.array(values),miss)
+# end def _brute_force(df1,df2,minmax,column):
+
+def test_search_df_multi_brute_force(random_df):
+    df1,df2 = random_df
+    df_new,err_count = search_df_multi(df1,df2,600,0.0,['A','B'],[0,1])
+
+    for new,col in [('A','a'),('B','b')]:
+        values,miss = _brute_force(df1,df2,600,col)
+        np.testing.assert_array_equal(df_new[new].values,values)
+    # end for new,col in [('A','a'),('B','b')]:
+    assert err_count == miss
+    assert err_count > 0
+    np.testing.assert_array_equal(df_new['x'].values,df1['x'].values)
+# end def test_search_df_multi_brute_force(random_df):
+
+def test_search_df_multi_units(random_df):
+    df1,df2 = random_df
+    df_ref,err_ref = search_df_multi(df1,df2,600,0.0,['A'],[0])
+
+    # different time resolution of the indices
+    df1.index = df1.index.as_unit('s')
+    df2.index = df2.index.as_unit('us')
+    df_new,err_count = search_df_multi(df1,df2,600,0.0,['A'],[0])
+
+    np.testing.assert_allclose(df_new['A'].values,df_ref['A'].values)
+    assert err_count == err_ref
+# end def test_search_df_multi_units(random_df):
+
+def test_search_df_single_column(random_df):
+    df1,df2 = random_df
+    df_new,err_count = search_df(df1,df2,600,0.0,'B',1)
+    values,miss = _brute_force(df1,df2,600,'b')
+
+    np.testing.assert_array_equal(df_new['B'].values,values)
+    assert err_count == miss
+# end def test_search_df_single_column(random_df):
+
+def test_search_df_multi_tie():
+    # for equal distances the later entry is taken
+    df2 = pd.DataFrame({'a' : [1.,2.]},index=pd.to_datetime(['2020-01-01 00:00','2020-01-01 00:10']))
+    df1 = pd.DataFrame({'x' : [0]},index=pd.to_datetime(['2020-01-01 00:05']))
+    df_new,err_count = search_df_multi(df1,df2,600)
+
+    assert df_new['a'].iloc[0] == 2.
+    assert err_count == 0
+# end def test_search_df_multi_tie():
@@ -0,0 +1,52 @@
+#-------------------------------------------------------------------------------
+#       Tests of Binary Storage
+#-------------------------------------------------------------------------------
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from geosea.store import write_data, write_store, read_store
+
+def test_store_text_column(tmp_path,random_df):
+    df1,df2 = random_df
+    df = df2.copy()
+    df.index.name = 'date'
+    df['flag'] = np.where(df['a'] > 0,'up','down')
+    filename = os.path.join(str(tmp_path),'x.npy')
+
+    write_store(df,filename)
+    df_store = read_store(filename)
+
+    # dates are stored with minutes as in text files
+    assert df_store.index.equals(df.index.floor('min'))
+    np.testing.assert_array_equal(df_store['a'].values,df['a'].values)
+    assert list(df_store['flag']) == list(df['flag'])
+# end def test_store_text_column(tmp_path,random_df):
+
+def test_store_empty(tmp_path):
+    df = pd.DataFrame({'bsl' : pd.Series([],dtype=float), 'flag' : pd.Series([],dtype=object)},index=pd.DatetimeIndex([],name='date'))
+    filename = os.path.join(str(tmp_path),'x.npy')
+
+    write_store(df,filename)
+    df_store = read_store(filename)
+
+    assert df_store.empty
+    assert list(df_store.columns) == ['bsl','flag']
+# end def test_store_empty(tmp_path):
+
+def test_store_time_window(tmp_path,random_df):
+    df1,df2 = random_df
+    df2.index.name = 'date'
+    filename = os.path.join(str(tmp_path),'x')
+
+    write_data(df2,filename,'both')
+    df_store = read_store(filename + '.npy','2020-01-01 06:00','2020-01-01 18:30')
+    df_text = pd.read_csv(filename + '.dat',sep='\t',index_col=0,parse_dates=True)
+    df_text = df_text.loc[(df_text.index >= '2020-01-01 06:00') & (df_text.index <= '2020-01-01 18:30')]
+
+    assert len(df_store) > 0
+    assert df_store.index.equals(df_text.index)
+    np.testing.assert_allclose(df_store.values,df_text.values)
+# end def test_store_time_window(tmp_path,random_df):
@@ -0,0 +1,155 @@
+#-------------------------------------------------------------------------------
+#       Tests of Seawater Equations
+#-------------------------------------------------------------------------------
+
+import itertools
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from geosea.sw import sal_wilson_array, sal_medwin_array, sv_wilson_array, sv_delgrosso_array, sv_leroy_array, sv_leroy_coef, sv_leroy, sv_leroy_network, sv_wilson, sv_delgrosso
+
+# temperature in degrees Celsius, salinity in parts per thousand and
+# pressure in kPa
+GRID = np.array(list(itertools.product([-2.,0.,4.,10.,20.,30.],[0.,30.,35.,40.],[0.,100.,1000.,25000.,60000.])))
+PHI = 40.
+
+#-------------------------------------------------------------------------------
+#       Scalar Formulas (term by term as in the publications)
+#-------------------------------------------------------------------------------
+
+def _sal_wilson(t,v,p):
+    p = p*0.010197266
+    S_t = -3.31986*t - 2.57236e-3*t**2 + 2.32009e-4*t**3 - 2.20892e-6*t**4
+    S_p = -1.14663e-1*p - 1.00488e-5*p**2 - 2.14038e-8*p**3 + 2.23490e-12*p**4
+    S_v = 7.21467e-1*(v-1448.54) - 6.52575e-4*(v-1448.54)**2
+    S_tpv = (v-1448.54)*(1.17e-2*t + 1.04088e-4*p + 1.29184e-7*p**2 + 4.43572e-6*p*t - 9.63357e-8*p*t**2) \
+        + p*(-1.45e-3*t - 2.5563e-5*t**2 + 3.45997e-7*t**3) + p**2*(-7.29321e-7*t + 2.05515e-8*t**2) + p**3*(-1.19869e-10*t)
+
+    return(35 + S_t + S_p + S_v + S_tpv)
+# end def _sal_wilson(t,v,p):
+
+def _sal_medwin(t,v,p):
+    z = (p-100)/10
+
+    return(-(1449.2 + 4.6*t - 0.055*t**2 + 0.00029*t**3 + 0.016*z - v)/(1.34 - 0.010*t) + 35)
+# end def _sal_medwin(t,v,p):
+
+def _sv_wilson(t,s,p):
+    p = p*0.010197266
+    V_t = 4.6233*t - 5.4585e-2*t**2 + 2.822e-4*t**3 - 5.07e-7*t**4
+    V_p = 1.60518e-1*p + 1.0279e-5*p**2 + 3.451e-9*p**3 - 3.503e-12*p**4
+    V_s = 1.391*(s-35) - 7.8e-2*(s-35)**2
+    V_stp = (s-35)*(-1.197e-2*t + 2.61e-4*p - 1.96e-7*p**2 - 2.09e-6*p*t) + p*(-2.796e-4*t + 1.3302e-5*t**2 - 6.644e-8*t**3) \
+        + p**2*(-2.391e-7*t + 9.286e-10*t**2) - 1.745e-10*p**3*t
+
+    return(1449.22 + V_t + V_p + V_s + V_stp)
+# end def _sv_wilson(t,s,p):
+
+def _sv_delgrosso(t,s,p):
+    p = p*0.010197266
+    Ct = 0.501209398873e1*t - 0.550946843172e-1*t**2 + 0.22153596924e-3*t**3
+    Cs = 0.132952290781e1*s + 0.128955756844e-3*s**2
+    Cp = 0.156059257041*p + 0.244998688441e-4*p**2 - 0.883392332513e-8*p**3
+    Cstp = -0.127562783426e-1*t*s + 0.635191613389e-2*t*p + 0.265484716608e-7*t**2*p**2 - 0.159349479045e-5*t*p**2 \
+        + 0.522116437235e-9*t*p**3 - 0.438031096213e-6*t**3*p - 0.161674495909e-8*s**2*p**2 + 0.96840315641e-4*t**2*s \
+        + 0.485639620015e-5*t*s**2*p - 0.340597039004e-3*t*s*p
+
+    return(1402.392 + Ct + Cs + Cp + Cstp)
+# end def _sv_delgrosso(t,s,p):
+
+def _sv_leroy(t,s,p,phi):
+    g = 9.780318*(1 + 5.2788e-3*math.sin(math.radians(phi))**2 - 2.36e-5*math.sin(math.radians(phi))**4)
+    p = p/1000
+    z = (9.72659e2*p - 2.2512e-1*p**2 + 2.279e-4*p**3 - 1.82e-7*p**4)/(g + 1.092e-4*p)
+
+    return(1402.5 + 5*t - 5.44e-2*t**2 + 2.1e-4*t**3 + 1.33*s - 1.23e-2*s*t + 8.7e-5*s*t**2 + 1.56e-2*z + 2.55e-7*z**2 \
+        - 7.3e-12*z**3 + 1.2e-6*z*(phi-45) - 9.5e-13*t*z**3 + 3e-7*t**2*z + 1.43e-5*s*z)
+# end def _sv_leroy(t,s,p,phi):
+
+#-------------------------------------------------------------------------------
+#       Array Kernels
+#-------------------------------------------------------------------------------
+
+@pytest.mark.parametrize('kernel,scalar',[(sv_wilson_array,_sv_wilson),(sv_delgrosso_array,_sv_delgrosso),(sv_leroy_array,_sv_leroy)])
+def test_sv_array_grid(kernel,scalar):
+    t,s,p = GRID.T
+    args = (PHI,) if kernel is sv_leroy_array else ()
+    ssp = kernel(t,p,s,*args)
+    expected = [scalar(*x,*args) for x in GRID]
+
+    np.testing.assert_allclose(ssp,expected,rtol=1e-12,atol=1e-9)
+    # scalars and broadcasting
+    np.testing.assert_allclose(kernel(t[5],p[5],s[5],*args),expected[5],rtol=1e-12)
+    np.testing.assert_allclose(kernel(t,p,35.,*args),[scalar(x,35.,y,*args) for x,y in zip(t,p)],rtol=1e-12)
+# end def test_sv_array_grid(kernel,scalar):
+
+@pytest.mark.parametrize('kernel,scalar',[(sal_wilson_array,_sal_wilson),(sal_medwin_array,_sal_medwin)])
+def test_sal_array_grid(kernel,scalar):
+    t,s,p = GRID.T
+    v = 1450. + s
+    sal = kernel(t,v,p)
+
+    np.testing.assert_allclose(sal,[scalar(x,y,z) for x,y,z in zip(t,v,p)],rtol=1e-12,atol=1e-9)
+# end def test_sal_array_grid(kernel,scalar):
+
+def test_sv_leroy_coef():
+    t,s,p = GRID.T
+    c0,c1 = sv_leroy_coef(t,p,PHI)
+
+    # sound speed is linear in salinity
+    np.testing.assert_allclose(c0,sv_leroy_array(t,p,0.,PHI))
+    np.testing.assert_allclose(c0 + s*c1,[_sv_leroy(*x,PHI) for x in GRID],rtol=1e-12)
+# end def test_sv_leroy_coef():
+
+def test_sv_leroy_network():
+    t = pd.date_range('2020-01-01',periods=len(GRID),freq='h')
+    st1 = pd.DataFrame({'hrt' : GRID[:,0], 'tpr' : GRID[:,0] + 0.5, 'prs' : GRID[:,2]},index=t)
+    st2 = pd.DataFrame({'hrt' : GRID[:50,0] + 1, 'prs' : GRID[:50,2] + 10},index=t[:50])
+    sal2 = pd.DataFrame({'sal' : GRID[:50,1]},index=t[:50])
+
+    st_leroy = sv_leroy_network([st1,st2],[35.,sal2],PHI)
+
+    df1,df2 = st_leroy
+    assert list(df1.columns) == ['hrt','tpr','prs','svl_hrt','svl_tpr','sal']
+    assert list(df2.columns) == ['hrt','prs','svl_hrt','sal']
+    np.testing.assert_allclose(df1['svl_hrt'],[_sv_leroy(x,35.,y,PHI) for x,y in zip(st1['hrt'],st1['prs'])],rtol=1e-12)
+    np.testing.assert_allclose(df1['svl_tpr'],[_sv_leroy(x,35.,y,PHI) for x,y in zip(st1['tpr'],st1['prs'])],rtol=1e-12)
+    np.testing.assert_allclose(df2['svl_hrt'],[_sv_leroy(x,z,y,PHI) for x,y,z in zip(st2['hrt'],st2['prs'],sal2['sal'])],rtol=1e-12)
+    # same as each beacon on its own
+    pd.testing.assert_frame_equal(df1,sv_leroy(st1,35.,PHI))
+    pd.testing.assert_frame_equal(df2,sv_leroy(st2,sal2,PHI))
+    assert sv_leroy_network([],35.,PHI) == []
+# end def test_sv_leroy_network():
+
+#-------------------------------------------------------------------------------
+#       Formula Fixes
+#-------------------------------------------------------------------------------
+
+def test_sv_wilson_salinity_term():
+    t = pd.date_range('2020-01-01',periods=2,freq='h')
+    HRT = pd.DataFrame({'hrt' : [0.,0.]},index=t)
+    PRS = pd.DataFrame({'prs' : [0.,0.]},index=t)
+    SAL = pd.DataFrame({'sal' : [35.,40.]},index=t)
+
+    ssp = sv_wilson(HRT,PRS,SAL)['ssp'].values
+
+    np.testing.assert_allclose(ssp[0],1449.22)
+    # V_s = 1.391*(S-35) - 7.8e-2*(S-35)**2 (Wilson, 1960, eq. 1), the
+    # linear term 7.8e-2*(S-35) gave 6.565
+    np.testing.assert_allclose(ssp[1] - ssp[0],5.005,rtol=1e-6)
+# end def test_sv_wilson_salinity_term():
+
+def test_sv_delgrosso_values():
+    t = pd.date_range('2020-01-01',periods=3,freq='h')
+    HRT = pd.DataFrame({'hrt' : [0.,10.,4.]},index=t)
+    PRS = pd.DataFrame({'prs' : [0.,0.,25000.]},index=t)
+
+    # raised a NameError (undefined row) before
+    ssp = sv_delgrosso(HRT,PRS,35.)['ssp_d'].values
+
+    np.testing.assert_allclose(ssp,[_sv_delgrosso(x,35.,y) for x,y in zip(HRT['hrt'],PRS['prs'])],rtol=1e-12)
+    np.testing.assert_allclose(ssp[:2],[1449.083,1489.791],atol=1e-3)
+# end def test_sv_delgrosso_values():
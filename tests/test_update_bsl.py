@@ -0,0 +1,96 @@
+#-------------------------------------------------------------------------------
+#       Tests of Incremental Baseline Processing
+#-------------------------------------------------------------------------------
+
+import glob
+import os
+
+import pandas as pd
+import pytest
+
+from geosea.proc_bsl import proc_bsl
+from geosea.read import read
+from geosea.update_bsl import load_st
+from geosea.store import read_store
+
+def _read_files(proc,fmt):
+    """Reads all files of ../DATA/ (seen from proc) written with fmt (file
+    name as key)."""
+
+    path = os.path.dirname(proc)
+    ext = 'npy' if fmt == 'npy' else 'dat'
+    data = {}
+    for filename in sorted(glob.glob(os.path.join(path,'DATA','*.' + ext))):
+        if ext == 'npy':
+            data[os.path.basename(filename)] = read_store(filename)
+        else:
+            data[os.path.basename(filename)] = pd.read_csv(filename,sep=None,engine='python',index_col=0,parse_dates=True)
+        # end if ext == 'npy':
+    # end for filename in ... :
+
+    return(data)
+# end def _read_files(proc,fmt):
+
+@pytest.mark.parametrize('fmt',['dat','npy','both'])
+def test_update_bsl_grown_file(raw_network,monkeypatch,fmt):
+    # complete processing of all records
+    proc_full = raw_network('full')
+    monkeypatch.chdir(proc_full)
+    proc_bsl(35.,40.,3600,fmt=fmt)
+    data_full = _read_files(proc_full,fmt)
+
+    # first download holds only a part of the records
+    proc_inc = raw_network('inc')
+    raw_files = glob.glob(os.path.join(os.path.dirname(proc_inc),'RAW','*.csv'))
+    content = {}
+    for filename in raw_files:
+        with open(filename,'r') as f:
+            content[filename] = f.read()
+        # end with open(filename,'r') as f:
+        lines = content[filename].splitlines(True)
+        with open(filename,'w') as f:
+            f.write(''.join(lines[:len(lines)*2//3]))
+        # end with open(filename,'w') as f:
+    # end for filename in raw_files:
+    monkeypatch.chdir(proc_inc)
+    proc_bsl(35.,40.,3600,fmt=fmt)
+
+    # the raw files have grown with the next download
+    for filename in raw_files:
+        with open(filename,'w') as f:
+            f.write(content[filename])
+        # end with open(filename,'w') as f:
+    # end for filename in raw_files:
+    proc_bsl(35.,40.,3600,fmt=fmt,incremental=True)
+
+    data_inc = _read_files(proc_inc,fmt)
+    assert sorted(data_inc) == sorted(data_full)
+    for name,df in data_full.items():
+        pd.testing.assert_frame_equal(data_inc[name],df,check_dtype=False,obj=name)
+    # end for name,df in data_full.items():
+# end def test_update_bsl_grown_file(raw_network,monkeypatch,fmt):
+
+def test_load_st_missing_sensor(raw_network,monkeypatch):
+    proc = raw_network()
+    # station 2202 has no sound speed sensor
+    filename = glob.glob(os.path.join(os.path.dirname(proc),'RAW','*_2202_*.csv'))[0]
+    with open(filename,'r') as f:
+        lines = [line for line in f if not line.startswith('SSP')]
+    # end with open(filename,'r') as f:
+    with open(filename,'w') as f:
+        f.write(''.join(lines))
+    # end with open(filename,'w') as f:
+    monkeypatch.chdir(proc)
+    ID,st_series,bsl_series = read(fmt='dat')
+    assert not os.path.isfile('../DATA/2202-SSP.dat')
+
+    for k,station in enumerate(ID):
+        df = load_st(station)
+        # same position of columns as in read(), see match_pair_bsl()
+        assert list(df.columns) == list(st_series[k].columns)
+        df_ref = st_series[k].copy()
+        df_ref.index = df_ref.index.floor('min')
+        pd.testing.assert_frame_equal(df,df_ref,check_dtype=False,check_names=False,check_freq=False)
+    # end for k,station in enumerate(ID):
+    assert load_st('2202')['ssp'].isnull().all()
+# end def test_load_st_missing_sensor(raw_network,monkeypatch):
@@ -0,0 +1,28 @@
+#-------------------------------------------------------------------------------
+#       Tests of Pressure Differences
+#-------------------------------------------------------------------------------
+
+import numpy as np
+
+from geosea.vert_bsl import calc_prs_diff
+
+def test_calc_prs_diff_median(prs_network):
+    ID,prs = prs_network
+    df_diff = calc_prs_diff(ID,freq='2D')
+
+    for i,id1 in enumerate(ID):
+        for j,id2 in enumerate(ID):
+            if i == j:
+                continue
+            # end if i == j:
+            # pressure of id1 interpolated at times of id2
+            prs1 = np.interp(prs[j].index.asi8,prs[i].index.asi8,prs[i].values,left=np.nan,right=np.nan)
+            diff = (prs[j] - prs1).dropna()
+            expected = diff.resample('2D',origin='start_day').median().dropna()
+
+            df = df_diff.loc[(df_diff['ID1'] == id1) & (df_diff['ID2'] == id2),'prs']
+            np.testing.assert_array_equal(df.index.values,expected.index.values)
+            np.testing.assert_allclose(df.values,expected.values)
+        # end for j,id2 in enumerate(ID):
+    # end for i,id1 in enumerate(ID):
+# end def test_calc_prs_diff_median(prs_network):